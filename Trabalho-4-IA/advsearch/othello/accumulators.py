@@ -0,0 +1,139 @@
+from .board import Board, NEIGHBORS, CODES, EMPTY_CODE
+from .bitboard import BitBoard, FULL, SHIFTS, popcount, shift
+
+# Incremental evaluators ("accumulators") for the Othello boards.
+# An accumulator registered with board.add_accumulator() has its value computed once
+# from scratch and then kept up to date by process_move/apply (and flip_tiles), which only
+# pass it the square of the new disc and the flipped squares. undo() restores the previous values,
+# so an evaluation function can read board.accumulated[name] in O(1) at every leaf.
+#
+# Squares are bit indexes (y * 8 + x), as in the bitboards.
+
+
+class Accumulator(object):
+    """
+    Base class of the incremental evaluators. Subclasses define a unique name,
+    compute() (full scan) and update() (changed squares only).
+    """
+    name = None
+
+    def compute(self, board: Board):
+        """
+        Computes the value from scratch
+        :param board:
+        :return: the value (any immutable object)
+        """
+        raise NotImplementedError
+
+    def update(self, value, board: Board, square: int, color: str, flips: list):
+        """
+        Returns the value after a move. It is called after the board was updated.
+        :param value: value before the move
+        :param board: board after the move
+        :param square: square of the placed disc, or None if discs were only flipped (flip_tiles)
+        :param color: color of the placed disc
+        :param flips: squares of the flipped discs
+        :return: the new value
+        """
+        raise NotImplementedError
+
+
+class SquareTable(Accumulator):
+    """
+    Sum of a weight table over the black discs minus the sum over the white discs.
+    The value is from black's point of view (negate it for white).
+    """
+
+    def __init__(self, name: str, table: list):
+        """
+        :param name: name of the accumulator
+        :param table: 8x8 weight matrix indexed by [y][x]
+        """
+        self.name = name
+        self.weights = [w for row in table for w in row]
+
+    def compute(self, board: Board):
+        value = 0
+        for y, row in enumerate(board.tiles):
+            for x, cell in enumerate(row):
+                if cell == Board.BLACK:
+                    value += self.weights[y * 8 + x]
+                elif cell == Board.WHITE:
+                    value -= self.weights[y * 8 + x]
+        return value
+
+    def update(self, value, board: Board, square: int, color: str, flips: list):
+        weights = self.weights
+        delta = weights[square] if square is not None else 0
+        for i in flips:
+            delta += 2 * weights[i]  # the disc goes from -w to +w for the mover
+        return value + delta if color == Board.BLACK else value - delta
+
+
+def disc_difference() -> SquareTable:
+    """
+    Number of black discs minus number of white discs
+    """
+    return SquareTable('discs', [[1] * 8 for _ in range(8)])
+
+
+def corner_ownership() -> SquareTable:
+    """
+    Number of corners owned by black minus number of corners owned by white
+    """
+    table = [[0] * 8 for _ in range(8)]
+    for x, y in ((0, 0), (7, 0), (0, 7), (7, 7)):
+        table[y][x] = 1
+    return SquareTable('corners', table)
+
+
+class Frontier(Accumulator):
+    """
+    Frontier discs (discs with at least one empty neighbour) of each color.
+    The value is the tuple (black frontier discs, white frontier discs).
+    """
+    name = 'frontier'
+
+    def compute(self, board: Board):
+        if isinstance(board, BitBoard):
+            return self._from_bits(board)
+        cells = [cell for row in board.tiles for cell in row]
+        counts = {Board.BLACK: 0, Board.WHITE: 0}
+        for i, cell in enumerate(cells):
+            if cell != Board.EMPTY and any(cells[n] == Board.EMPTY for n in NEIGHBORS[i]):
+                counts[cell] += 1
+        return counts[Board.BLACK], counts[Board.WHITE]
+
+    def update(self, value, board: Board, square: int, color: str, flips: list):
+        if isinstance(board, BitBoard):
+            return self._from_bits(board)  # a handful of shifts, cheaper than reading tiles
+
+        # only the new disc, its neighbours (which lost an empty neighbour) and the
+        # flipped discs (which changed color) can change their contribution
+        cells = board.cells
+        black, white = CODES[Board.BLACK], CODES[Board.WHITE]
+        opp = white if color == Board.BLACK else black
+        flipped = set(flips)
+        counts = {black: value[0], white: value[1]}
+        changed = flipped if square is None else {square, *NEIGHBORS[square], *flipped}
+        for i in changed:
+            now = cells[i]
+            if now == EMPTY_CODE:
+                continue
+            near_empty = any(cells[n] == EMPTY_CODE for n in NEIGHBORS[i])
+            if near_empty:
+                counts[now] += 1
+            # before the move, square was empty and the flipped discs had the opponent's color
+            before = opp if i in flipped else (EMPTY_CODE if i == square else now)
+            if before != EMPTY_CODE and (near_empty or (square is not None and square in NEIGHBORS[i])):
+                counts[before] -= 1
+        return counts[black], counts[white]
+
+    @staticmethod
+    def _from_bits(board: BitBoard):
+        black, white = board.bits[Board.BLACK], board.bits[Board.WHITE]
+        empty = ~(black | white) & FULL
+        near_empty = 0
+        for amount, mask in SHIFTS:
+            near_empty |= shift(empty, amount, mask)
+        return popcount(black & near_empty), popcount(white & near_empty)
@@ -0,0 +1,458 @@
+from .board import Board, ZOBRIST, NO_ACCUMULATORS, RAYS, DIRECTION_INDEX
+
+# Bit i of a bitboard represents the tile at x = i % 8, y = i // 8,
+# so that bit 0 is the upper-left corner and bit 63 is the lower-right one.
+FULL = 0xFFFFFFFFFFFFFFFF
+NOT_COL_0 = 0xFEFEFEFEFEFEFEFE  # clears the leftmost column (x == 0)
+NOT_COL_7 = 0x7F7F7F7F7F7F7F7F  # clears the rightmost column (x == 7)
+
+# (shift, mask) pairs for each of the 8 directions. A positive shift moves
+# bits to higher indexes (left shift), a negative one to lower indexes.
+# The mask removes the bits that would wrap around to the other side of the board.
+SHIFTS = [
+    (-8, FULL),       # UP
+    (8, FULL),        # DOWN
+    (-1, NOT_COL_7),  # LEFT
+    (1, NOT_COL_0),   # RIGHT
+    (-9, NOT_COL_7),  # UP_LEFT
+    (-7, NOT_COL_0),  # UP_RIGHT
+    (7, NOT_COL_7),   # DOWN_LEFT
+    (9, NOT_COL_0),   # DOWN_RIGHT
+]
+
+
+def shift(bits: int, amount: int, mask: int) -> int:
+    """
+    Shifts all bits one step in a direction, discarding
+    the ones that fall off the board
+    :param bits: bitboard
+    :param amount: shift amount (see SHIFTS)
+    :param mask: wrap-around mask (see SHIFTS)
+    :return: int
+    """
+    if amount > 0:
+        return (bits << amount) & mask & FULL
+    return (bits >> -amount) & mask
+
+
+def moves_mask(own: int, opp: int) -> int:
+    """
+    Returns a bitboard with the legal moves of the player owning the 'own' discs
+    :param own: bitboard of the player to move
+    :param opp: bitboard of the opponent
+    :return: int
+    """
+    empty = ~(own | opp) & FULL
+    moves = 0
+    for amount, mask in SHIFTS:
+        # discs of the opponent adjacent (in this direction) to a run started by own discs
+        run = shift(own, amount, mask) & opp
+        for _ in range(5):  # a run has at most 6 opponent discs
+            run |= shift(run, amount, mask) & opp
+        moves |= shift(run, amount, mask)
+    return moves & empty
+
+
+def flips_mask(own: int, opp: int, square: int) -> int:
+    """
+    Returns a bitboard with the opponent discs flipped by
+    placing a disc in the given square
+    :param own: bitboard of the player to move
+    :param opp: bitboard of the opponent
+    :param square: bit index of the move (y * 8 + x)
+    :return: int
+    """
+    flips = 0
+    origin = 1 << square
+    for amount, mask in SHIFTS:
+        line = 0
+        cursor = shift(origin, amount, mask)
+        while cursor & opp:
+            line |= cursor
+            cursor = shift(cursor, amount, mask)
+        if cursor & own:
+            flips |= line
+    return flips
+
+
+def brackets_mask(own: int, opp: int, square: int) -> int:
+    """
+    Returns a bitboard with the own discs that close the runs flipped by
+    placing a disc in the given square (the runs of flips_mask)
+    :param own: bitboard of the player to move
+    :param opp: bitboard of the opponent
+    :param square: bit index of the move (y * 8 + x)
+    :return: int
+    """
+    brackets = 0
+    origin = 1 << square
+    for amount, mask in SHIFTS:
+        cursor = shift(origin, amount, mask)
+        if not cursor & opp:
+            continue
+        while cursor & opp:
+            cursor = shift(cursor, amount, mask)
+        if cursor & own:
+            brackets |= cursor
+    return brackets
+
+
+def popcount(bits: int) -> int:
+    """
+    Returns the number of set bits
+    :param bits:
+    :return: int
+    """
+    return bin(bits).count('1')
+
+
+def squares(bits: int):
+    """
+    Yields the bit indexes that are set in the bitboard, from the lowest to the highest
+    :param bits:
+    :return: generator of int
+    """
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class BitBoard(Board):
+    """
+    Othello board backed by two 64-bit integers, one per color.
+    It has the same public interface as Board (legal_moves, process_move,
+    is_terminal_state, num_pieces, winner, __str__, etc.), so it can be used
+    anywhere a Board is expected, e.g.:
+    state = GameState(BitBoard.from_string(str(board)), 'B')
+
+    Move generation and flipping are done with shift-and-mask operations,
+    instead of walking the board one tile at a time.
+    """
+
+    # the Board slots plus the bitboards; cells is left unset, so every public Board method
+    # that reads it is overridden here (the private helpers of Board.process_move are unused)
+    __slots__ = ('bits',)
+
+    def __init__(self):
+        """
+        Initializes the board with othello's initial configuration
+        """
+        self.bits = {
+            self.BLACK: (1 << 28) | (1 << 35),  # (4,3) and (3,4)
+            self.WHITE: (1 << 27) | (1 << 36),  # (3,3) and (4,4)
+        }
+
+        # cache legal moves in attempt to reduce function calls
+        self._legal_moves = {self.BLACK: None, self.WHITE: None}
+
+        # the flipped tiles are only stored for the user interfaces that ask for them (see Board.track_flipped)
+        self._flipped = None
+
+        self.accumulators = self.accumulated = NO_ACCUMULATORS
+
+        # zobrist hash of the tiles, updated incrementally at each move
+        self.zobrist = self.compute_zobrist()
+
+    @staticmethod
+    def from_string(string: str) -> 'BitBoard':
+        """
+        Generates a board from the string representation
+        :param string:
+        :return:
+        """
+        b = BitBoard()
+        b.bits = {b.BLACK: 0, b.WHITE: 0}
+        for lineno, line in enumerate(string.strip().split('\n')):
+            for colno, col in enumerate(line.strip()):
+                if col != b.EMPTY:
+                    b.bits[col] |= 1 << (lineno * 8 + colno)
+        b.zobrist = b.compute_zobrist()
+        return b
+
+    def compute_zobrist(self) -> int:
+        """
+        Computes the zobrist hash of the tiles from scratch
+        :return: int
+        """
+        return ZOBRIST.hash(
+            [(i, self.BLACK) for i in squares(self.bits[self.BLACK])] +
+            [(i, self.WHITE) for i in squares(self.bits[self.WHITE])]
+        )
+
+    @staticmethod
+    def zobrist_delta(color: str, square: int, flips: int) -> int:
+        """
+        Returns the value to XOR into the hash when color plays on square, flipping 'flips'
+        :return: int
+        """
+        opp = Board.opponent(color)
+        key = ZOBRIST.piece(square, color)
+        for i in squares(flips):
+            key ^= ZOBRIST.piece(i, opp) ^ ZOBRIST.piece(i, color)
+        return key
+
+    @property
+    def tiles(self) -> list:
+        """
+        Returns the 8x8 matrix of characters (indexed by y,x) equivalent to
+        this board. It is built on demand, so changing it does not change the board.
+        :return: list
+        """
+        black, white = self.bits[self.BLACK], self.bits[self.WHITE]
+        tiles = [[self.EMPTY] * 8 for _ in range(8)]
+        for i in squares(black):
+            tiles[i >> 3][i & 7] = self.BLACK
+        for i in squares(white):
+            tiles[i >> 3][i & 7] = self.WHITE
+        return tiles
+
+    @property
+    def piece_count(self) -> dict:
+        """
+        Returns the number of tiles of each kind (black, white and empty), computed on demand
+        :return: dict
+        """
+        black, white = popcount(self.bits[self.BLACK]), popcount(self.bits[self.WHITE])
+        return {self.BLACK: black, self.WHITE: white, self.EMPTY: 64 - black - white}
+
+    def num_pieces(self, color: str) -> int:
+        """
+        Returns the number of pieces of the given color
+        :param color:
+        :return:
+        """
+        if color == self.EMPTY:
+            return 64 - popcount(self.bits[self.BLACK] | self.bits[self.WHITE])
+        return popcount(self.bits[color])
+
+    def copy(self) -> 'BitBoard':
+        """
+        Returns a copy of this board object
+        :return:
+        """
+        b = BitBoard.__new__(BitBoard)
+        b.bits = dict(self.bits)
+        b._legal_moves = dict(self._legal_moves)
+        b._flipped = None
+        b.zobrist = self.zobrist
+        b.accumulators, b.accumulated = self.accumulators, self.accumulated
+        return b
+
+    def legal_moves_mask(self, color: str) -> int:
+        """
+        Returns the bitboard of legal moves for the given color
+        :param color:
+        :return: int
+        """
+        return moves_mask(self.bits[color], self.bits[self.opponent(color)])
+
+    def legal_moves(self, color: str) -> set:
+        """
+        Returns a set of legal moves (x,y coords) for the given color
+        :param color:str
+        :return:
+        """
+        if self._legal_moves[color] is None:
+            self._legal_moves[color] = {(i & 7, i >> 3) for i in squares(self.legal_moves_mask(color))}
+        return self._legal_moves[color]
+
+    def find_legal_moves_both(self):
+        """
+        Fills the legal moves cache of both colors
+        """
+        for color in (self.BLACK, self.WHITE):
+            self._legal_moves[color] = {(i & 7, i >> 3) for i in squares(self.legal_moves_mask(color))}
+
+    def has_legal_move(self, color):
+        """
+        Returns whether the given color has any legal move
+        :param color:
+        :return:bool
+        """
+        if self._legal_moves[color] is not None:
+            return len(self._legal_moves[color]) > 0
+        return self.legal_moves_mask(color) != 0
+
+    def is_terminal_state(self):
+        """
+        Returns whether the current state is terminal (game finished) or not
+        :return:
+        """
+        return not self.has_legal_move(self.BLACK) and not self.has_legal_move(self.WHITE)
+
+    def process_move(self, move_xy, color) -> bool:
+        """
+        Executes the placement of a tile of a given color
+        in a given position. Note that this is done in-place,
+        changing the current board object!
+        :param move_xy: position to place the tile in x,y (col,row) coordinates
+        :param color:color of the tile to be placed
+        :return: bool
+        """
+        if self._flipped is not None:
+            self._flipped = set()  # resets flipped tiles
+
+        if color not in [self.WHITE, self.BLACK]:
+            raise ValueError("Move must be made by BLACK or WHITE player")
+
+        x, y = move_xy
+        if not (0 <= x <= 7 and 0 <= y <= 7):
+            return False
+
+        opp = self.opponent(color)
+        own_bits, opp_bits = self.bits[color], self.bits[opp]
+        square = y * 8 + x
+        if ((own_bits | opp_bits) >> square) & 1:
+            return False
+
+        flips = flips_mask(own_bits, opp_bits, square)
+        if not flips:
+            return False  # guards against illegal moves
+
+        self._flip(color, opp, square, flips)
+        return True
+
+    def apply(self, move_xy, color) -> tuple:
+        """
+        Executes the move in-place and returns an undo record for undo()
+        :param move_xy: position to place the tile in x,y (col,row) coordinates
+        :param color: color of the tile to be placed
+        :return: undo record (move_xy, color, bitboard of flipped tiles, previous legal moves cache,
+                 previous accumulated values) or None if the move is illegal
+        """
+        if color not in [self.WHITE, self.BLACK]:
+            raise ValueError("Move must be made by BLACK or WHITE player")
+
+        x, y = move_xy
+        if not (0 <= x <= 7 and 0 <= y <= 7):
+            return None
+
+        opp = self.opponent(color)
+        own_bits, opp_bits = self.bits[color], self.bits[opp]
+        square = y * 8 + x
+        if ((own_bits | opp_bits) >> square) & 1:
+            return None
+
+        flips = flips_mask(own_bits, opp_bits, square)
+        if not flips:
+            return None
+
+        record = (move_xy, color, flips, (self._legal_moves[self.BLACK], self._legal_moves[self.WHITE]),
+                  self.accumulated)
+        self.bits[color] = own_bits | flips | (1 << square)
+        self.bits[opp] = opp_bits & ~flips
+        self.zobrist ^= self.zobrist_delta(color, square, flips)
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        if self.accumulators:
+            self._update_accumulators(square, color, list(squares(flips)))
+        return record
+
+    def undo(self, record: tuple):
+        """
+        Reverts a move executed by apply()
+        :param record: the undo record returned by apply()
+        """
+        (x, y), color, flips, (black_moves, white_moves), accumulated = record
+        opp = self.opponent(color)
+        self.bits[color] &= ~(flips | (1 << (y * 8 + x)))
+        self.bits[opp] |= flips
+        self.zobrist ^= self.zobrist_delta(color, y * 8 + x, flips)
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = black_moves, white_moves
+        self.accumulated = accumulated
+
+    def find_bracket(self, move, color, direction):
+        """
+        Traverses the board in given direction trying to
+        find a tile of the given color that surrounds opponent tiles (see Board.find_bracket)
+        :param move: (int, int) y,x coordinates of the starting tile
+        :param color: color of player making the move
+        :param direction: one of eight directions of tile neighborhood
+        :return: (int,int) y,x coordinates of the bracketing tile or False if not found
+        """
+        own, opp = self.bits[color], self.bits[self.opponent(color)]
+        run = False
+        for square in RAYS[move[0] * 8 + move[1]][DIRECTION_INDEX[direction]]:
+            bit = 1 << square
+            if opp & bit:
+                run = True
+            elif own & bit and run:
+                return square >> 3, square & 7
+            else:
+                return False
+        return False
+
+    def find_where_to_play_from_owned(self, owned, color, direction):
+        """
+        Traverses the board in given direction trying to
+        find an empty tile that surrounds opponent tiles (see Board.find_where_to_play_from_owned)
+        :param owned: (int, int), y,x coordinates of the owned tile
+        :param color: color of owned tile
+        :param direction: one of eight directions of tile neighborhood
+        :return: (int,int) y,x coordinates of the empty tile or False if not found
+        """
+        own, opp = self.bits[color], self.bits[self.opponent(color)]
+        run = False
+        for square in RAYS[owned[0] * 8 + owned[1]][DIRECTION_INDEX[direction]]:
+            bit = 1 << square
+            if opp & bit:
+                run = True
+            elif not own & bit and run:
+                return square >> 3, square & 7
+            else:
+                return False
+        return False
+
+    def flip_tiles(self, origin, color, direction):
+        """
+        Flips the opponent tiles between origin and the first
+        tile of the given color in the given direction
+        :param origin: y,x coordinates where the traversal will begin (y,x for matrix indexing)
+        :param color: new color of the pieces
+        :param direction: direction of traversal (see the constants on the beginning of the class)
+        :return:
+        """
+        destination = self.find_bracket(origin, color, direction)
+        if not destination:
+            return
+        oy, ox = origin
+        dy, dx = direction
+        flips = 0
+        ny, nx = oy + dy, ox + dx
+        while (ny, nx) != destination:
+            flips |= 1 << (ny * 8 + nx)
+            ny, nx = ny + dy, nx + dx
+        opp = self.opponent(color)
+        self.bits[color] |= flips
+        self.bits[opp] &= ~flips
+        for i in squares(flips):
+            self.zobrist ^= ZOBRIST.piece(i, opp) ^ ZOBRIST.piece(i, color)
+        if self._flipped is not None:
+            self._flipped.add(destination)
+            self._flipped.update((i >> 3, i & 7) for i in squares(flips))
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        if self.accumulators:
+            self._update_accumulators(None, color, list(squares(flips)))  # no disc was placed
+
+    def _flip(self, color, opp, square, flips):
+        """
+        Places a disc of 'color' in square and flips the discs in 'flips',
+        updating the caches
+        """
+        if self._flipped is not None:
+            # y,x for decorated_str; like Board, the discs that closed each flipped run are included
+            closing = brackets_mask(self.bits[color], self.bits[opp], square)
+            self._flipped = {(i >> 3, i & 7) for i in squares(flips | closing)}
+        self.bits[color] |= flips | (1 << square)
+        self.bits[opp] &= ~flips
+        self.zobrist ^= self.zobrist_delta(color, square, flips)
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        if self.accumulators:
+            self._update_accumulators(square, color, list(squares(flips)))
+
+    def __str__(self):
+        """
+        Returns the string representation of the board
+        :return: str
+        """
+        return ''.join('%s\n' % ''.join(row) for row in self.tiles)
@@ -1,3 +1,9 @@
+from ..zobrist import ZobristTable
+
+# keys for zobrist hashing, square index is y * 8 + x
+ZOBRIST = ZobristTable(64)
+
+
 def from_file(path_to_file):
     """
     Generates a board from the string representation
@@ -63,24 +69,35 @@ class Board(object):
         EMPTY: '-'
     }
 
+    # The board is stored compactly, so that search trees can hold many positions:
+    # no instance dict, and the 64 tiles in one bytearray (cells[y * 8 + x] is the ASCII
+    # code of 'B', 'W' or '.'). tiles and piece_count are derived from cells on demand.
+    # accumulators/accumulated: incremental evaluators registered with add_accumulator
+    # (name -> Accumulator) and their current values (name -> value); see add_accumulator.
+    # _flipped: tiles flipped by the last process_move, or None if not tracked (see track_flipped).
+    __slots__ = ('cells', 'zobrist', '_legal_moves', '_flipped', 'accumulators', 'accumulated')
+
     def __init__(self):
         """
         Initializes the 8x8 board with all tiles empty, except the center
         that are initialized according to othello's initial board
         :return:
         """
-        self.tiles = [[self.EMPTY] * 8 for i in range(8)]
-
-        self.tiles[3][3], self.tiles[3][4] = self.WHITE, self.BLACK
-        self.tiles[4][3], self.tiles[4][4] = self.BLACK, self.WHITE
+        self.cells = bytearray(INITIAL_CELLS)
 
         # cache legal moves in attempt to reduce function calls
         self._legal_moves = {self.BLACK: None, self.WHITE: None}
 
-        self.piece_count = {self.BLACK: 2, self.WHITE: 2, self.EMPTY: 60}
+        # the flipped tiles are only stored for the user interfaces that ask for them
+        self._flipped = None
+
+        # empty defaults, never mutated: add_accumulator gives the board its own copies,
+        # shared with its copies until they register more
+        self.accumulators = self.accumulated = NO_ACCUMULATORS
 
-        # stores the flipped tiles at each move
-        self.flipped = set()
+        # zobrist hash of the tiles, updated incrementally at each move
+        self.zobrist = (ZOBRIST.piece(3 * 8 + 3, self.WHITE) ^ ZOBRIST.piece(3 * 8 + 4, self.BLACK) ^
+                        ZOBRIST.piece(4 * 8 + 3, self.BLACK) ^ ZOBRIST.piece(4 * 8 + 4, self.WHITE))
 
     @staticmethod
     def from_string(string: str) -> 'Board':
@@ -90,17 +107,94 @@ class Board(object):
         :return:
         """
         b = Board()
-        # resets piece_count and set it during board construction
-        b.piece_count = {b.BLACK: 0, b.WHITE: 0, b.EMPTY: 0}
+        b.cells = bytearray(CODES[Board.EMPTY] for _ in range(64))
         for lineno, line in enumerate(string.strip().split('\n')):
             line.strip()  # cuts the \n
 
             for colno, col in enumerate(line):
-                b.tiles[lineno][colno] = col
-                b.piece_count[col] += 1
+                b.cells[lineno * 8 + colno] = CODES[col]
 
+        b.zobrist = b.compute_zobrist()
         return b
 
+    def compute_zobrist(self) -> int:
+        """
+        Computes the zobrist hash of the tiles from scratch
+        :return: int
+        """
+        return ZOBRIST.hash((square, COLORS[code]) for square, code in enumerate(self.cells))
+
+    @property
+    def tiles(self) -> list:
+        """
+        Returns the 8x8 matrix of characters (indexed by y,x) equivalent to
+        this board. It is built on demand, so changing it does not change the board.
+        :return: list
+        """
+        string = self.cells.decode()
+        return [list(string[i:i + 8]) for i in range(0, 64, 8)]
+
+    @property
+    def piece_count(self) -> dict:
+        """
+        Returns the number of tiles of each kind (black, white and empty), computed on demand
+        :return: dict
+        """
+        cells = self.cells
+        return {self.BLACK: cells.count(CODES[self.BLACK]), self.WHITE: cells.count(CODES[self.WHITE]),
+                self.EMPTY: cells.count(CODES[self.EMPTY])}
+
+    @property
+    def flipped(self) -> set:
+        """
+        Returns the tiles (y,x coords) flipped by the last process_move, including the
+        tiles that closed each flipped run, for highlighting purposes (see decorated_str).
+        It is always empty unless track_flipped() was called.
+        :return: set
+        """
+        return self._flipped if self._flipped is not None else set()
+
+    def track_flipped(self):
+        """
+        Makes process_move record the tiles it flips (see flipped). This is meant for the
+        user interfaces: the boards created by GameState.next_state from this one also
+        track them, but plain copies, e.g. the ones given to the agents, do not.
+        """
+        if self._flipped is None:
+            self._flipped = set()
+
+    @property
+    def tracks_flipped(self) -> bool:
+        """
+        Returns whether process_move records the flipped tiles (see track_flipped)
+        :return: bool
+        """
+        return self._flipped is not None
+
+    def add_accumulator(self, accumulator):
+        """
+        Registers an incremental evaluator (see accumulators.py). Its value is computed now,
+        kept up to date by process_move, apply, undo and flip_tiles, carried over by copy and
+        available in self.accumulated[accumulator.name]
+        :param accumulator: Accumulator
+        """
+        self.accumulators = dict(self.accumulators)
+        self.accumulators[accumulator.name] = accumulator
+        self.accumulated = dict(self.accumulated)
+        self.accumulated[accumulator.name] = accumulator.compute(self)
+
+    def _update_accumulators(self, square, color, flips):
+        """
+        Updates the accumulated values after a move (the board must be already updated)
+        :param square: square (y*8 + x) of the placed disc, or None if discs were only flipped
+        :param color: color of the placed disc
+        :param flips: squares of the flipped discs
+        """
+        accumulated = dict(self.accumulated)  # the previous dict may be held by an undo record
+        for name, accumulator in self.accumulators.items():
+            accumulated[name] = accumulator.update(accumulated[name], self, square, color, flips)
+        self.accumulated = accumulated
+
     def is_within_bounds(self, move):
         """
         Returns whether the move refers to a valid board position
@@ -135,7 +229,7 @@ class Board(object):
         :param color:
         :return:
         """
-        return self.piece_count[color]
+        return self.cells.count(CODES[color])
 
     def winner(self):
         """
@@ -143,9 +237,10 @@ class Board(object):
         This only makes sense if self is a terminal state (not checked here)
         :return:
         """
-        if self.piece_count[self.BLACK] > self.piece_count[self.WHITE]:
+        black, white = self.num_pieces(self.BLACK), self.num_pieces(self.WHITE)
+        if black > white:
             return self.BLACK
-        elif self.piece_count[self.BLACK] < self.piece_count[self.WHITE]:
+        elif black < white:
             return self.WHITE
         else:
             return None
@@ -159,27 +254,20 @@ class Board(object):
         :param direction: one of eight directions of tile neighborhood
         :return: (int,int)
         """
-        # performing inline boundary check to avoid calls for is_within_bounds
-        # this saves some time
-        dx, dy = direction
-        tx, ty = move
-        tx += dx
-        ty += dy
-
-        opp = self.BLACK if color == self.WHITE else self.WHITE  # inline opponent calc.
-
-        if not (0 <= tx <= 7 and 0 <= ty <= 7) or self.tiles[tx][ty] != opp:
-            return False
-
-        while self.tiles[tx][ty] == opp:  # putting is_within_bounds here yields more calls
-            tx += dx
-            ty += dy
-            if not (0 <= tx <= 7 and 0 <= ty <= 7):  # self.is_within_bounds((tx, ty)):
+        # the tiles along the direction come from the precomputed RAYS table,
+        # so there are no coordinate sums or bounds checks during the traversal
+        own, opp = CODES[color], OPPONENT_CODES[color]
+        cells = self.cells
+        run = False
+        for square in RAYS[move[0] * 8 + move[1]][DIRECTION_INDEX[direction]]:
+            cell = cells[square]
+            if cell == opp:
+                run = True
+            elif cell == own and run:
+                return square >> 3, square & 7
+            else:
                 return False
-
-        if self.tiles[tx][ty] == self.EMPTY:
-            return False
-        return tx, ty
+        return False
 
     def find_where_to_play_from_owned(self, owned, color, direction):
         """
@@ -192,33 +280,31 @@ class Board(object):
         :param direction: one of eight directions of tile neighborhood
         :return: (int,int) or False if not found
         """
-        # performing inline boundary check to avoid calls for is_within_bounds
-        # this saves some time
-        dx, dy = direction
-        tx, ty = owned
-        tx += dx
-        ty += dy
-        opp = self.BLACK if color == self.WHITE else self.WHITE  # inline opponent calc.
-
-        if not (0 <= tx <= 7 and 0 <= ty <= 7) or self.tiles[tx][ty] != opp:  # color:
-            return False
-
-        while self.tiles[tx][ty] == opp:
-            tx += dx
-            ty += dy
-            if not (0 <= tx <= 7 and 0 <= ty <= 7):
+        opp = OPPONENT_CODES[color]
+        cells = self.cells
+        run = False
+        for square in RAYS[owned[0] * 8 + owned[1]][DIRECTION_INDEX[direction]]:
+            cell = cells[square]
+            if cell == opp:
+                run = True
+            elif cell == EMPTY_CODE and run:
+                return square >> 3, square & 7
+            else:
                 return False
-
-        if self.tiles[tx][ty] != self.EMPTY:
-            return False
-        return tx, ty
+        return False
 
     def copy(self) -> 'Board':
         """
         Returns a copy of this board object
         :return:
         """
-        return self.from_string(self.__str__())
+        b = Board.__new__(Board)
+        b.cells = bytearray(self.cells)
+        b.zobrist = self.zobrist
+        b._legal_moves = dict(self._legal_moves)  # the move sets are never changed, only replaced
+        b._flipped = None
+        b.accumulators, b.accumulated = self.accumulators, self.accumulated
+        return b
 
     def process_move(self, move_xy, color) -> bool:
         """
@@ -230,30 +316,125 @@ class Board(object):
         :param color:color of the tile to be placed
         :return: bool
         """
+        tracked = self._flipped is not None
+        if tracked:
+            self._flipped = set()  # resets flipped tiles
 
-        self.flipped = set()  # resets flipped tiles
+        if color not in [self.WHITE, self.BLACK]:
+            raise ValueError("Move must be made by BLACK or WHITE player")
+
+        brackets = [] if tracked else None
+        flipped = self._legal_flips(move_xy, color, brackets)
+        if flipped is None:
+            return False  # guards against illegal moves
+
+        # places the piece, flips the bracketed tiles and updates the hash
+        x, y = move_xy  # move is received in x,y but cells are indexed by y*8 + x
+        square = y * 8 + x
+        self._place(square, color, flipped)
+        if tracked:
+            # for highlighting purposes (see decorated_str)
+            self._flipped = {(i >> 3, i & 7) for i in flipped + brackets}
+
+        if self.accumulators:
+            self._update_accumulators(square, color, flipped)
+
+        # resets legal moves
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        return True
 
+    def apply(self, move_xy, color) -> tuple:
+        """
+        Executes the move in-place, like process_move, but returns an undo record
+        that can be given to undo() to restore the previous position exactly.
+        This allows searching the game tree without copying the board at each node.
+        :param move_xy: position to place the tile in x,y (col,row) coordinates
+        :param color: color of the tile to be placed
+        :return: undo record (move_xy, color, flipped squares, previous legal moves cache,
+                 previous accumulated values) or None if the move is illegal
+        """
         if color not in [self.WHITE, self.BLACK]:
             raise ValueError("Move must be made by BLACK or WHITE player")
 
-        if self.is_legal(move_xy, color):
-            # places the piece and update piece counts
-            x, y = move_xy  
-            move_yx = y, x  # move is received in x,y but tiles are indexded by y,x
+        flipped = self._legal_flips(move_xy, color)
+        if flipped is None:
+            return None
 
-            self.tiles[y][x] = color
-            self.piece_count[color] += 1
-            self.piece_count[self.EMPTY] -= 1
+        x, y = move_xy
+        record = (move_xy, color, tuple(flipped), (self._legal_moves[self.BLACK], self._legal_moves[self.WHITE]),
+                  self.accumulated)
 
-            # TODO put this inside flip_tiles
-            for direc in self.DIRECTIONS:
-                self.flip_tiles(move_yx, color, direc)  # flip tiles receives moves in y,x
+        self._place(y * 8 + x, color, flipped)
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        if self.accumulators:
+            self._update_accumulators(y * 8 + x, color, flipped)
+        return record
 
-            # resets legal moves
-            self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
-            return True
+    def _place(self, square, color, flipped):
+        """
+        Places a disc of the given color in square and flips the given squares, updating the hash
+        """
+        cells = self.cells
+        own = CODES[color]
+        keys, opp_keys = ZOBRIST.pieces[color], ZOBRIST.pieces[self.opponent(color)]
+        key = keys[square]
+        cells[square] = own
+        for i in flipped:
+            cells[i] = own
+            key ^= opp_keys[i] ^ keys[i]
+        self.zobrist ^= key
 
-        return False  # guards against illegal moves
+    def _legal_flips(self, move_xy, color, brackets=None):
+        """
+        Returns the squares flipped by the move, or None if the move is illegal.
+        The legal moves cache is used when available, but not generated
+        :param brackets: optional list that receives the squares closing each flipped run
+        """
+        moves = self._legal_moves[color]
+        if moves is not None and move_xy not in moves:
+            return None
+        x, y = move_xy
+        if not (0 <= x <= 7 and 0 <= y <= 7) or self.cells[y * 8 + x] != EMPTY_CODE:
+            return None
+        return self._flips(x, y, color, brackets) or None
+
+    def _flips(self, x, y, color, brackets=None) -> list:
+        """
+        Returns the squares (y*8 + x) flipped by placing a disc of the given color in x,y
+        :param brackets: optional list that receives the squares closing each flipped run
+        """
+        own, opp = CODES[color], OPPONENT_CODES[color]
+        cells = self.cells
+        flipped = []
+        for ray in LINES[y * 8 + x]:
+            for i, square in enumerate(ray):
+                cell = cells[square]
+                if cell != opp:
+                    if cell == own and i > 0:
+                        flipped.extend(ray[:i])
+                        if brackets is not None:
+                            brackets.append(square)
+                    break
+        return flipped
+
+    def undo(self, record: tuple):
+        """
+        Reverts a move executed by apply()
+        :param record: the undo record returned by apply()
+        """
+        (x, y), color, flipped, (black_moves, white_moves), accumulated = record
+        cells = self.cells
+        opp_code = OPPONENT_CODES[color]
+        keys, opp_keys = ZOBRIST.pieces[color], ZOBRIST.pieces[self.opponent(color)]
+
+        key = keys[y * 8 + x]
+        cells[y * 8 + x] = EMPTY_CODE
+        for i in flipped:
+            cells[i] = opp_code
+            key ^= opp_keys[i] ^ keys[i]
+        self.zobrist ^= key
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = black_moves, white_moves
+        self.accumulated = accumulated
 
     def flip_tiles(self, origin, color, direction):
         """
@@ -267,21 +448,25 @@ class Board(object):
         destination = self.find_bracket(origin, color, direction)  # move, player, board, direction)
         if not destination:
             return
-        self.flipped.add(destination)  # for highlighting purposes (see decorated_str)
-        ox, oy = origin
-        dx, dy = direction
-
-        nx, ny = ox + dx, oy + dy  # n stands for 'next'
-
-        opp = self.opponent(color)
-
-        while (nx, ny) != destination:
-            # flips the tile and updates piece counts
-            self.flipped.add((nx, ny))
-            self.tiles[nx][ny] = color
-            self.piece_count[color] += 1
-            self.piece_count[opp] -= 1
-            nx, ny = nx + dx, ny + dy
+        if self._flipped is not None:
+            self._flipped.add(destination)  # for highlighting purposes (see decorated_str)
+
+        cells = self.cells
+        own = CODES[color]
+        keys, opp_keys = ZOBRIST.pieces[color], ZOBRIST.pieces[self.opponent(color)]
+        flipped = []
+        for square in RAYS[origin[0] * 8 + origin[1]][DIRECTION_INDEX[direction]]:
+            if (square >> 3, square & 7) == destination:
+                break
+            # flips the tile and updates the hash
+            cells[square] = own
+            self.zobrist ^= opp_keys[square] ^ keys[square]
+            flipped.append(square)
+            if self._flipped is not None:
+                self._flipped.add((square >> 3, square & 7))
+        self._legal_moves[self.BLACK], self._legal_moves[self.WHITE] = None, None
+        if self.accumulators:
+            self._update_accumulators(None, color, flipped)  # no disc was placed
 
     def legal_moves(self, color:str) -> set:
         """
@@ -290,53 +475,46 @@ class Board(object):
         :return:
         """
         if self._legal_moves[color] is None:
-            # construct the set of legal moves 
-            self._legal_moves[color] = set()
+            # the moves of both colors are found in the same pass, as both are needed
+            # right after a move (see GameState.next_state and is_terminal_state)
+            self.find_legal_moves_both()
 
-            # the functions called below fill self._legal_moves[color]
-            if self.piece_count[color] > self.piece_count[self.EMPTY]:
-                self.find_legal_moves_dense(color)
-            else:
-                self.find_legal_moves_sparse(color)
-               
         return self._legal_moves[color]
 
-    def find_legal_moves_dense(self, color):
-        """
-        Finds the legal moves for a given color in a dense board.
-        A dense board has less empty tiles than pieces of the given color.
-        :param color:
-        """
-        # test if every empty tile on the board is a legal move
-        tiles = [(x, y) for x in range(8) for y in range(8) if self.tiles[x][y] == self.EMPTY]
-
-        for x, y in tiles:
-            if self.tiles[x][y] == self.EMPTY:  # and any(map(hasbracket, self.DIRECTIONS)):
-                # performs the 'inline' any:
-                for direc in self.DIRECTIONS:
-                    if self.find_bracket((x, y), color, direc):
-                        # flips x,y because of the way tiles are stored and the x,y coords in real world
-                        self._legal_moves[color].add((y,x))
+    def find_legal_moves_both(self):
+        """
+        Finds the legal moves of both colors in a single pass over the empty tiles,
+        filling the legal moves cache of both. Walking a ray from an empty tile over
+        discs of one color tells whether the other color brackets them, so each ray
+        is traversed once for both players.
+        """
+        cells = self.cells
+        empty = EMPTY_CODE
+        found = {CODES[self.BLACK]: set(), CODES[self.WHITE]: set()}
+
+        for square, cell in enumerate(cells):
+            if cell != empty:
+                continue
+            movers = set()
+            for ray in LINES[square]:
+                run = None  # color of the discs to be bracketed
+                for i in ray:
+                    cell = cells[i]
+                    if run is None:
+                        if cell == empty:
+                            break
+                        run = cell
+                    elif cell != run:
+                        if cell != empty:
+                            movers.add(cell)  # the other color closes the run
                         break
+                if len(movers) == 2:
+                    break
+            for mover in movers:
+                found[mover].add((square & 7, square >> 3))
 
-    def find_legal_moves_sparse(self, color):
-        """
-        Finds the legal moves for a given color in a sparse board.
-        A sparse board has more empty tiles than pieces of the given color
-        :param color:
-        :return:
-        """
-        # test if every empty tile on the board is a legal move
-        tiles = [(x, y) for x in range(8) for y in range(8) if self.tiles[x][y] == color]
-
-        for y, x in tiles:
-            if self.tiles[y][x] == color:
-                for direc in self.DIRECTIONS:
-                    move_yx = self.find_where_to_play_from_owned((y, x), color, direc)
-                    if move_yx:
-                        # flips x,y because of matrix indexing vs board coords
-                        m_y, m_x = move_yx
-                        self._legal_moves[color].add((m_x, m_y))
+        self._legal_moves[self.BLACK] = found[CODES[self.BLACK]]
+        self._legal_moves[self.WHITE] = found[CODES[self.WHITE]]
 
     def has_legal_move(self, color):
         """
@@ -344,17 +522,8 @@ class Board(object):
         :param color:
         :return:bool
         """
-        # test if every empty tile on the board is a legal move
-        tiles = [(x, y) for x in range(8) for y in range(8) if self.tiles[x][y] == self.EMPTY]
-
-        for x, y in tiles:
-            # self._legal_moves[color] = [(y, x) for x, y in tiles if self.is_legal((x, y), color)]
-
-            hasbracket = lambda direction: self.find_bracket((x, y), color, direction)
-
-            if self.tiles[x][y] == self.EMPTY and any(map(hasbracket, self.DIRECTIONS)):
-                return True
-        return False
+        # fills the cache of both colors: next_state asks for one and is_terminal_state for both
+        return len(self.legal_moves(color)) > 0
 
     @staticmethod
     def opponent(color):
@@ -426,8 +595,37 @@ class Board(object):
         Returns the string representation of the board
         :return: str
         """
-        string = ''
-        for i, row in enumerate(self.tiles):
-            string += '%s\n' % ''.join(row)
+        string = self.cells.decode()
+        return ''.join(string[i:i + 8] + '\n' for i in range(0, 64, 8))
 
-        return string
+
+# ASCII codes of the tiles in Board.cells, and back
+CODES = {Board.BLACK: ord(Board.BLACK), Board.WHITE: ord(Board.WHITE), Board.EMPTY: ord(Board.EMPTY)}
+COLORS = {code: color for color, code in CODES.items()}
+EMPTY_CODE = CODES[Board.EMPTY]
+OPPONENT_CODES = {Board.BLACK: CODES[Board.WHITE], Board.WHITE: CODES[Board.BLACK]}
+
+# cells of the initial board
+INITIAL_CELLS = (b'.' * 27) + b'WB' + (b'.' * 6) + b'BW' + (b'.' * 27)
+
+# default (empty) accumulators of the boards
+NO_ACCUMULATORS = {}
+
+# Precomputed tables for move generation and flipping. Squares are y * 8 + x, the indexes
+# of Board.cells. RAYS[square][d] holds the squares met walking from square in direction
+# Board.DIRECTIONS[d] (the direction is added to (y, x), as in find_bracket), nearest first,
+# up to the edge of the board.
+RAYS = [
+    [tuple((y + k * dy) * 8 + x + k * dx for k in range(1, 8) if 0 <= y + k * dy <= 7 and 0 <= x + k * dx <= 7)
+     for dy, dx in Board.DIRECTIONS]
+    for y in range(8) for x in range(8)
+]
+
+# index of each direction in the rows of RAYS
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(Board.DIRECTIONS)}
+
+# rays of each square that can hold a bracket (at least two tiles: a run and its closing disc)
+LINES = [[ray for ray in rays if len(ray) >= 2] for rays in RAYS]
+
+# 8-neighbourhood of each square
+NEIGHBORS = [sorted(ray[0] for ray in rays if ray) for rays in RAYS]
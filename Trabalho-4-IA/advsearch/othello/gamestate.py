@@ -1,5 +1,5 @@
 from typing import Tuple, Union
-from .board import Board
+from .board import Board, ZOBRIST
 
 class GameState(object):
     """
@@ -11,6 +11,9 @@ class GameState(object):
 
     game_name = "Othello"
 
+    # no instance dict: search trees may hold many states
+    __slots__ = ('board', 'player')
+
     def __init__(self, board:Board, player:str) -> None:
         """
         Initializes the Game state with the given board and player to move.
@@ -47,6 +50,12 @@ class GameState(object):
         """
         return self.board.winner()
 
+    def zobrist_key(self) -> int:
+        """
+        Returns the zobrist hash of this state (board tiles and player to move)
+        """
+        return self.board.zobrist ^ ZOBRIST.side(self.player)
+
     def get_board(self) -> Board:
         """
         Returns the board configuration
@@ -67,20 +76,54 @@ class GameState(object):
         :param move: move in x,y (col,row) coordinates
         """
         next_board = self.board.copy()
+        if self.board.tracks_flipped:
+            next_board.track_flipped()
         if not next_board.process_move(move, self.player):
             raise ValueError("Invalid move: %s" % str(move))
 
+        next_state = GameState(next_board, self._next_player(next_board))
+
+        return next_state
+
+    def _next_player(self, next_board: Board) -> Union[str,None]:
+        """
+        Returns who plays after self.player has moved, resulting in next_board
+        """
         opponent = Board.opponent(self.player)
         
         # alternates the player, but checkes if it has valid moves
         # also, if neither the opponent nor the player have
-        # valid moves, then the next player is None
+        # valid moves, then the next player is None.
+        # The first query generates the moves of both colors (see Board.find_legal_moves_both),
+        # which stay cached for is_terminal, legal_moves and the evaluation functions
         next_player = None
         if next_board.has_legal_move(opponent):
             next_player = opponent
         elif next_board.has_legal_move(self.player):
             next_player = self.player
+        return next_player
 
-        next_state = GameState(next_board, next_player)
+    def apply(self, move:Tuple[int,int]) -> tuple:
+        """
+        Executes the move in-place (the board and the player are changed)
+        and returns an undo record, which undo() uses to restore this state.
+        This is the copy-free alternative to next_state for tree searches.
+        :param move: move in x,y (col,row) coordinates
+        :return: undo record (board undo record, previous player)
+        """
+        board_record = self.board.apply(move, self.player)
+        if board_record is None:
+            raise ValueError("Invalid move: %s" % str(move))
 
-        return next_state
+        previous_player = self.player
+        self.player = self._next_player(self.board)
+        return board_record, previous_player
+
+    def undo(self, record: tuple) -> None:
+        """
+        Reverts a move executed by apply()
+        :param record: the undo record returned by apply()
+        """
+        board_record, previous_player = record
+        self.board.undo(board_record)
+        self.player = previous_player
@@ -1,5 +1,10 @@
 from typing import Tuple, Union
 
+from ..zobrist import ZobristTable
+
+# keys for zobrist hashing, square index is row * 3 + col
+ZOBRIST = ZobristTable(9)
+
 class Board:
     """
     A board implementation for the tic-tac-toe misere game
@@ -12,6 +17,7 @@ class Board:
 
     def __init__(self):
         self.board = [['.' for _ in range(3)] for _ in range(3)]
+        self.zobrist = 0  # zobrist hash of the markers, updated by place_marker
 
     @staticmethod
     def from_string(board_str: str) -> 'Board':
@@ -27,8 +33,15 @@ class Board:
                 else:
                     raise ValueError("Invalid cell value in the board string representation")
 
+        board.zobrist = board.compute_zobrist()
         return board
 
+    def compute_zobrist(self) -> int:
+        """
+        Computes the zobrist hash of the markers from scratch
+        """
+        return ZOBRIST.hash((row * 3 + col, self.board[row][col]) for row in range(3) for col in range(3))
+
     def __str__(self):
         return '\n'.join([' '.join(row) for row in self.board])
     
@@ -53,7 +66,11 @@ class Board:
         return '\n'.join([' '.join(row) for row in decorated_board])
 
     def place_marker(self, player, row, col):
+        square = row * 3 + col
+        if self.board[row][col] != self.EMPTY:  # overwritten marker leaves the hash
+            self.zobrist ^= ZOBRIST.piece(square, self.board[row][col])
         self.board[row][col] = player
+        self.zobrist ^= ZOBRIST.piece(square, player)
 
     def is_empty(self, row, col):
         return self.board[row][col] == '.'
@@ -84,4 +101,5 @@ class Board:
     def copy(self):
         new_board = Board()
         new_board.board = [row[:] for row in self.board]
+        new_board.zobrist = self.zobrist
         return new_board
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import Tuple, Union
-from .board import Board
+from .board import Board, ZOBRIST
 
 class GameState:
 
@@ -36,6 +36,12 @@ class GameState:
         else:
             return None
 
+    def zobrist_key(self) -> int:
+        """
+        Returns the zobrist hash of this state (board markers and player to move)
+        """
+        return self.board.zobrist ^ ZOBRIST.side(self.player)
+
     def get_board(self) -> Board:
         return self.board
 
@@ -0,0 +1,166 @@
+import random
+from typing import List, Sequence, Tuple
+
+from ..othello.bitboard import FULL, popcount
+from .endgame import bitboards
+
+# Playouts aleatorios de Othello em lote: muitas partidas independentes avancam juntas, uma
+# jogada por rodada, como numa instrucao vetorial. Os bitboards de todas as partidas ficam lado a
+# lado num unico inteiro do Python (SWAR, "SIMD within a register"): a partida i ocupa os bits
+# [LANE * i, LANE * i + 64), e os LANE - 64 bits seguintes ficam sempre zerados, para que os
+# deslocamentos de ate' 9 casas nao passem de uma partida para a vizinha. A geracao de jogadas e
+# as viradas sao deslocamentos e mascaras sobre o inteiro todo, para todas as partidas de uma vez;
+# so' o sorteio da jogada e' feito partida a partida.
+#
+# A cada rodada todas as partidas trocam de lado (own <-> opp); quem nao tem jogada passa (nao
+# coloca disco). Uma partida termina quando os dois jogadores passam em seguida, e dai' em diante
+# so' passa, sem mudar, ate' que todas terminem.
+
+# bits por partida: 64 casas e 16 de folga (os deslocamentos sao de no maximo 9 bits)
+LANE = 80
+LANE_BYTES = LANE // 8
+
+# bytes de cada casa (um bit) na largura de uma partida, indexados pelo bit, e o de nenhuma casa
+_PLACED = {1 << square: (1 << square).to_bytes(LANE_BYTES, 'little') for square in range(64)}
+_NONE = bytes(LANE_BYTES)
+
+
+def _replicate(mask: int, count: int) -> int:
+    """
+    Repete a mascara de 64 bits em cada uma das count partidas
+    """
+    return int.from_bytes(mask.to_bytes(LANE_BYTES, 'little') * count, 'little')
+
+
+def pack(boards: Sequence[int]) -> int:
+    """
+    Junta os bitboards de 64 bits (um por partida) num unico inteiro
+    """
+    return int.from_bytes(b''.join(board.to_bytes(LANE_BYTES, 'little') for board in boards), 'little')
+
+
+def unpack(packed: int, count: int) -> List[int]:
+    """
+    Separa o inteiro de pack nos count bitboards
+    """
+    data = packed.to_bytes(count * LANE_BYTES, 'little')
+    return [int.from_bytes(data[start:start + 8], 'little') for start in range(0, count * LANE_BYTES, LANE_BYTES)]
+
+
+def moves(own: int, opp: int, inner: int, full: int) -> int:
+    """
+    Jogadas de own em todas as partidas (como endgame._moves, com as mascaras repetidas)
+    :param inner: 0x7E7E7E7E7E7E7E7E repetida (tira as colunas das bordas, evita dar a volta)
+    :param full: FULL repetida (zera a folga de cada partida)
+    """
+    inner &= opp
+    result = 0
+    for step, run_mask in ((1, inner), (7, inner), (9, inner), (8, opp)):
+        run = run_mask & (own << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        result |= run << step
+        run = run_mask & (own >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        result |= run >> step
+    return result & ~(own | opp) & full
+
+
+def flips(own: int, opp: int, placed: int, inner: int) -> int:
+    """
+    Discos de opp virados em todas as partidas quando own joga nas casas de placed
+    (no maximo uma por partida; partidas sem casa nao viram nada)
+    """
+    inner &= opp
+    result = 0
+    for step, run_mask in ((1, inner), (7, inner), (9, inner), (8, opp)):
+        # a sequencia de discos do adversario a partir da casa jogada; se a casa seguinte ao fim
+        # dela for de own, a sequencia e' refeita de tras para frente a partir dessa casa
+        run = run_mask & (placed << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        line = run & ((own & (run << step)) >> step)
+        line |= run & (line >> step)
+        line |= run & (line >> step)
+        line |= run & (line >> step)
+        line |= run & (line >> step)
+        line |= run & (line >> step)
+        result |= line
+        run = run_mask & (placed >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        line = run & ((own & (run >> step)) << step)
+        line |= run & (line << step)
+        line |= run & (line << step)
+        line |= run & (line << step)
+        line |= run & (line << step)
+        line |= run & (line << step)
+        result |= line
+    return result
+
+
+def simulate(positions: Sequence[Tuple[int, int]], rng=random) -> List[int]:
+    """
+    Joga aleatoriamente, em lote, cada posicao ate' o fim
+    :param positions: pares de bitboards (own, opp), own do jogador que move em cada partida
+    :param rng: fonte de numeros aleatorios (com random())
+    :return: diferenca final de discos de cada partida, do ponto de vista de quem movia no inicio
+    """
+    count = len(positions)
+    if not count:
+        return []
+    own = pack([position[0] for position in positions])
+    opp = pack([position[1] for position in positions])
+    inner, full = _replicate(0x7E7E7E7E7E7E7E7E, count), _replicate(FULL, count)
+    uniform = rng.random
+
+    passes = [0] * count  # passes seguidos de cada partida (2: terminou)
+    remaining, plies = count, 0
+    while remaining:
+        data = moves(own, opp, inner, full).to_bytes(count * LANE_BYTES, 'little')
+        chosen = []
+        for game in range(count):
+            start = game * LANE_BYTES
+            legal = int.from_bytes(data[start:start + 8], 'little')
+            if legal:
+                passes[game] = 0
+                # sorteia uma das jogadas: descarta um numero aleatorio das mais baixas
+                for _ in range(int(uniform() * popcount(legal))):
+                    legal &= legal - 1
+                chosen.append(_PLACED[legal & -legal])
+            else:
+                chosen.append(_NONE)
+                if passes[game] < 2:
+                    passes[game] += 1
+                    if passes[game] == 2:
+                        remaining -= 1
+        if remaining:
+            placed = int.from_bytes(b''.join(chosen), 'little')
+            flipped = flips(own, opp, placed, inner)
+            own, opp = opp ^ flipped, own | flipped | placed
+            plies += 1
+
+    # todas as partidas trocaram de lado a cada rodada
+    sign = -1 if plies % 2 else 1
+    return [sign * (popcount(mine) - popcount(theirs)) for mine, theirs in zip(unpack(own, count), unpack(opp, count))]
+
+
+def playouts(state, count: int, rng=random) -> List[int]:
+    """
+    Joga count partidas aleatorias a partir do estado de Othello state
+    :return: diferenca final de discos de cada partida, do ponto de vista de state.player
+    """
+    return simulate([bitboards(state)] * count, rng)
@@ -0,0 +1,67 @@
+import time
+from typing import Callable, Tuple
+
+from .minimax import minimax_move, SearchTimeout
+from .move_ordering import MoveOrderer
+from .transposition import TranspositionTable
+
+
+def iterative_deepening_move(state, eval_func: Callable, time_budget: float, max_depth: int = 64,
+                             search: Callable = minimax_move, tt: TranspositionTable = None,
+                             orderer=None, stats: dict = None) -> Tuple[int, int]:
+    """
+    Busca com profundidade 1, 2, 3, ... ate' esgotar o tempo e retorna a jogada
+    da ultima iteracao completa. Se a iteracao interrompida ja' tiver terminado
+    de buscar alguma jogada da raiz, usa a melhor delas: como a jogada da iteracao
+    anterior e' sempre buscada primeiro, ela e' pelo menos tao informada quanto a anterior.
+
+    A tabela de transposicao e' compartilhada entre as iteracoes, de modo que a variante
+    principal de uma iteracao ordena as jogadas da seguinte (o mesmo vale para as
+    killer moves e o historico do orderer).
+
+    :param state: estado a partir do qual buscar
+    :param eval_func: funcao de avaliacao eval_func(state, player)
+    :param time_budget: tempo maximo em segundos
+    :param max_depth: profundidade maxima
+    :param search: funcao de busca com a interface de minimax_move
+    :param tt: tabela de transposicao (uma nova e' criada se None)
+    :param orderer: ordenacao das jogadas (MoveOrderer sem prioridade estatica se None)
+    :param stats: dict opcional; recebe 'depth' (ultima profundidade completa),
+                  'nodes' (nodos das iteracoes completas) e 'value' (valor da ultima iteracao completa)
+    :return: (int, int) jogada (x, y), ou None se nao houver jogadas
+    """
+    deadline = time.perf_counter() + time_budget
+    if tt is None:
+        tt = TranspositionTable()
+    if orderer is None:
+        orderer = MoveOrderer()
+
+    legal = state.legal_moves()
+    if not legal:
+        return None
+
+    best_move = next(iter(legal))  # garante uma jogada legal mesmo sem nenhuma iteracao completa
+    nodes = 0
+    for depth in range(1, max_depth + 1):
+        iteration = {}
+        try:
+            move = search(state, depth, eval_func, iteration, tt=tt, orderer=orderer, deadline=deadline)
+        except SearchTimeout as timeout:
+            if timeout.best_move is not None:
+                best_move = timeout.best_move
+            break
+        finally:
+            nodes += iteration.get('nodes', 0)
+
+        best_move = move
+        if stats is not None:
+            stats['depth'] = depth
+            stats['value'] = iteration['value']
+
+        # nenhuma folha foi cortada pela profundidade: a arvore inteira ja' foi resolvida
+        if iteration['horizon'] == 0:
+            break
+
+    if stats is not None:
+        stats['nodes'] = nodes
+    return best_move
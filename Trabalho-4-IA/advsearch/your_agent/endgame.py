@@ -0,0 +1,318 @@
+import time
+from typing import Callable, Optional, Tuple
+
+from ..othello.board import Board, CODES, LINES
+from ..othello.bitboard import BitBoard, FULL, popcount, squares
+from .minimax import SearchTimeout
+
+# Resolucao exata do final da partida de Othello.
+# Com poucas casas vazias, a arvore ate' o fim do jogo e' pequena o bastante para ser buscada
+# inteira, e o valor exato (diferenca final de discos) substitui a heuristica. A busca trabalha
+# direto com os bitboards (own, opp) do jogador que move, sem GameState:
+# - primeiro uma busca vitoria/empate/derrota (WLD) com a janela (-1, 1), barata por cortar muito;
+# - depois a busca exata, com a janela do lado certo do zero (ex.: (0, 65) se a WLD deu vitoria);
+# - negamax com janelas nulas (PVS), ordenando as jogadas pela menor mobilidade do adversario
+#   (fastest-first) e pela paridade das regioes, com uma tabela de transposicao propria.
+# O valor e' a diferenca de discos ao fim do jogo, do ponto de vista de quem move; casas que
+# ficarem vazias nao contam para ninguem, como em Board.winner.
+
+# casas vazias a partir das quais as jogadas sao ordenadas por mobilidade (abaixo, so' pela paridade)
+FASTEST_FIRST_EMPTIES = 6
+
+# casas vazias a partir das quais os nodos sao guardados na tabela de transposicao
+TABLE_EMPTIES = 5
+
+# mascaras dos quatro quadrantes 4x4, usados na paridade
+QUADRANTS = [sum(1 << (y * 8 + x) for y in range(y0, y0 + 4) for x in range(x0, x0 + 4))
+             for y0 in (0, 4) for x0 in (0, 4)]
+QUADRANT_OF = [next(i for i, mask in enumerate(QUADRANTS) if mask >> square & 1) for square in range(64)]
+
+# bits das casas de cada raio que pode conter uma captura (ver board.LINES)
+_RAY_BITS = [[tuple(1 << square for square in ray) for ray in lines] for lines in LINES]
+
+
+def _moves(own: int, opp: int) -> int:
+    """
+    Bitboard das jogadas de own (mesmo resultado de bitboard.moves_mask, com os deslocamentos
+    escritos por extenso, sem chamadas de funcao, pois e' o gargalo da busca)
+    """
+    inner = opp & 0x7E7E7E7E7E7E7E7E  # o adversario fora das bordas laterais (evita dar a volta)
+    moves = 0
+    for step, run_mask in ((1, inner), (7, inner), (9, inner), (8, opp)):
+        run = run_mask & (own << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        run |= run_mask & (run << step)
+        moves |= run << step
+        run = run_mask & (own >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        run |= run_mask & (run >> step)
+        moves |= run >> step
+    return moves & ~(own | opp) & FULL
+
+
+def _flips(own: int, opp: int, square: int) -> int:
+    """
+    Bitboard dos discos de opp virados quando own joga em square
+    """
+    flips = 0
+    for ray in _RAY_BITS[square]:
+        line = 0
+        for bit in ray:
+            if opp & bit:
+                line |= bit
+            else:
+                if own & bit:
+                    flips |= line
+                break
+    return flips
+
+
+def bitboards(state) -> Tuple[int, int]:
+    """
+    Retorna os bitboards (own, opp) do jogador que move em state e do seu adversario
+    """
+    board = state.board
+    player = state.player
+    opponent = Board.opponent(player)
+    if isinstance(board, BitBoard):
+        return board.bits[player], board.bits[opponent]
+    own_code, opp_code = CODES[player], CODES[opponent]
+    own = opp = 0
+    for square, code in enumerate(board.cells):
+        if code == own_code:
+            own |= 1 << square
+        elif code == opp_code:
+            opp |= 1 << square
+    return own, opp
+
+
+class EndgameTable(object):
+    """
+    Tabela de transposicao da busca de final de jogo. Guarda, para cada posicao (own, opp),
+    os limites inferior e superior conhecidos do seu valor e a melhor jogada (casa).
+    Quando fica cheia, e' esvaziada (as entradas so' valem para o final da partida em andamento).
+    """
+
+    def __init__(self, max_entries: int = 1 << 18):
+        """
+        :param max_entries: numero maximo de entradas
+        """
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive')
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self):
+        """
+        Remove todas as entradas
+        """
+        self.entries.clear()
+
+    def probe(self, own: int, opp: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Retorna (limite inferior, limite superior, melhor casa) da posicao, ou None
+        """
+        return self.entries.get((own, opp))
+
+    def store(self, own: int, opp: int, lower: int, upper: int, square: int):
+        """
+        Guarda os limites do valor da posicao e a sua melhor casa
+        """
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[(own, opp)] = (lower, upper, square)
+
+
+def solve_move(state, deadline: float = None, stats: dict = None, exact: bool = True,
+               table: EndgameTable = None) -> Tuple[int, int]:
+    """
+    Retorna a jogada otima para o jogador de state, buscando ate' o fim da partida.
+
+    :param state: GameState do Othello (com Board ou BitBoard)
+    :param deadline: instante (em time.perf_counter()) em que a busca deve ser abandonada,
+                     lancando SearchTimeout. Se a busca WLD ja' tiver terminado, best_move da excecao
+                     e' a jogada que garante o resultado (vitoria, empate ou derrota) encontrado.
+    :param stats: dict opcional; recebe 'nodes', 'wld' (1, 0 ou -1) e, se exact, 'value'
+                  (diferenca final de discos com jogo perfeito, do ponto de vista do jogador de state)
+    :param exact: se False, para depois da busca WLD
+    :param table: tabela de transposicao (uma nova e' criada se None)
+    :return: (int, int) jogada (x, y), ou None se nao houver jogadas
+    """
+    if table is None:
+        table = EndgameTable()
+    nodes = [0]
+
+    def last_move(own, opp, square):
+        # valor com uma unica casa vazia: joga quem puder, sem gerar jogadas
+        diff = popcount(own) - popcount(opp)
+        flipped = popcount(_flips(own, opp, square))
+        if flipped:
+            return diff + 2 * flipped + 1
+        flipped = popcount(_flips(opp, own, square))
+        if flipped:
+            return diff - 2 * flipped - 1
+        return diff
+
+    def children(own, opp, moves, empty, empties, hash_square):
+        # filhos (casa, own do filho, opp do filho) na ordem de busca
+        odd = [popcount(empty & mask) & 1 for mask in QUADRANTS]
+        result = []
+        for square in squares(moves):
+            bit = 1 << square
+            flips = _flips(own, opp, square)
+            child_own, child_opp = opp & ~flips, own | flips | bit  # o adversario passa a mover
+            if square == hash_square:
+                rank = -1
+            elif empties >= FASTEST_FIRST_EMPTIES:
+                # menos jogadas para o adversario primeiro; no empate, regiao de paridade impar
+                rank = 2 * popcount(_moves(child_own, child_opp)) + 1 - odd[QUADRANT_OF[square]]
+            else:
+                rank = 1 - odd[QUADRANT_OF[square]]
+            result.append((rank, square, child_own, child_opp))
+        result.sort()
+        return result
+
+    def search(own, opp, alpha, beta):
+        # negamax com janelas nulas; valor exato dentro de (alpha, beta), limite fora dela
+        nodes[0] += 1
+        if deadline is not None and nodes[0] & 1023 == 0 and time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        empty = ~(own | opp) & FULL
+        empties = popcount(empty)
+        if empties == 1:
+            return last_move(own, opp, empty.bit_length() - 1)
+
+        moves = _moves(own, opp)
+        if not moves:
+            if not _moves(opp, own):
+                return popcount(own) - popcount(opp)  # fim de jogo
+            return -search(opp, own, -beta, -alpha)   # passa a vez
+
+        hash_square = None
+        if empties >= TABLE_EMPTIES:
+            entry = table.probe(own, opp)
+            if entry is not None:
+                lower, upper, hash_square = entry
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha, beta = max(alpha, lower), min(beta, upper)
+
+        best, best_square, window_alpha = -65, None, alpha
+        for _, square, child_own, child_opp in children(own, opp, moves, empty, empties, hash_square):
+            if best_square is None:
+                value = -search(child_own, child_opp, -beta, -window_alpha)
+            else:
+                value = -search(child_own, child_opp, -window_alpha - 1, -window_alpha)
+                if window_alpha < value < beta:
+                    value = -search(child_own, child_opp, -beta, -value)
+            if value > best:
+                best, best_square = value, square
+                if value > window_alpha:
+                    window_alpha = value
+                    if window_alpha >= beta:
+                        break
+
+        if empties >= TABLE_EMPTIES:
+            if best <= alpha:
+                table.store(own, opp, -64, best, best_square)
+            elif best >= beta:
+                table.store(own, opp, best, 64, best_square)
+            else:
+                table.store(own, opp, best, best, best_square)
+        return best
+
+    def search_root(own, opp, moves, alpha, beta):
+        # como search, na raiz: retorna (valor, melhor casa)
+        empty = ~(own | opp) & FULL
+        entry = table.probe(own, opp)
+        best, best_square, window_alpha = -65, None, alpha
+        for _, square, child_own, child_opp in children(own, opp, moves, empty, popcount(empty),
+                                                         entry[2] if entry is not None else None):
+            if best_square is None:
+                value = -search(child_own, child_opp, -beta, -window_alpha)
+            else:
+                value = -search(child_own, child_opp, -window_alpha - 1, -window_alpha)
+                if window_alpha < value < beta:
+                    value = -search(child_own, child_opp, -beta, -value)
+            if value > best:
+                best, best_square = value, square
+                window_alpha = max(window_alpha, value)
+                if window_alpha >= beta:
+                    break
+        return best, best_square
+
+    own, opp = bitboards(state)
+    moves = _moves(own, opp)
+    if not moves:
+        return None
+
+    def as_move(square):
+        return square & 7, square >> 3
+
+    try:
+        # vitoria, empate ou derrota
+        wld, square = search_root(own, opp, moves, -1, 1)
+        wld = (wld > 0) - (wld < 0)
+        move = as_move(square)
+        if stats is not None:
+            stats['wld'] = wld
+        if not exact:
+            return move
+
+        # diferenca exata, do lado do zero indicado pela busca WLD
+        if wld == 0:
+            value = 0
+        else:
+            window = (0, 65) if wld > 0 else (-65, 0)
+            try:
+                value, square = search_root(own, opp, moves, *window)
+            except SearchTimeout as timeout:
+                timeout.best_move = move
+                raise
+            move = as_move(square)
+        if stats is not None:
+            stats['value'] = value
+        return move
+    finally:
+        if stats is not None:
+            stats['nodes'] = stats.get('nodes', 0) + nodes[0]
+
+
+def endgame_move(state, time_budget: float, fallback: Callable = None, share: float = 0.5,
+                 stats: dict = None) -> Tuple[int, int]:
+    """
+    Resolve o final da partida com solve_move, usando no maximo share * time_budget.
+    Se a busca exata nao terminar, usa a jogada da busca WLD; se nem a WLD terminar, retorna
+    fallback(tempo restante de time_budget), que deve escolher a jogada de outra forma
+    (ex.: aprofundamento iterativo), ou None se fallback for None.
+    """
+    start = time.perf_counter()
+    try:
+        return solve_move(state, deadline=start + share * time_budget, stats=stats)
+    except SearchTimeout as timeout:
+        if timeout.best_move is not None:
+            return timeout.best_move
+    if fallback is None:
+        return None
+    return fallback(max(0.0, start + time_budget - time.perf_counter()))
+
+
+def is_endgame(state, max_empties: int) -> bool:
+    """
+    Retorna se state e' um estado do Othello, com jogador da vez, com no maximo max_empties casas vazias
+    """
+    board = getattr(state, 'board', None)
+    return (isinstance(board, Board) and getattr(state, 'player', None) is not None
+            and board.num_pieces(Board.EMPTY) <= max_empties)
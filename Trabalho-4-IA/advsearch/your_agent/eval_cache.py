@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from typing import Callable
+
+
+class EvalCache(object):
+    """
+    Memoiza uma funcao de avaliacao eval_func(state, player), para que folhas repetidas
+    (transposicoes, ou as mesmas folhas nas varias iteracoes do aprofundamento iterativo)
+    nao sejam avaliadas de novo.
+
+    A chave e' (state.zobrist_key(), player): o hash inclui o jogador da vez, do qual algumas
+    heuristicas dependem (ex.: mobilidade). Estados sem zobrist_key sao avaliados sem cache.
+    O numero de entradas e' limitado a max_entries; quando cheia, a entrada usada ha' mais
+    tempo e' descartada (LRU).
+
+    Uso: cached = EvalCache(evaluate_custom); minimax_move(state, 4, cached)
+    """
+
+    def __init__(self, eval_func: Callable, max_entries: int = 1 << 16):
+        """
+        :param eval_func: funcao de avaliacao eval_func(state, player)
+        :param max_entries: numero maximo de entradas
+        """
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive')
+        self.eval_func = eval_func
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, state, player: str) -> float:
+        zobrist_key = getattr(state, 'zobrist_key', None)
+        if zobrist_key is None:
+            self.misses += 1
+            return self.eval_func(state, player)
+
+        key = (zobrist_key(), player)
+        entries = self.entries
+        value = entries.get(key)
+        if value is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.eval_func(state, player)
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fracao das avaliacoes respondidas pelo cache
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """
+        Remove todas as entradas (os contadores sao mantidos)
+        """
+        self.entries.clear()
@@ -0,0 +1,168 @@
+from typing import Callable, Optional
+
+from ..othello.board import Board
+from ..othello.bitboard import BitBoard, FULL, SHIFTS, moves_mask, popcount, shift, squares
+
+# Acesso direto ao tabuleiro para as funcoes de avaliacao.
+# As heuristicas aceitam qualquer objeto que "pareca" um estado (por isso extraem a grade por
+# reflexao), mas o caso comum e' um GameState do proprio Othello, cujo Board (ou BitBoard) ja'
+# guarda as casas como 'B', 'W' e '.' e a contagem de pecas. Nesse caso, as funcoes abaixo
+# entregam esses dados sem passar por str(board) nem normalizar cada casa.
+
+
+def native_board(state) -> Optional[Board]:
+    """
+    Retorna o Board do Othello de state (GameState ou o proprio Board), ou None
+    se state for um objeto estranho, que deve ser tratado pela extracao por reflexao
+    """
+    board = getattr(state, 'board', state)
+    return board if isinstance(board, Board) else None
+
+
+def packed_cells(board: Board) -> str:
+    """
+    Retorna as 64 casas do tabuleiro numa string, linha a linha
+    (a casa (x, y) esta' no indice y*8 + x), com os caracteres 'B', 'W' e '.'
+    """
+    if isinstance(board, BitBoard):
+        # monta a string a partir dos bits, sem construir a matriz tiles
+        cells = bytearray(b'.' * 64)
+        for color in (Board.BLACK, Board.WHITE):
+            code = ord(color)
+            for i in squares(board.bits[color]):
+                cells[i] = code
+        return cells.decode()
+    return board.cells.decode()
+
+
+# ---------------------- avaliador compilado ----------------------
+#
+# Uma heuristica e' descrita por uma lista de termos (nome, tipo, tabela) e por fases,
+# cada uma com o peso de cada termo. compile_evaluator transforma essa descricao numa
+# funcao que percorre o tabuleiro uma unica vez e calcula todos os termos juntos:
+# - os termos SQUARES (soma de pesos por casa) sao empacotados num unico inteiro por casa,
+#   entao cada disco custa uma soma, independente do numero de termos;
+# - a mesma passada monta os bitboards dos dois jogadores, dos quais saem a mobilidade
+#   e a fronteira dos dois lados com operacoes de bits.
+
+# Tipos de termo. Cada um e' calculado do ponto de vista de player, contra o seu adversario.
+MATERIAL = 'material'   # 100 * (meus discos - discos dele) / total de discos
+MOBILITY = 'mobility'   # 100 * (jogadas do jogador da vez - jogadas dele) / soma (ver compile_evaluator)
+FRONTIER = 'frontier'   # 100 * (fronteira dele - minha fronteira) / soma; fronteira = discos vizinhos a uma casa vazia
+SQUARES = 'squares'     # soma da tabela 8x8 (inteira) nas minhas casas - soma nas casas dele
+
+_FIELD = 24             # bits de cada termo SQUARES no inteiro empacotado
+_HALF = 1 << (_FIELD - 1)
+_FIELD_MASK = (1 << _FIELD) - 1
+
+
+def square_table(squares_xy, weight: int) -> list:
+    """
+    Retorna uma tabela 8x8 (indexada por [y][x]) com weight nas casas dadas e 0 nas demais
+    :param squares_xy: casas (x, y)
+    :param weight: peso das casas
+    """
+    table = [[0] * 8 for _ in range(8)]
+    for x, y in squares_xy:
+        table[y][x] = weight
+    return table
+
+
+def compile_evaluator(features: list, phases: list) -> Callable:
+    """
+    Compila uma heuristica numa funcao evaluate(board, to_move, player) -> float.
+
+    :param features: lista de termos (nome, tipo, tabela), onde tipo e' MATERIAL, MOBILITY,
+                     FRONTIER ou SQUARES, e tabela e' uma matriz 8x8 de inteiros
+                     (indexada por [y][x]) para SQUARES e None para os demais
+    :param phases: lista de (limite, pesos) em ordem crescente de limite, onde pesos e' um dict
+                   nome -> peso. Usa-se a primeira fase cujo limite seja >= o total de discos
+                   (limite None vale para qualquer total).
+    :return: funcao evaluate(board, to_move, player), onde board e' um Board do Othello,
+             to_move e' o jogador da vez (a mobilidade de MOBILITY e' a dele, e e' 0 se for None)
+             e player e' o jogador para quem o valor e' calculado. O valor e' a soma dos
+             peso * termo, na ordem de features.
+    """
+    packed = [0] * 64
+    terms = []  # (tipo, deslocamento do termo no inteiro empacotado)
+    offset = 0
+    for name, kind, table in features:
+        if kind == SQUARES:
+            for i in range(64):
+                packed[i] += table[i >> 3][i & 7] << offset
+            terms.append((kind, offset))
+            offset += _FIELD
+        elif kind in (MATERIAL, MOBILITY, FRONTIER):
+            terms.append((kind, None))
+        else:
+            raise ValueError(f'Unknown feature type {kind!r} for feature {name!r}')
+    num_squares = offset // _FIELD
+    weights = [(limit, [phase[name] for name, _, _ in features]) for limit, phase in phases]
+
+    def unpack(acc):
+        # separa os termos SQUARES somados no inteiro empacotado (cada um pode ser negativo)
+        values = []
+        for _ in range(num_squares):
+            value = ((acc + _HALF) & _FIELD_MASK) - _HALF
+            values.append(value)
+            acc = (acc - value) >> _FIELD
+        return values
+
+    def evaluate(board: Board, to_move, player: str) -> float:
+        opp = 'B' if player == 'W' else 'W'
+
+        # passada unica pelos discos: bitboards dos dois lados e termos SQUARES
+        acc = 0
+        bitboard = isinstance(board, BitBoard)
+        if bitboard:
+            own, other = board.bits.get(player, 0), board.bits[opp]
+            for i in squares(own):
+                acc += packed[i]
+            for i in squares(other):
+                acc -= packed[i]
+        else:
+            own = other = 0
+            for i, cell in enumerate(packed_cells(board)):
+                if cell == player:
+                    own |= 1 << i
+                    acc += packed[i]
+                elif cell == opp:
+                    other |= 1 << i
+                    acc -= packed[i]
+        square_values = unpack(acc)
+
+        own_count, other_count = popcount(own), popcount(other)
+        total = own_count + other_count
+        for limit, phase_weights in weights:
+            if limit is None or total <= limit:
+                break
+
+        score = None
+        for (kind, offset), weight in zip(terms, phase_weights):
+            if kind == SQUARES:
+                value = square_values[offset // _FIELD]
+            elif kind == MATERIAL:
+                value = 100.0 * (own_count - other_count) / total if total > 0 else 0.0
+            elif kind == MOBILITY:
+                if bitboard:
+                    theirs = popcount(moves_mask(other, own))
+                    own_moves = popcount(moves_mask(own, other)) if to_move == player else 0
+                else:
+                    # o Board ja' gerou as jogadas dos dois lados numa unica passada (is_terminal)
+                    theirs = len(board.legal_moves(opp))
+                    own_moves = len(board.legal_moves(player)) if to_move == player else 0
+                mine = own_moves if to_move == player else (theirs if to_move == opp else 0)
+                value = 100.0 * (mine - theirs) / (mine + theirs) if mine + theirs > 0 else 0.0
+            else:  # FRONTIER
+                empty = ~(own | other) & FULL
+                near_empty = 0
+                for amount, mask in SHIFTS:
+                    near_empty |= shift(empty, amount, mask)
+                own_frontier, other_frontier = popcount(own & near_empty), popcount(other & near_empty)
+                frontier_sum = own_frontier + other_frontier
+                value = 100.0 * (other_frontier - own_frontier) / frontier_sum if frontier_sum > 0 else 0.0
+            term = weight * value
+            score = term if score is None else score + term
+        return float(score) if score is not None else 0.0
+
+    return evaluate
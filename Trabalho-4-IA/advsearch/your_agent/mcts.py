@@ -1,11 +1,293 @@
+import math
 import random
-from typing import Tuple
+import time
+from typing import Optional, Tuple
 
-# Voce pode criar funcoes auxiliares neste arquivo
-# e tambem modulos auxiliares neste pacote.
+from ..othello.board import Board as OthelloBoard
+from . import batch_playout, mcts_parallel, mcts_tree, truncated_playout
+
+# Monte Carlo Tree Search com UCT (Upper Confidence bounds applied to Trees).
+# Usa so' a interface generica de GameState (is_terminal, legal_moves, next_state, winner, player),
+# entao funciona para o Othello, o Tic-Tac-Toe Misere e qualquer jogo com a mesma interface.
+#
+# Cada iteracao: selecao (desce pela arvore escolhendo o filho de maior UCB1), expansao (cria um
+# filho para uma jogada ainda nao tentada), simulacao (jogadas aleatorias ate' o fim) e
+# retropropagacao (vitoria 1, empate 1/2, derrota 0 para o jogador que fez a jogada de cada nodo).
 #
-# Nao esqueca de renomear 'your_agent' com o nome
-# do seu agente.
+# A arvore (de objetos Node ou em colunas, ver TREE_STORAGE) e' mantida entre as chamadas de
+# make_move: a nova raiz e' procurada entre os netos (nossa jogada e a resposta do adversario) e
+# os filhos (se o adversario passou) da raiz anterior, e a subarvore dela e' reaproveitada.
+
+# tempo de busca por jogada (s), com folga em relacao ao delay de 5s do servidor
+TIME_BUDGET = 4.5
+
+# constante de exploracao do UCB1
+EXPLORATION = math.sqrt(2)
+
+# armazenamento da arvore: 'objects' (um Node com o seu estado por nodo) ou 'array' (colunas
+# preallocadas, ver mcts_tree.py; os estados sao recalculados a partir da raiz). 'array' usa de
+# 10 a 40 vezes menos memoria por nodo, mas faz de 10% a 25% menos playouts por segundo
+# (benchmarks/mcts_tree.py); com TIME_BUDGET de alguns segundos, a arvore de objetos cabe na memoria.
+TREE_STORAGE = 'objects'
+
+# numero de processos do MCTS paralelo na raiz (0 desliga; None usa todos os nucleos; ver mcts_parallel.py).
+# Cada processo usa uma arvore de objetos, qualquer que seja TREE_STORAGE. TIME_BUDGET conta a partir
+# do pool pronto: na primeira jogada, a partida dos processos (cerca de 0.1s cada) vem antes dele.
+PARALLEL_WORKERS = 0
+
+# playouts por iteracao no Othello, jogados juntos por batch_playout.py (1: um playout por vez).
+# O lote joga mais partidas por segundo, mas a arvore cresce menos (um nodo por lote); ver
+# benchmarks/batch_playout.py. Vale para a arvore de objetos (e os processos do MCTS paralelo).
+PLAYOUT_BATCH = 1
+
+# playouts truncados no Othello (truncated_playout.py): o playout para depois de ROLLOUT_CUTOFF
+# jogadas e a posicao e' avaliada pela heuristica ROLLOUT_EVAL ('mask' ou 'custom'), convertida
+# em probabilidade de vitoria. None joga ate' o fim. Vale com PLAYOUT_BATCH = 1, na arvore de objetos.
+ROLLOUT_CUTOFF = None
+ROLLOUT_EVAL = 'mask'
+
+# estatisticas da ultima jogada: 'playouts', 'seconds', 'playouts_per_second',
+# 'tree_size' (nodos da arvore ao fim da busca) e 'reused' (nodos reaproveitados da jogada anterior)
+last_stats = {}
+
+_root = None        # raiz da arvore de objetos
+_array_tree = None  # arvore em colunas
+
+
+class Node(object):
+    """
+    Nodo da arvore: o estado, a jogada que levou a ele e as estatisticas
+    do ponto de vista de quem fez essa jogada (o jogador da vez no pai)
+    """
+
+    __slots__ = ('state', 'move', 'parent', 'children', 'untried', 'visits', 'wins', 'exhausted')
+
+    def __init__(self, state, move=None, parent: 'Node' = None):
+        self.state = state
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = [] if state.is_terminal() else list(state.legal_moves())
+        self.visits = 0
+        self.wins = 0.0
+        # a subarvore inteira ja' esta' na arvore (todos os caminhos chegam a estados terminais)
+        self.exhausted = not self.untried
+
+    def key(self) -> tuple:
+        """
+        Identifica o estado do nodo (tabuleiro e jogador da vez), para reencontra-lo na jogada seguinte
+        """
+        return str(self.state.board), self.state.player
+
+    def size(self) -> int:
+        """
+        Retorna o numero de nodos da subarvore
+        """
+        count, pending = 0, [self]
+        while pending:
+            node = pending.pop()
+            count += 1
+            pending.extend(node.children)
+        return count
+
+
+def _select_child(node: Node, exploration: float) -> Node:
+    """
+    Retorna o filho de maior UCB1 (os filhos ja' foram todos visitados ao menos uma vez)
+    """
+    log_visits = math.log(node.visits)
+    best, best_value = None, None
+    for child in node.children:
+        value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        if best_value is None or value > best_value:
+            best, best_value = child, value
+    return best
+
+
+def _playout(state, rng) -> Optional[str]:
+    """
+    Joga aleatoriamente a partir de state ate' o fim e retorna o vencedor (None se empate).
+    Estados com apply (Othello) sao copiados uma vez e alterados no lugar.
+    """
+    if state.is_terminal():
+        return state.winner()
+    if hasattr(state, 'apply'):
+        state = state.copy()
+        while not state.is_terminal():
+            state.apply(rng.choice(tuple(state.legal_moves())))
+        return state.winner()
+    while not state.is_terminal():
+        state = state.next_state(rng.choice(tuple(state.legal_moves())))
+    return state.winner()
+
+
+def _othello_points(state, score: float, count: int) -> dict:
+    """
+    Pontos de cada cor em count partidas de Othello a partir do estado nao terminal state,
+    dados os pontos score de state.player
+    """
+    return {state.player: score, OthelloBoard.opponent(state.player): count - score}
+
+
+def _batch_playout(state, batch: int, rng) -> dict:
+    """
+    Joga batch partidas aleatorias de Othello a partir do estado nao terminal state (batch_playout.py)
+    e retorna os pontos de cada cor (vitoria 1, empate 1/2)
+    """
+    score = sum(1.0 if difference > 0 else 0.5 if difference == 0 else 0.0
+                for difference in batch_playout.playouts(state, batch, rng))
+    return _othello_points(state, score, batch)
+
+
+def search(root: Node, time_budget: float, exploration: float = EXPLORATION, rng=random,
+           max_playouts: int = None, batch: int = 1, cutoff: int = None, evaluation: str = 'mask') -> int:
+    """
+    Executa iteracoes do MCTS a partir de root ate' esgotar time_budget (ou max_playouts playouts,
+    ou ate' a arvore conter o jogo inteiro)
+    :param batch: playouts por iteracao em estados de Othello nao terminais (ver PLAYOUT_BATCH)
+    :param cutoff: jogadas ate' o corte dos playouts de Othello, com avaliacao pela heuristica
+                   evaluation (ver ROLLOUT_CUTOFF e ROLLOUT_EVAL); None joga ate' o fim
+    :return: numero de playouts executados
+    """
+    deadline = time.perf_counter() + time_budget
+    evaluate, scale = truncated_playout.EVALUATORS[evaluation], truncated_playout.SIGMOID_SCALE[evaluation]
+    playouts = 0
+    while not root.exhausted and time.perf_counter() < deadline:
+        if max_playouts is not None and playouts >= max_playouts:
+            break
+
+        # selecao
+        node = root
+        while not node.untried and node.children:
+            node = _select_child(node, exploration)
+
+        # expansao
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            child = Node(node.state.next_state(move), move, node)
+            node.children.append(child)
+            node = child
+
+        # simulacao: count partidas; points tem os pontos de cada cor nelas, ou e' None quando ha'
+        # um unico playout ate' o fim, que vale pelo vencedor (winner)
+        points = winner = None
+        if batch > 1 and node.untried and node.state.game_name == 'Othello':
+            count, points = batch, _batch_playout(node.state, batch, rng)
+        elif cutoff is not None and node.untried and node.state.game_name == 'Othello':
+            count = 1
+            points = _othello_points(node.state, truncated_playout.playout(node.state, cutoff, evaluate, scale, rng), 1)
+        else:
+            count, winner = 1, _playout(node.state, rng)
+
+        # retropropagacao; a subarvore esgotada sobe enquanto os irmaos tambem estiverem esgotados
+        exhausted = node.exhausted
+        while node is not None:
+            node.visits += count
+            parent = node.parent
+            if parent is not None:
+                # pontos de quem fez a jogada do nodo (o jogador da vez no pai)
+                mover = parent.state.player
+                if points is None:
+                    node.wins += 1.0 if winner == mover else 0.5 if winner is None else 0.0
+                else:
+                    node.wins += points[mover]
+                if exhausted:
+                    exhausted = not parent.untried and all(child.exhausted for child in parent.children)
+                    parent.exhausted = exhausted
+            node = parent
+        playouts += count
+    return playouts
+
+
+def best_move(root: Node):
+    """
+    Retorna a jogada do filho mais visitado da raiz (ou None, se a raiz nao tiver filhos)
+    """
+    if not root.children:
+        return None
+    return max(root.children, key=lambda child: (child.visits, child.wins)).move
+
+
+def _find_root(state) -> Optional[Node]:
+    """
+    Procura, na arvore da jogada anterior, o nodo do estado atual: a propria raiz,
+    um filho (o adversario passou) ou um neto (nossa jogada e a resposta do adversario)
+    """
+    if _root is None:
+        return None
+    key = (str(state.board), state.player)
+    if _root.key() == key:
+        return _root
+    for child in _root.children:
+        if child.key() == key:
+            return child
+    for child in _root.children:
+        for grandchild in child.children:
+            if grandchild.key() == key:
+                return grandchild
+    return None
+
+
+def _find_array_tree(state) -> Optional[mcts_tree.ArrayTree]:
+    """
+    Como _find_root, para a arvore em colunas: retorna a subarvore do estado atual
+    (os estados dos filhos e netos sao recalculados a partir da raiz), ou None
+    """
+    tree = _array_tree
+    if tree is None:
+        return None
+    key = (str(state.board), state.player)
+    if (str(tree.root_state.board), tree.root_state.player) == key:
+        return tree
+    children = list(tree.children(0))
+    for index in children + [grandchild for child in children for grandchild in tree.children(child)]:
+        node_state = tree.state_at(index)
+        if (str(node_state.board), node_state.player) == key:
+            return tree.subtree(index)
+    return None
+
+
+def _array_search(state, time_budget: float) -> tuple:
+    """
+    Busca com a arvore em colunas; retorna (jogada, iteracoes, nodos reaproveitados, nodos ao fim)
+    """
+    global _array_tree
+    tree = _find_array_tree(state)
+    reused = 0
+    if tree is None:
+        tree = mcts_tree.ArrayTree(state.copy())
+    else:
+        reused = len(tree)
+    _array_tree = tree
+    playouts = mcts_tree.search(tree, time_budget, EXPLORATION)
+    return mcts_tree.best_move(tree), playouts, reused, len(tree)
+
+
+def _object_search(state, time_budget: float) -> tuple:
+    """
+    Busca com a arvore de objetos; retorna (jogada, iteracoes, nodos reaproveitados, nodos ao fim)
+    """
+    global _root
+    root = _find_root(state)
+    reused = 0
+    if root is None:
+        root = Node(state)
+    else:
+        root.parent = None  # libera o resto da arvore anterior
+        reused = root.size()
+    _root = root
+    playouts = search(root, time_budget, batch=PLAYOUT_BATCH, cutoff=ROLLOUT_CUTOFF, evaluation=ROLLOUT_EVAL)
+    return best_move(root), playouts, reused, root.size()
+
+
+def _parallel_search(state, time_budget: float) -> tuple:
+    """
+    Busca com o MCTS paralelo na raiz; retorna (jogada, iteracoes, nodos reaproveitados, nodos ao fim),
+    com as iteracoes e os nodos somados entre os processos (o reaproveitamento nao e' medido)
+    """
+    stats = {}
+    move = mcts_parallel.parallel_mcts_move(state, time_budget, PARALLEL_WORKERS, stats)
+    return move, stats['playouts'], 0, stats['tree_size']
 
 
 def make_move(state) -> Tuple[int, int]:
@@ -17,10 +299,18 @@ def make_move(state) -> Tuple[int, int]:
     :param state: state to make the move
     :return: (int, int) tuple with x, y coordinates of the move (remember: 0 is the first row/column)
     """
+    start = time.perf_counter()
+    if PARALLEL_WORKERS != 0:
+        move, playouts, reused, tree_size = _parallel_search(state, TIME_BUDGET)
+    else:
+        tree_search = _array_search if TREE_STORAGE == 'array' else _object_search
+        move, playouts, reused, tree_size = tree_search(state, TIME_BUDGET - (time.perf_counter() - start))
+    if move is None:  # nenhuma iteracao (sem tempo) ou estado sem filhos expandidos
+        legal = list(state.legal_moves())
+        move = random.choice(legal) if legal else None
 
-    # o codigo abaixo retorna uma jogada ilegal
-    # Remova-o e coloque a sua implementacao do MCTS
-
-    return (-1, -1)
-
-
+    seconds = time.perf_counter() - start
+    last_stats.clear()
+    last_stats.update(playouts=playouts, seconds=seconds, playouts_per_second=playouts / max(seconds, 1e-9),
+                      tree_size=tree_size, reused=reused)
+    return move
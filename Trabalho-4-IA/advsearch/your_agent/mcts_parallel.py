@@ -0,0 +1,149 @@
+import atexit
+import multiprocessing
+import os
+import random
+import threading
+import time
+from typing import Tuple
+
+from . import mcts
+
+# MCTS paralelo na raiz: cada processo do pool cresce uma arvore independente a partir do mesmo
+# estado, com sementes diferentes e o mesmo prazo, e devolve so' as estatisticas dos filhos da
+# raiz (jogada, visitas, valor). As estatisticas sao somadas e a jogada mais visitada no total
+# e' escolhida. Cada tarefa leva um identificador (0 a workers - 1), que define a sua semente e a
+# sua arvore: o pool nao garante uma tarefa por processo, e um processo que receba duas tarefas
+# cresce duas arvores separadas. Os processos vivem entre as jogadas e guardam as arvores (de
+# objetos, como mcts.py) pelo identificador, para reaproveita-las na jogada seguinte.
+
+_pool = None            # pool de processos, criado uma unica vez por processo do agente
+_pool_workers = 0
+
+# folga, tirada de time_budget, para os processos pararem no prazo e devolverem os resultados
+RESULT_SLACK = 0.25
+
+
+def get_pool(workers: int = None):
+    """
+    Retorna o pool de processos, criando-o na primeira chamada e esperando os processos ficarem
+    prontos (com os modulos importados), para que o prazo da primeira busca nao se perca na partida deles.
+    O pool continua vivo entre as jogadas e e' encerrado quando o agente termina.
+    :param workers: numero de processos (padrao: os.cpu_count()). Se mudar, o pool e' recriado.
+    """
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    if _pool is not None and _pool_workers == workers:
+        return _pool
+    shutdown_pool()
+
+    # 'spawn' funciona em todas as plataformas e nao herda as threads do servidor
+    ctx = multiprocessing.get_context('spawn')
+    ready = ctx.Barrier(workers + 1)
+    _pool = ctx.Pool(workers, initializer=_init_worker, initargs=(ready,))
+    _pool_workers = workers
+    ready.wait()
+    ready.abort()  # processos recriados pelo pool (se algum morrer) nao esperam mais ninguem
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Encerra o pool de processos, se existir
+    """
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+# ----------------------- lado dos processos do pool -----------------------
+
+_trees = {}     # arvores do processo: identificador da tarefa -> (prazo da busca, raiz)
+
+def _init_worker(ready):
+    """
+    Inicializa um processo do pool (mcts e as suas dependencias ja' foram importados) e avisa o agente
+    """
+    try:
+        ready.wait()
+    except threading.BrokenBarrierError:  # processo recriado depois que o pool ficou pronto
+        pass
+
+
+def _grow_tree(state, wall_deadline: float, task_id: int, seed: int, batch: int = 1, cutoff: int = None,
+               evaluation: str = 'mask') -> Tuple[int, int, list, int, int]:
+    """
+    Cresce a arvore da tarefa task_id ate' o prazo (em time.time(), comparavel entre processos).
+    Executada nos processos do pool.
+    :param batch, cutoff, evaluation: mcts.PLAYOUT_BATCH, mcts.ROLLOUT_CUTOFF e mcts.ROLLOUT_EVAL do agente
+    :return: (task_id, pid do processo, lista de (jogada, visitas, valor) dos filhos da raiz, playouts,
+             nodos da arvore)
+    """
+    # arvores de buscas anteriores de outras tarefas nao serao mais usadas aqui
+    for key in [key for key, (deadline, _) in _trees.items() if key != task_id and deadline != wall_deadline]:
+        del _trees[key]
+    mcts._root = _trees[task_id][1] if task_id in _trees else None
+    root = mcts._find_root(state)
+    if root is None:
+        root = mcts.Node(state)
+    else:
+        root.parent = None
+    mcts._root = root
+    _trees[task_id] = (wall_deadline, root)
+    playouts = mcts.search(root, wall_deadline - time.time(), rng=random.Random(seed), batch=batch,
+                           cutoff=cutoff, evaluation=evaluation)
+    children = [(child.move, child.visits, child.wins) for child in root.children]
+    return task_id, os.getpid(), children, playouts, root.size()
+
+
+# ----------------------- lado do agente -----------------------
+
+def parallel_mcts_move(state, time_budget: float, workers: int = None, stats: dict = None) -> Tuple[int, int]:
+    """
+    Escolhe a jogada com MCTS paralelo na raiz.
+    :param state: estado a partir do qual buscar (qualquer jogo; deve poder ser enviado aos processos)
+    :param time_budget: tempo maximo em segundos, contado depois que o pool esta' pronto (a partida dos
+                        processos, na primeira chamada, nao conta); inclui a espera pelos resultados
+    :param workers: numero de processos (padrao: os.cpu_count())
+    :param stats: dict opcional; recebe 'playouts' e 'tree_size' (somas das tarefas), 'workers'
+                  (tarefas que responderam a tempo, cada uma contada uma vez) e 'processes'
+                  (processos distintos que as executaram)
+    :return: (int, int) jogada (x, y), ou None se nenhum processo expandiu a raiz a tempo
+    """
+    pool = get_pool(workers)
+    stop = time.time() + time_budget  # ninguem espera alem disto
+    wall_deadline = stop - min(RESULT_SLACK, time_budget / 2)
+    seed = random.getrandbits(32)
+    results = [pool.apply_async(_grow_tree, (state, wall_deadline, task_id, seed + task_id, mcts.PLAYOUT_BATCH,
+                                             mcts.ROLLOUT_CUTOFF, mcts.ROLLOUT_EVAL))
+               for task_id in range(_pool_workers)]
+
+    totals = {}
+    playouts = tree_size = 0
+    reported, processes = set(), set()
+    for result in results:
+        try:
+            # o limite e' o mesmo para todas as esperas: as que estouram nao somam folgas
+            task_id, pid, children, worker_playouts, worker_size = result.get(timeout=max(0.0, stop - time.time()))
+        except multiprocessing.TimeoutError:
+            continue
+        if task_id in reported:  # cada arvore entra uma unica vez na soma
+            continue
+        reported.add(task_id)
+        processes.add(pid)
+        for move, visits, wins in children:
+            total = totals.setdefault(move, [0, 0.0])
+            total[0] += visits
+            total[1] += wins
+        playouts += worker_playouts
+        tree_size += worker_size
+
+    if stats is not None:
+        stats.update(playouts=playouts, tree_size=tree_size, workers=len(reported), processes=len(processes))
+    if not totals:
+        return None
+    return max(totals, key=lambda move: tuple(totals[move]))
@@ -0,0 +1,263 @@
+import math
+import random
+import time
+from array import array
+from typing import Optional, Tuple
+
+# Arvore do MCTS guardada em colunas (struct of arrays), em vez de um objeto Node por nodo.
+# Cada nodo e' um indice; as colunas guardam as visitas, a soma dos valores, o pai, o primeiro
+# filho, o proximo irmao, a jogada (codificada num inteiro) e flags. As colunas crescem em blocos
+# de chunk nodos. Os estados nao sao guardados: o estado de um nodo e' recalculado jogando as
+# jogadas do caminho a partir do estado da raiz (na selecao, isso acontece durante a descida).
+#
+# Ao contrario da arvore de objetos de mcts.py, que expande um filho por iteracao, aqui todos os
+# filhos de um nodo sao criados de uma vez (em ordem aleatoria), na segunda visita ao nodo;
+# filhos sem visitas sao escolhidos antes do UCB1.
+
+NO_NODE = -1
+
+# jogada da raiz (sem jogada)
+NO_MOVE = 0xFFFF
+
+# flags dos nodos
+EXPANDED = 1    # filhos ja' criados
+TERMINAL = 2    # estado terminal
+EXHAUSTED = 4   # toda a subarvore esta' na arvore (todos os caminhos chegam a estados terminais)
+
+
+def encode_move(move: Tuple[int, int]) -> int:
+    """
+    Codifica a jogada (x, y) num inteiro de 16 bits
+    """
+    return move[0] << 8 | move[1]
+
+
+def decode_move(code: int) -> Tuple[int, int]:
+    """
+    Decodifica uma jogada de encode_move
+    """
+    return code >> 8, code & 0xFF
+
+
+def _advance(state, move):
+    # estados com apply (Othello) sao alterados no lugar; os demais sao substituidos pelo proximo
+    if hasattr(state, 'apply'):
+        state.apply(move)
+        return state
+    return state.next_state(move)
+
+
+class ArrayTree(object):
+    """
+    Arvore do MCTS em colunas preallocadas (array), para o estado root_state
+    """
+
+    __slots__ = ('root_state', 'chunk', 'size', 'visits', 'wins', 'parent', 'first_child', 'next_sibling',
+                 'move', 'flags')
+
+    def __init__(self, root_state, chunk: int = 1 << 14):
+        """
+        :param root_state: estado da raiz (o unico estado guardado)
+        :param chunk: numero de nodos acrescentados as colunas quando ficam cheias
+        """
+        self.root_state = root_state
+        self.chunk = chunk
+        self.size = 0
+        # 4 bytes por coluna (float de 32 bits soma meios pontos sem erro ate' 2**23 visitas),
+        # 2 para a jogada e 1 para as flags: 23 bytes por nodo
+        self.visits = array('i')
+        self.wins = array('f')
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.move = array('H')
+        self.flags = array('B')
+        self.add_node(NO_NODE, NO_MOVE)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self):
+        """
+        Acrescenta chunk nodos vazios a cada coluna
+        """
+        for column in (self.visits, self.wins, self.parent, self.first_child, self.next_sibling,
+                       self.move, self.flags):
+            column.extend(array(column.typecode, [0]) * self.chunk)
+
+    def add_node(self, parent: int, move_code: int) -> int:
+        """
+        Cria um nodo filho de parent (inserido no inicio da lista de filhos) e retorna o seu indice
+        """
+        if self.size == len(self.visits):
+            self._grow()
+        index = self.size
+        self.size += 1
+        self.visits[index] = 0
+        self.wins[index] = 0.0
+        self.parent[index] = parent
+        self.first_child[index] = NO_NODE
+        self.move[index] = move_code
+        self.flags[index] = 0
+        if parent != NO_NODE:
+            self.next_sibling[index] = self.first_child[parent]
+            self.first_child[parent] = index
+        else:
+            self.next_sibling[index] = NO_NODE
+        return index
+
+    def children(self, index: int):
+        """
+        Itera sobre os indices dos filhos de index
+        """
+        child = self.first_child[index]
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def path(self, index: int) -> list:
+        """
+        Retorna as jogadas da raiz ate' index
+        """
+        moves = []
+        while self.parent[index] != NO_NODE:
+            moves.append(decode_move(self.move[index]))
+            index = self.parent[index]
+        moves.reverse()
+        return moves
+
+    def state_at(self, index: int):
+        """
+        Recalcula o estado de index jogando as jogadas do caminho a partir da raiz (uma copia nova)
+        """
+        state = self.root_state.copy()
+        for move in self.path(index):
+            state = _advance(state, move)
+        return state
+
+    def nbytes(self) -> int:
+        """
+        Bytes ocupados pelas colunas (incluindo a parte preallocada ainda sem nodos)
+        """
+        return sum(column.itemsize * len(column) for column in (
+            self.visits, self.wins, self.parent, self.first_child, self.next_sibling, self.move, self.flags))
+
+    def subtree(self, index: int) -> 'ArrayTree':
+        """
+        Retorna uma nova arvore com a subarvore de index (que passa a ser a raiz), sem o resto
+        """
+        tree = ArrayTree(self.state_at(index), self.chunk)
+        tree.visits[0], tree.wins[0], tree.flags[0] = self.visits[index], self.wins[index], self.flags[index]
+        pending = [(index, 0)]
+        while pending:
+            old, new = pending.pop()
+            # add_node insere no inicio: percorre os filhos ao contrario para manter a ordem
+            for child in reversed(list(self.children(old))):
+                copy = tree.add_node(new, self.move[child])
+                tree.visits[copy], tree.wins[copy], tree.flags[copy] = \
+                    self.visits[child], self.wins[child], self.flags[child]
+                pending.append((child, copy))
+        return tree
+
+
+def _playout(state, rng) -> Optional[str]:
+    """
+    Joga aleatoriamente ate' o fim (alterando state, se tiver apply) e retorna o vencedor
+    """
+    while not state.is_terminal():
+        state = _advance(state, rng.choice(tuple(state.legal_moves())))
+    return state.winner()
+
+
+def descend(tree: ArrayTree, exploration: float, rng=random) -> Tuple[list, list, object]:
+    """
+    Selecao e expansao: desce da raiz escolhendo filhos sem visitas e depois o de maior UCB1,
+    recalculando o estado pelo caminho; expande o nodo alcancado se ele ja' tiver sido visitado.
+    :return: (nodos do caminho a partir da raiz, jogador que fez a jogada de cada nodo do caminho
+              abaixo da raiz, estado do ultimo nodo)
+    """
+    visits, wins, flags = tree.visits, tree.wins, tree.flags
+    first_child, next_sibling, move = tree.first_child, tree.next_sibling, tree.move
+    state = tree.root_state.copy()
+    node = 0
+    path, movers = [0], []
+    while flags[node] & EXPANDED:
+        log_visits = math.log(visits[node]) if visits[node] else 0.0
+        best, best_value = NO_NODE, -1.0
+        child = first_child[node]
+        while child != NO_NODE:
+            child_visits = visits[child]
+            if not child_visits:
+                best = child
+                break
+            value = wins[child] / child_visits + exploration * math.sqrt(log_visits / child_visits)
+            if value > best_value:
+                best, best_value = child, value
+            child = next_sibling[child]
+        node = best
+        movers.append(state.player)
+        state = _advance(state, decode_move(move[node]))
+        path.append(node)
+
+    if flags[node] & TERMINAL:
+        return path, movers, state
+    if state.is_terminal():
+        flags[node] |= TERMINAL | EXHAUSTED
+        return path, movers, state
+    if visits[node] or node == 0:
+        moves = list(state.legal_moves())
+        rng.shuffle(moves)
+        for legal in moves:
+            tree.add_node(node, encode_move(legal))
+        flags[node] |= EXPANDED  # as colunas crescem no lugar: flags continua valida
+        node = first_child[node]
+        movers.append(state.player)
+        state = _advance(state, decode_move(move[node]))
+        path.append(node)
+        if state.is_terminal():
+            flags[node] |= TERMINAL | EXHAUSTED
+    return path, movers, state
+
+
+def backpropagate(tree: ArrayTree, path: list, movers: list, winner: Optional[str]):
+    """
+    Atualiza visitas e valores dos nodos do caminho (do ponto de vista de quem fez a jogada
+    de cada nodo) e propaga para cima a marca de subarvore esgotada
+    """
+    visits, wins, flags = tree.visits, tree.wins, tree.flags
+    visits[0] += 1
+    for index, mover in zip(path[1:], movers):
+        visits[index] += 1
+        wins[index] += 1.0 if winner == mover else 0.5 if winner is None else 0.0
+
+    if flags[path[-1]] & EXHAUSTED:
+        for index in reversed(path[:-1]):
+            if not all(flags[child] & EXHAUSTED for child in tree.children(index)):
+                break
+            flags[index] |= EXHAUSTED
+
+
+def search(tree: ArrayTree, time_budget: float, exploration: float = math.sqrt(2), rng=random,
+           max_playouts: int = None) -> int:
+    """
+    Executa iteracoes do MCTS na arvore ate' esgotar time_budget (ou max_playouts iteracoes,
+    ou ate' a arvore conter o jogo inteiro)
+    :return: numero de iteracoes executadas
+    """
+    deadline = time.perf_counter() + time_budget
+    playouts = 0
+    while not tree.flags[0] & EXHAUSTED and time.perf_counter() < deadline:
+        if max_playouts is not None and playouts >= max_playouts:
+            break
+        path, movers, state = descend(tree, exploration, rng)
+        backpropagate(tree, path, movers, _playout(state, rng))
+        playouts += 1
+    return playouts
+
+
+def best_move(tree: ArrayTree):
+    """
+    Retorna a jogada do filho mais visitado da raiz (ou None, se a raiz nao tiver filhos)
+    """
+    best = max(tree.children(0), key=lambda child: (tree.visits[child], tree.wins[child]), default=None)
+    return None if best is None else decode_move(tree.move[best])
@@ -1,55 +1,184 @@
+import time
 from typing import Callable, Tuple
 
-def minimax_move(state, max_depth: int, eval_func: Callable) -> Tuple[int, int]:
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER, bound_flag
 
+# profundidade restante usada nas entradas da tabela de transposicao quando a busca e' ilimitada
+UNLIMITED_DEPTH = 1000
+
+
+class SearchTimeout(Exception):
+    """
+    Lancada por minimax_move quando o prazo (deadline) da busca se esgota.
+    best_move e' a melhor jogada entre as jogadas da raiz que foram completamente
+    buscadas antes do prazo (None se nenhuma foi).
+    """
+
+    def __init__(self, best_move=None):
+        super().__init__('search deadline reached')
+        self.best_move = best_move
+
+
+def minimax_move(state, max_depth: int, eval_func: Callable, stats: dict = None,
+                 inplace: bool = None, tt: TranspositionTable = None,
+                 orderer=None, deadline: float = None, root_moves=None,
+                 alpha: float = float("-inf")) -> Tuple[int, int]:
+    """
+    Retorna a melhor jogada para o jogador de state, usando minimax com poda alfa-beta.
+
+    :param state: estado a partir do qual buscar
+    :param max_depth: profundidade maxima (-1 para ilimitada)
+    :param eval_func: funcao de avaliacao eval_func(state, player)
+    :param stats: dict opcional; se fornecido, stats['nodes'] acumula o numero de nodos visitados,
+                  stats['tt_cutoffs'] os nodos resolvidos pela tabela de transposicao,
+                  stats['horizon'] as folhas nao-terminais cortadas pela profundidade maxima
+                  e stats['value'] recebe o valor minimax da raiz
+    :param inplace: se True, percorre a arvore com state.apply/state.undo, sem copiar
+                    o estado a cada nodo (state e' restaurado ao final). Se None, usa
+                    esse modo sempre que o estado oferecer apply/undo.
+    :param tt: tabela de transposicao opcional (requer state.zobrist_key()). Os estados ja'
+               buscados com profundidade suficiente nao sao expandidos novamente.
+    :param orderer: objeto opcional que ordena as jogadas de cada nodo, com o metodo
+                    order(node, moves, ply, hash_move) -> list. Se tiver tambem o metodo
+                    cutoff(node, move, ply, remaining_depth), ele e' chamado a cada corte beta.
+    :param deadline: instante (em time.perf_counter()) em que a busca deve ser abandonada,
+                     lancando SearchTimeout
+    :param root_moves: se fornecido, busca apenas estas jogadas da raiz (usado pela busca paralela)
+    :param alpha: limite inferior inicial da raiz. Jogadas que nao o superam recebem
+                  apenas um limite superior (<= alpha) como valor.
+    :return: (int, int) jogada (x, y)
+    """
     root_player = state.player
+    nodes = [0]
+    tt_cutoffs = [0]
+    horizon = [0]
+    if inplace is None:
+        inplace = hasattr(state, 'apply') and hasattr(state, 'undo')
+    if not hasattr(state, 'zobrist_key'):
+        tt = None
+    on_cutoff = getattr(orderer, 'cutoff', None)
+
+    def remaining_depth(depth):
+        return UNLIMITED_DEPTH if max_depth == -1 else max_depth - depth
+
+    def child_value(node, move, depth, alpha, beta, maximizing_player):
+        # Avalia o filho gerado por move, aplicando e desfazendo a jogada no proprio nodo
+        # ou criando um novo estado, conforme o modo de busca
+        if inplace:
+            record = node.apply(move)
+            try:
+                return alphabeta(node, depth, alpha, beta, maximizing_player)
+            finally:
+                node.undo(record)  # restaura o estado mesmo se o prazo se esgotar
+        return alphabeta(node.next_state(move), depth, alpha, beta, maximizing_player)
 
-    # Minimax com poda alfa-beta
     def alphabeta(node, depth, alpha, beta, maximizing_player):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        # Consulta a tabela de transposicao antes de buscar o nodo
+        if tt is None:
+            return search(node, depth, alpha, beta, maximizing_player, None)[0]
+
+        key = node.zobrist_key()
+        remaining = remaining_depth(depth)
+        entry = tt.probe(key)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry[4]
+            if entry[1] >= remaining:
+                value, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    tt_cutoffs[0] += 1
+                    return value
+                if flag == LOWER and value > alpha:
+                    alpha = value
+                elif flag == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    tt_cutoffs[0] += 1
+                    return value
+
+        value, best = search(node, depth, alpha, beta, maximizing_player, hash_move)
+        tt.store(key, remaining, value, bound_flag(value, alpha, beta), best)
+        return value
+
+    # Minimax com poda alfa-beta, retorna (valor, melhor jogada)
+    def search(node, depth, alpha, beta, maximizing_player, hash_move):
+        nodes[0] += 1
+
         # Terminal
-        if node.is_terminal() or (max_depth != -1 and depth == max_depth):
-            return eval_func(node, root_player)
+        if node.is_terminal():
+            return eval_func(node, root_player), None
+        if max_depth != -1 and depth == max_depth:
+            horizon[0] += 1
+            return eval_func(node, root_player), None
 
         moves = node.legal_moves()
 
         # Se não há jogadas, o jogador passa a vez
         if not moves:
+            opponent = 'B' if node.player == 'W' else 'W'
+            if inplace:
+                player = node.player
+                node.player = opponent
+                try:
+                    value = alphabeta(node, depth + 1, alpha, beta, not maximizing_player)
+                finally:
+                    node.player = player
+                return value, None
             passed = node.copy()
-            passed.player = 'B' if node.player == 'W' else 'W'
-            return alphabeta(passed, depth + 1, alpha, beta, not maximizing_player)
+            passed.player = opponent
+            return alphabeta(passed, depth + 1, alpha, beta, not maximizing_player), None
 
+        if orderer is not None:
+            moves = orderer.order(node, moves, depth, hash_move)
+
+        best = None
         if maximizing_player:
             value = float("-inf")
             for move in moves:
-                child = node.next_state(move)
-                value = max(value, alphabeta(child, depth + 1, alpha, beta, False))
+                child = child_value(node, move, depth + 1, alpha, beta, False)
+                if best is None or child > value:
+                    value, best = child, move
                 alpha = max(alpha, value)
                 if alpha >= beta:
+                    if on_cutoff is not None:
+                        on_cutoff(node, move, depth, remaining_depth(depth))
                     break
-            return value
+            return value, best
         else:
             value = float("inf")
             for move in moves:
-                child = node.next_state(move)
-                value = min(value, alphabeta(child, depth + 1, alpha, beta, True))
+                child = child_value(node, move, depth + 1, alpha, beta, True)
+                if best is None or child < value:
+                    value, best = child, move
                 beta = min(beta, value)
                 if beta <= alpha:
+                    if on_cutoff is not None:
+                        on_cutoff(node, move, depth, remaining_depth(depth))
                     break
-            return value
+            return value, best
 
     # Escolher a melhor jogada para o jogador raiz
-    legal = state.legal_moves()
+    legal = state.legal_moves() if root_moves is None else root_moves
     if not legal:
         return None
 
+    if orderer is not None:
+        root_entry = tt.probe(state.zobrist_key()) if tt is not None else None
+        legal = orderer.order(state, legal, 0, root_entry[4] if root_entry is not None else None)
+
     best_move = None
     best_value = float("-inf")
-    alpha = float("-inf")
-    beta = float("inf")
+    root_alpha, beta = alpha, float("inf")
 
     for move in legal:
-        child = state.next_state(move)
-        value = alphabeta(child, 1, alpha, beta, False)
+        try:
+            value = child_value(state, move, 1, alpha, beta, False)
+        except SearchTimeout as timeout:
+            timeout.best_move = best_move
+            raise
 
         if value > best_value:
             best_value = value
@@ -57,4 +186,13 @@ def minimax_move(state, max_depth: int, eval_func: Callable) -> Tuple[int, int]:
 
         alpha = max(alpha, best_value)
 
+    if tt is not None and root_moves is None:
+        tt.store(state.zobrist_key(), remaining_depth(0), best_value, bound_flag(best_value, root_alpha, beta), best_move)
+
+    if stats is not None:
+        stats['nodes'] = stats.get('nodes', 0) + nodes[0]
+        stats['tt_cutoffs'] = stats.get('tt_cutoffs', 0) + tt_cutoffs[0]
+        stats['horizon'] = stats.get('horizon', 0) + horizon[0]
+        stats['value'] = best_value
+
     return best_move
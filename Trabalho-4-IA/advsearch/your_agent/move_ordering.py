@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional, Tuple
+
+# Prioridade estatica das casas do Othello (indexada por [y][x]): cantos primeiro,
+# casas X (diagonais aos cantos) por ultimo e casas C (ao lado dos cantos) logo antes delas
+OTHELLO_PRIOR = [
+    [ 50, -20, 10,  5,  5, 10, -20,  50],
+    [-20, -40, -2, -2, -2, -2, -40, -20],
+    [ 10,  -2,  1,  1,  1,  1,  -2,  10],
+    [  5,  -2,  1,  0,  0,  1,  -2,   5],
+    [  5,  -2,  1,  0,  0,  1,  -2,   5],
+    [ 10,  -2,  1,  1,  1,  1,  -2,  10],
+    [-20, -40, -2, -2, -2, -2, -40, -20],
+    [ 50, -20, 10,  5,  5, 10, -20,  50],
+]
+
+# pontuacoes que colocam a jogada da tabela e as killer moves a frente de qualquer outra
+HASH_MOVE_SCORE = 1 << 60
+KILLER_SCORE = 1 << 50
+
+
+class MoveOrderer(object):
+    """
+    Ordenacao de jogadas para a poda alfa-beta (parametro orderer de minimax_move).
+    As jogadas de cada nodo sao buscadas na ordem:
+    1. a jogada da tabela de transposicao (variante principal / hash move);
+    2. as duas killer moves da profundidade (jogadas que causaram corte em nodos irmaos);
+    3. as demais, pela tabela de historico (cortes anteriores da mesma jogada pelo mesmo
+       jogador, com peso profundidade^2) somada 'a prioridade estatica da casa.
+    Cada parte pode ser desligada, para comparar o efeito de cada heuristica.
+    """
+
+    def __init__(self, prior: Optional[List[List[int]]] = None, use_hash: bool = True,
+                 use_killers: bool = True, use_history: bool = True):
+        """
+        :param prior: tabela [y][x] de prioridade estatica (ex.: OTHELLO_PRIOR) ou None
+        :param use_hash: se a jogada da tabela de transposicao vai primeiro
+        :param use_killers: se usa as killer moves
+        :param use_history: se usa a tabela de historico
+        """
+        self.prior = prior
+        self.use_hash = use_hash
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.killers: List[List] = []                    # killers[ply] = [mais recente, anterior]
+        self.history: Dict[str, Dict[Tuple[int, int], int]] = {}   # history[cor][jogada]
+
+    def clear(self):
+        """
+        Esquece as killer moves e o historico
+        """
+        self.killers = []
+        self.history = {}
+
+    def order(self, node, moves, ply: int, hash_move=None) -> list:
+        """
+        Retorna as jogadas em ordem decrescente de prioridade
+        :param node: estado cujas jogadas serao ordenadas
+        :param moves: jogadas legais
+        :param ply: distancia do nodo ate' a raiz
+        :param hash_move: melhor jogada guardada na tabela de transposicao (ou None)
+        """
+        history = self.history.get(node.player, {}) if self.use_history else {}
+        killers = self.killers[ply] if self.use_killers and ply < len(self.killers) else ()
+        prior = self.prior
+        if not self.use_hash:
+            hash_move = None
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            if move in killers:
+                return KILLER_SCORE - killers.index(move)
+            s = history.get(move, 0)
+            if prior is not None:
+                x, y = move
+                s += prior[y][x]
+            return s
+
+        return sorted(moves, key=score, reverse=True)
+
+    def cutoff(self, node, move, ply: int, remaining_depth: int):
+        """
+        Registra que move causou um corte beta em node
+        :param node: estado onde ocorreu o corte
+        :param move: jogada que causou o corte
+        :param ply: distancia do nodo ate' a raiz
+        :param remaining_depth: profundidade restante da busca no nodo
+        """
+        if self.use_killers:
+            while len(self.killers) <= ply:
+                self.killers.append([None, None])
+            slots = self.killers[ply]
+            if slots[0] != move:
+                slots[1] = slots[0]
+                slots[0] = move
+        if self.use_history:
+            history = self.history.setdefault(node.player, {})
+            history[move] = history.get(move, 0) + remaining_depth * remaining_depth
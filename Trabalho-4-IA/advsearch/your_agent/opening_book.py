@@ -0,0 +1,312 @@
+import argparse
+import bisect
+import os
+import struct
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from ..othello.board import Board
+from ..othello.gamestate import GameState
+from .endgame import bitboards
+
+# Livro de aberturas construido a partir das partidas gravadas pelo server.py
+# (results.xml, com o resultado, ou history.txt, cujo resultado vem de jogar a partida ate' o fim).
+#
+# Cada posicao e' guardada na forma canonica entre as 8 simetrias do tabuleiro (rotacoes e
+# reflexoes): a menor dupla (own, opp) de bitboards do jogador que move e do adversario.
+# Para cada posicao canonica e jogada (tambem na forma canonica), o livro soma vitorias,
+# empates e derrotas de quem fez a jogada.
+#
+# O arquivo e' uma sequencia de registros de tamanho fixo ordenados por (own, opp, casa), sem
+# cabecalho alem de MAGIC; a consulta e' uma busca binaria direto nos bytes (O(log n)), sem
+# montar dicionarios, e o arquivo so' e' lido na primeira consulta.
+#
+# Construcao: python -m advsearch.your_agent.opening_book -o livro.bin results*.xml
+
+MAGIC = b'OBK1'
+
+# registro: own, opp (bitboards canonicos do jogador que move), casa (y*8 + x), vitorias, empates, derrotas
+RECORD = struct.Struct('<QQBIII')
+
+# numero de jogadas do inicio de cada partida gravadas no livro
+MAX_PLIES = 20
+
+
+def _square_maps() -> List[List[int]]:
+    """
+    Para cada uma das 8 simetrias, a tabela casa -> casa transformada
+    """
+    transforms = [
+        lambda x, y: (x, y),
+        lambda x, y: (7 - y, x),      # rotacao de 90 graus
+        lambda x, y: (7 - x, 7 - y),  # 180 graus
+        lambda x, y: (y, 7 - x),      # 270 graus
+        lambda x, y: (7 - x, y),      # reflexao horizontal
+        lambda x, y: (x, 7 - y),      # reflexao vertical
+        lambda x, y: (y, x),          # diagonal principal
+        lambda x, y: (7 - y, 7 - x),  # diagonal secundaria
+    ]
+    maps = []
+    for transform in transforms:
+        table = []
+        for square in range(64):
+            x, y = transform(square & 7, square >> 3)
+            table.append(y * 8 + x)
+        maps.append(table)
+    return maps
+
+
+SQUARE_MAPS = _square_maps()
+# INVERSE_MAPS[s] desfaz SQUARE_MAPS[s]
+INVERSE_MAPS = [[table.index(square) for square in range(64)] for table in SQUARE_MAPS]
+
+
+def _transform(bits: int, table: List[int]) -> int:
+    """
+    Aplica uma simetria (tabela casa -> casa) a um bitboard
+    """
+    result = 0
+    while bits:
+        low = bits & -bits
+        result |= 1 << table[low.bit_length() - 1]
+        bits ^= low
+    return result
+
+
+def canonical(own: int, opp: int) -> Tuple[int, int, List[int]]:
+    """
+    Retorna (own, opp, simetrias): a forma canonica da posicao e os indices (em SQUARE_MAPS)
+    de todas as simetrias que levam a posicao a ela (mais de uma se a posicao for simetrica)
+    """
+    best, symmetries = None, []
+    for index, table in enumerate(SQUARE_MAPS):
+        key = (_transform(own, table), _transform(opp, table))
+        if best is None or key < best:
+            best, symmetries = key, [index]
+        elif key == best:
+            symmetries.append(index)
+    return best[0], best[1], symmetries
+
+
+def canonical_move(square: int, symmetries: List[int]) -> int:
+    """
+    Retorna a casa canonica de uma jogada: a menor entre as suas imagens pelas simetrias
+    que levam a posicao a forma canonica (jogadas equivalentes tem a mesma casa canonica)
+    """
+    return min(SQUARE_MAPS[index][square] for index in symmetries)
+
+
+def read_history(path: str) -> List[Tuple[Tuple[int, int], str]]:
+    """
+    Le um history.txt do server.py: uma jogada 'x,y,cor' por linha
+    :return: lista de ((x, y), cor), incluindo as tentativas ilegais registradas pelo servidor
+    """
+    moves = []
+    with open(path) as history:
+        for line in history:
+            line = line.strip()
+            if not line:
+                continue
+            x, y, color = line.split(',')
+            moves.append(((int(x), int(y)), color))
+    return moves
+
+
+def read_results(path: str) -> Tuple[List[Tuple[Tuple[int, int], str]], Optional[str]]:
+    """
+    Le um results.xml do server.py
+    :return: (jogadas como em read_history, cor do vencedor ou None se empate)
+    """
+    root = ET.parse(path).getroot()
+    winner = None
+    for player in root.iter('player'):
+        if player.get('result') == 'win':
+            winner = player.get('color')
+    moves = []
+    for move in root.iter('move'):
+        x, y = move.get('coord').split(',')
+        moves.append(((int(x), int(y)), move.get('color')))
+    return moves, winner
+
+
+def replay(moves: List[Tuple[Tuple[int, int], str]]) -> Tuple[List[Tuple[GameState, Tuple[int, int]]], GameState]:
+    """
+    Joga as jogadas a partir da posicao inicial, ignorando as tentativas ilegais (que o servidor
+    tambem registra) e as de quem nao tinha a vez.
+    :return: (lista de (estado, jogada aceita nele), estado final)
+    """
+    state = GameState(Board(), Board.BLACK)
+    played = []
+    for move, color in moves:
+        if state.is_terminal():
+            break
+        if color != state.player or not state.is_legal_move(move):
+            continue
+        played.append((state, move))
+        state = state.next_state(move)
+    return played, state
+
+
+class BookBuilder(object):
+    """
+    Acumula as estatisticas (vitorias, empates, derrotas) de cada posicao canonica e jogada
+    de varias partidas e grava o livro ordenado.
+    """
+
+    def __init__(self, max_plies: int = MAX_PLIES):
+        """
+        :param max_plies: numero de jogadas do inicio de cada partida a gravar
+        """
+        self.max_plies = max_plies
+        self.stats: Dict[Tuple[int, int, int], List[int]] = {}
+        self.games = 0
+        self.skipped = 0
+
+    def add_game(self, moves: List[Tuple[Tuple[int, int], str]], winner: Optional[str] = None,
+                 known_result: bool = True) -> bool:
+        """
+        Soma uma partida ao livro.
+        :param moves: jogadas como em read_history
+        :param winner: cor do vencedor, ou None se empate
+        :param known_result: se False, o resultado vem da posicao final; partidas que nao
+                             chegaram ao fim (ex.: desclassificacao) sao ignoradas
+        :return: se a partida foi usada
+        """
+        played, final = replay(moves)
+        if not known_result:
+            if not final.is_terminal():
+                self.skipped += 1
+                return False
+            winner = final.winner()
+
+        for state, (x, y) in played[:self.max_plies]:
+            own, opp, symmetries = canonical(*bitboards(state))
+            key = (own, opp, canonical_move(y * 8 + x, symmetries))
+            entry = self.stats.setdefault(key, [0, 0, 0])
+            entry[0 if winner == state.player else 1 if winner is None else 2] += 1
+        self.games += 1
+        return True
+
+    def add_file(self, path: str) -> bool:
+        """
+        Soma a partida de um results.xml (arquivos .xml) ou de um history.txt (demais arquivos).
+        Um results.xml ja' contem o historico: nao passe tambem o history.txt da mesma partida.
+        """
+        if path.endswith('.xml'):
+            moves, winner = read_results(path)
+            return self.add_game(moves, winner)
+        return self.add_game(read_history(path), known_result=False)
+
+    def write(self, path: str):
+        """
+        Grava o livro em path, com os registros ordenados por (own, opp, casa)
+        """
+        with open(path, 'wb') as book:
+            book.write(MAGIC)
+            for (own, opp, square), (wins, draws, losses) in sorted(self.stats.items()):
+                book.write(RECORD.pack(own, opp, square, wins, draws, losses))
+
+
+class _Keys(object):
+    """
+    Sequencia das chaves (own, opp) dos registros de um livro em bytes, para o bisect
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.count = (len(data) - len(MAGIC)) // RECORD.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        return RECORD.unpack_from(self.data, len(MAGIC) + index * RECORD.size)[:2]
+
+
+class OpeningBook(object):
+    """
+    Consulta a um livro gravado por BookBuilder. O arquivo e' lido na primeira consulta;
+    se nao existir, o livro fica vazio (e o agente simplesmente busca).
+    """
+
+    def __init__(self, path: str, min_games: int = 2):
+        """
+        :param path: arquivo do livro
+        :param min_games: numero minimo de partidas com a jogada para que choose a escolha
+        """
+        self.path = path
+        self.min_games = min_games
+        self._keys = None
+
+    def _load(self) -> _Keys:
+        if self._keys is None:
+            data = MAGIC
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as book:
+                    data = book.read()
+                if not data.startswith(MAGIC):
+                    raise ValueError(f'{self.path} is not an opening book')
+            self._keys = _Keys(data)
+        return self._keys
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def moves(self, state) -> List[Tuple[Tuple[int, int], int, int, int]]:
+        """
+        Retorna as jogadas do livro para o estado: lista de ((x, y), vitorias, empates, derrotas),
+        do ponto de vista do jogador que move
+        """
+        keys = self._load()
+        if not keys or getattr(state, 'player', None) is None or not isinstance(getattr(state, 'board', None), Board):
+            return []
+        own, opp, symmetries = canonical(*bitboards(state))
+        inverse = INVERSE_MAPS[symmetries[0]]
+        index = bisect.bisect_left(keys, (own, opp))
+        result = []
+        while index < len(keys):
+            record_own, record_opp, square, wins, draws, losses = RECORD.unpack_from(
+                keys.data, len(MAGIC) + index * RECORD.size)
+            if (record_own, record_opp) != (own, opp):
+                break
+            square = inverse[square]
+            result.append(((square & 7, square >> 3), wins, draws, losses))
+            index += 1
+        return result
+
+    def choose(self, state) -> Optional[Tuple[int, int]]:
+        """
+        Retorna a jogada do livro com a maior pontuacao (vitoria 1, empate 1/2) entre as jogadas
+        com pelo menos min_games partidas, ou None se a posicao nao estiver no livro
+        """
+        best, best_score = None, None
+        for move, wins, draws, losses in self.moves(state):
+            games = wins + draws + losses
+            if games < self.min_games:
+                continue
+            score = (wins + 0.5 * draws) / games
+            if best_score is None or score > best_score:
+                best, best_score = move, score
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Builds an opening book from recorded Othello matches.')
+    parser.add_argument('files', nargs='+', help='results.xml or history.txt files written by server.py')
+    parser.add_argument('-o', '--output', required=True, help='book file to write')
+    parser.add_argument('-p', '--plies', type=int, default=MAX_PLIES, help='moves recorded from the start of each game')
+    args = parser.parse_args()
+
+    builder = BookBuilder(args.plies)
+    for path in args.files:
+        try:
+            builder.add_file(path)
+        except (ValueError, ET.ParseError) as e:
+            builder.skipped += 1
+            print(f'skipping {path}: {e}')
+    builder.write(args.output)
+    print(f'{builder.games} games ({builder.skipped} skipped), {len(builder.stats)} positions and moves written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ from typing import Tuple, Iterable, Any
 from ..othello.gamestate import GameState
 from ..othello.board import Board
 from .minimax import minimax_move
+from .evaluation import native_board
 
 # ---------------------------- Helper utilities ----------------------------
 
@@ -103,6 +104,12 @@ def evaluate_count(state: GameState, player: str) -> float:
     Retorna SEMPRE a diferença numérica como float — mesmo para estados terminais,
     para ser compatível com os testes que esperam o valor numérico.
     """
+    # caminho rapido: Board do Othello, as pecas sao contadas direto nas casas do tabuleiro
+    board = native_board(state)
+    if board is not None:
+        p = player.upper()
+        return float(board.num_pieces(p) - board.num_pieces("B" if p == "W" else "W"))
+
     # tentar extrair grade robustamente
     try:
         grid = _extract_grid(state)
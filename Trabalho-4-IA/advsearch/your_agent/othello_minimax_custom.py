@@ -1,8 +1,19 @@
+import functools
+import os
 import random
 from typing import Tuple, List, Iterable, Optional, Any
 from ..othello.gamestate import GameState
 from ..othello.board import Board
 from .minimax import minimax_move
+from .deepening import iterative_deepening_move
+from .move_ordering import MoveOrderer, OTHELLO_PRIOR
+from .pvs import pvs_move
+from .parallel import parallel_move
+from .pondering import Ponderer
+from .endgame import endgame_move, is_endgame
+from .opening_book import OpeningBook
+from .eval_cache import EvalCache
+from .evaluation import native_board, compile_evaluator, square_table, MATERIAL, MOBILITY, FRONTIER, SQUARES
 
 EVAL_TEMPLATE = [
     [100, -30, 6, 2, 2, 6, -30, 100],
@@ -170,6 +181,33 @@ def _ensure_legal_list(lm: Optional[Iterable]) -> List:
     except Exception:
         return [lm]
 
+# ---------------------------- Especificacao da heuristica ----------------------------
+
+_CORNERS = [(0, 0), (0, 7), (7, 0), (7, 7)]
+_PRECORNERS = [(0, 1), (1, 0), (1, 1), (0, 6), (1, 7), (1, 6), (6, 0), (7, 1), (6, 1), (6, 6), (6, 7), (7, 6)]
+
+# termos da heuristica: (nome, tipo, tabela 8x8 para os termos SQUARES). Ver compile_evaluator.
+CUSTOM_FEATURES = [
+    ('piece', MATERIAL, None),
+    ('mobility', MOBILITY, None),
+    ('corner', SQUARES, square_table(_CORNERS, 25)),
+    ('precorner', SQUARES, square_table(_PRECORNERS, -8)),
+    ('frontier', FRONTIER, None),
+    ('positional', SQUARES, EVAL_TEMPLATE),
+]
+
+# pesos dos termos por fase: (maximo de discos no tabuleiro, pesos)
+CUSTOM_PHASES = [
+    (20, {'piece': 0.6, 'mobility': 2.0, 'corner': 3.0, 'precorner': -1.5, 'frontier': 0.8, 'positional': 1.5}),
+    (58, {'piece': 1.0, 'mobility': 1.5, 'corner': 4.0, 'precorner': -2.0, 'frontier': 1.0, 'positional': 1.2}),
+    (None, {'piece': 3.0, 'mobility': 0.8, 'corner': 5.0, 'precorner': -2.5, 'frontier': 0.6, 'positional': 0.8}),
+]
+
+_compiled_custom = compile_evaluator(CUSTOM_FEATURES, CUSTOM_PHASES)
+
+
+# as funcoes abaixo recebem a grade ja' normalizada ('B', 'W' ou '.' em cada casa)
+
 def _frontier_count(grid: List[List[str]], player: str) -> int:
     rows = len(grid)
     cols = len(grid[0]) if rows > 0 else 0
@@ -177,32 +215,94 @@ def _frontier_count(grid: List[List[str]], player: str) -> int:
     f = 0
     for r in range(rows):
         for c in range(cols):
-            if _normalize_cell(grid[r][c]) != player:
+            if grid[r][c] != player:
                 continue
             for dr,dc in dirs:
                 rr, cc = r+dr, c+dc
                 if 0 <= rr < rows and 0 <= cc < cols:
-                    if _normalize_cell(grid[rr][cc]) == ".":
+                    if grid[rr][cc] == ".":
                         f += 1
                         break
     return f
 
-def _positional_score(grid: List[List[str]], player: str) -> float:
+def _square_score(grid: List[List[str]], player: str, table: List[List[int]]) -> float:
     score = 0.0
     rows = min(len(grid), 8)
     for r in range(rows):
         for c in range(min(len(grid[r]), 8)):
-            cell = _normalize_cell(grid[r][c])
-            val = EVAL_TEMPLATE[r][c]
+            cell = grid[r][c]
+            val = table[r][c]
             if cell == player:
                 score += val
             elif cell == ("B" if player == "W" else "W"):
                 score -= val
     return score
 
+def _reflective_custom(state, p: str, opp: str) -> float:
+    """
+    evaluate_custom para objetos que nao sao estados do Othello: extrai a grade
+    por reflexao e calcula cada termo de CUSTOM_FEATURES separadamente
+    """
+    grid = [[_normalize_cell(cell) for cell in row] for row in _extract_grid(state)]
+    p_count = 0
+    o_count = 0
+    for row in grid:
+        for c in row:
+            if c == p:
+                p_count += 1
+            elif c == opp:
+                o_count += 1
+    total = p_count + o_count
+
+    terms = {}
+    for name, kind, table in CUSTOM_FEATURES:
+        if kind == MATERIAL:
+            terms[name] = 100.0 * (p_count - o_count) / total if total > 0 else 0.0
+        elif kind == MOBILITY:
+            try:
+                my_moves = len(_ensure_legal_list(state.legal_moves()))
+            except Exception:
+                my_moves = 0
+            try:
+                opp_moves = 0
+                try:
+                    opp_moves = len(_ensure_legal_list(state.legal_moves(opp)))
+                except TypeError:
+                    try:
+                        copy = state.copy()
+                        if hasattr(copy, "player"):
+                            copy.player = opp
+                        elif hasattr(copy, "to_move"):
+                            copy.to_move = opp
+                        opp_moves = len(_ensure_legal_list(copy.legal_moves()))
+                    except Exception:
+                        opp_moves = 0
+            except Exception:
+                opp_moves = 0
+            terms[name] = 0.0
+            if (my_moves + opp_moves) > 0:
+                terms[name] = 100.0 * (my_moves - opp_moves) / (my_moves + opp_moves)
+        elif kind == FRONTIER:
+            p_frontier = _frontier_count(grid, p)
+            o_frontier = _frontier_count(grid, opp)
+            terms[name] = 0.0
+            if (p_frontier + o_frontier) > 0:
+                terms[name] = 100.0 * (o_frontier - p_frontier) / (p_frontier + o_frontier)
+        else:
+            terms[name] = _square_score(grid, p, table)
+
+    for limit, weights in CUSTOM_PHASES:
+        if limit is None or total <= limit:
+            break
+    score = None
+    for name, _, _ in CUSTOM_FEATURES:
+        term = weights[name] * terms[name]
+        score = term if score is None else score + term
+    return score
+
 def evaluate_custom(state, player: str) -> float:
     """
-    Heurística combinada.
+    Heurística combinada (termos e pesos em CUSTOM_FEATURES e CUSTOM_PHASES).
     """
     try:
         if getattr(state, "is_terminal", lambda: False)():
@@ -218,138 +318,130 @@ def evaluate_custom(state, player: str) -> float:
     except Exception:
         pass
 
-    grid = _extract_grid(state)
     p = (player or "B").upper()
     opp = "B" if p == "W" else "W"
 
-    p_count = 0
-    o_count = 0
-    for row in grid:
-        for cell in row:
-            c = _normalize_cell(cell)
-            if c == p:
-                p_count += 1
-            elif c == opp:
-                o_count += 1
-    total = p_count + o_count
-
-    piece_diff = 0.0
-    if total > 0:
-        piece_diff = 100.0 * (p_count - o_count) / total
+    # caminho rapido: avaliador compilado, uma unica passada pelo Board do Othello.
+    # A mobilidade e' a do jogador da vez contra a do adversario de player (um Board sozinho nao tem jogador da vez).
+    board = native_board(state)
+    if board is not None:
+        return _compiled_custom(board, getattr(state, "player", None) if state is not board else None, p)
 
     try:
-        my_moves = len(_ensure_legal_list(state.legal_moves()))
+        return float(_reflective_custom(state, p, opp))
     except Exception:
-        my_moves = 0
-    try:
-        opp_moves = 0
-        try:
-            opp_moves = len(_ensure_legal_list(state.legal_moves(opp)))
-        except TypeError:
-            try:
-                copy = state.copy()
-                if hasattr(copy, "player"):
-                    copy.player = opp
-                elif hasattr(copy, "to_move"):
-                    copy.to_move = opp
-                opp_moves = len(_ensure_legal_list(copy.legal_moves()))
-            except Exception:
-                opp_moves = 0
-    except Exception:
-        opp_moves = 0
+        return 0.0
 
-    mobility = 0.0
-    if (my_moves + opp_moves) > 0:
-        mobility = 100.0 * (my_moves - opp_moves) / (my_moves + opp_moves)
+# tempo de busca por jogada (s), com folga em relacao ao delay de 5s do servidor
+TIME_BUDGET = 4.5
 
-    corners = [(0,0),(0,7),(7,0),(7,7)]
-    corner_score = 0
-    rows = len(grid)
-    cols = len(grid[0]) if rows>0 else 0
-    for (r,c) in corners:
-        if 0 <= r < rows and 0 <= c < cols:
-            cell = _normalize_cell(grid[r][c])
-            if cell == p:
-                corner_score += 25
-            elif cell == opp:
-                corner_score -= 25
-
-    precorner_pos = [(0,1),(1,0),(1,1),(0,6),(1,7),(1,6),(6,0),(7,1),(6,1),(6,6),(6,7),(7,6)]
-    prec = 0
-    for (r,c) in precorner_pos:
-        if 0 <= r < rows and 0 <= c < cols:
-            cell = _normalize_cell(grid[r][c])
-            if cell == p:
-                prec -= 8
-            elif cell == opp:
-                prec += 8
-
-    p_frontier = _frontier_count(grid, p)
-    o_frontier = _frontier_count(grid, opp)
-    frontier = 0.0
-    if (p_frontier + o_frontier) > 0:
-        frontier = 100.0 * (o_frontier - p_frontier) / (p_frontier + o_frontier)
-
-    positional = _positional_score(grid, p)
-
-    if total <= 20:
-        w_piece = 0.6
-        w_mob = 2.0
-        w_corner = 3.0
-        w_prec = -1.5
-        w_front = 0.8
-        w_pos = 1.5
-    elif total <= 58:
-        w_piece = 1.0
-        w_mob = 1.5
-        w_corner = 4.0
-        w_prec = -2.0
-        w_front = 1.0
-        w_pos = 1.2
-    else:
-        w_piece = 3.0
-        w_mob = 0.8
-        w_corner = 5.0
-        w_prec = -2.5
-        w_front = 0.6
-        w_pos = 0.8
-
-    score = (
-        w_piece * piece_diff +
-        w_mob * mobility +
-        w_corner * corner_score +
-        w_prec * prec +
-        w_front * frontier +
-        w_pos * positional
-    )
+# algoritmo de busca: 'alphabeta' (minimax_move) ou 'pvs' (pvs_move, opcional; ver benchmarks/pvs.py)
+SEARCH_ALGORITHM = 'alphabeta'
+
+# meia-largura da janela de aspiracao do PVS em torno do valor da iteracao anterior (None desliga)
+ASPIRATION_WINDOW = None
+
+# numero de processos da busca paralela na raiz (0 desliga; None usa todos os nucleos).
+# A busca paralela usa minimax_move e ignora SEARCH_ALGORITHM.
+PARALLEL_WORKERS = 0
+
+# com ate' tantas casas vazias, a jogada vem do resolvedor exato de final de jogo (ver endgame.py),
+# que usa no maximo metade de TIME_BUDGET (0 desliga). Com 12 vazias, os finais de
+# benchmarks/endgame.py sao resolvidos em menos de 1s.
+ENDGAME_EMPTIES = 12
+
+# livro de aberturas gravado por opening_book.py a partir de partidas do server.py (None desliga).
+# So' e' lido na primeira jogada; se o arquivo nao existir, o agente busca normalmente.
+BOOK_FILE = os.path.join(os.path.dirname(__file__), 'opening_book.bin')
+_book = None
+
+# se True, continua buscando no tempo do adversario a posicao prevista (ver pondering.py)
+PONDER = False
+_ponderer = None
+
+# entradas do cache LRU de avaliacoes, mantido entre as jogadas (0 desliga; ver eval_cache.py).
+# Vale so' para a busca serial; com a tabela de transposicao, a taxa de acerto medida e' baixa.
+EVAL_CACHE_ENTRIES = 0
+_eval_cache = None
+
+
+def _search():
+    """
+    Retorna a funcao de busca escolhida por SEARCH_ALGORITHM
+    """
+    if SEARCH_ALGORITHM == 'pvs':
+        return functools.partial(pvs_move, aspiration=ASPIRATION_WINDOW)
+    return minimax_move
+
+
+def _get_ponderer() -> Ponderer:
+    """
+    Retorna o Ponderer do agente, criando-o na primeira chamada
+    """
+    global _ponderer
+    if _ponderer is None:
+        _ponderer = Ponderer(evaluate_custom, TIME_BUDGET, search=_search(), prior=OTHELLO_PRIOR)
+    return _ponderer
+
+
+def _get_eval_cache() -> EvalCache:
+    """
+    Retorna o cache de avaliacoes do agente, criando-o na primeira chamada
+    """
+    global _eval_cache
+    if _eval_cache is None:
+        _eval_cache = EvalCache(evaluate_custom, EVAL_CACHE_ENTRIES)
+    return _eval_cache
+
+
+def _get_book() -> OpeningBook:
+    """
+    Retorna o livro de aberturas do agente, criando-o na primeira chamada
+    """
+    global _book
+    if _book is None:
+        _book = OpeningBook(BOOK_FILE)
+    return _book
 
-    try:
-        return float(score)
-    except Exception:
-        return 0.0
+
+def observe_move(state, move, player):
+    """
+    Chamada pelo servidor apos cada jogada aceita; repassa a jogada ao pondering, se estiver ativo
+    """
+    if _ponderer is not None:
+        _ponderer.observe_move(state, move, player)
+
+def _deepening_move(state, time_budget: float) -> Tuple[int, int]:
+    """
+    Aprofundamento iterativo com evaluate_custom (com o cache de avaliacoes, se ativo) dentro de time_budget
+    """
+    eval_func = _get_eval_cache() if EVAL_CACHE_ENTRIES > 0 else evaluate_custom
+    return iterative_deepening_move(state, eval_func, time_budget, search=_search(),
+                                    orderer=MoveOrderer(OTHELLO_PRIOR))
 
 def make_move(state) -> Tuple[int, int]:
     """
-    Chama minimax_move com evaluate_custom.
+    Chama minimax_move com evaluate_custom, em aprofundamento iterativo
+    limitado por TIME_BUDGET; na abertura, usa o livro (BOOK_FILE) e, no final da partida,
+    o resolvedor exato (ENDGAME_EMPTIES).
     """
     legal = _ensure_legal_list(state.legal_moves() if hasattr(state, "legal_moves") else None)
-    n_legal = len(legal)
-
-    if n_legal >= 20:
-        max_depth = 3
-    elif n_legal >= 10:
-        max_depth = 4
-    else:
-        max_depth = 5
 
     move = None
     try:
-        move = minimax_move(state, max_depth, evaluate_custom)
-    except TypeError:
-        try:
-            move = minimax_move(state, evaluate_custom, max_depth)
-        except Exception:
-            move = None
+        if BOOK_FILE:
+            move = _get_book().choose(state)
+            if move is not None:
+                return move
+        if ENDGAME_EMPTIES and is_endgame(state, ENDGAME_EMPTIES):
+            # se o resolvedor nao terminar nem a busca WLD, o restante do tempo vai para a busca heuristica
+            move = endgame_move(state, TIME_BUDGET, fallback=lambda time_left: _deepening_move(state, time_left))
+        elif PARALLEL_WORKERS != 0:
+            move = parallel_move(state, evaluate_custom, TIME_BUDGET, workers=PARALLEL_WORKERS)
+        elif PONDER:
+            move = _get_ponderer().make_move(state)
+        else:
+            move = _deepening_move(state, TIME_BUDGET)
     except Exception:
         move = None
 
@@ -1,8 +1,19 @@
+import functools
+import os
 import random
 from typing import Tuple, List
 from ..othello.gamestate import GameState
 from ..othello.board import Board
 from .minimax import minimax_move
+from .deepening import iterative_deepening_move
+from .move_ordering import MoveOrderer, OTHELLO_PRIOR
+from .pvs import pvs_move
+from .parallel import parallel_move
+from .pondering import Ponderer
+from .endgame import endgame_move, is_endgame
+from .opening_book import OpeningBook
+from .evaluation import native_board, packed_cells
+from ..othello.accumulators import SquareTable
 
 # ---------------------------- Ajudantes ----------------------------
 
@@ -93,19 +104,105 @@ EVAL_TEMPLATE = [
     [100, -30, 6, 2, 2, 6, -30, 100]
 ]
 
+# EVAL_TEMPLATE linha a linha, na ordem de packed_cells
+_FLAT_TEMPLATE = [val for row in EVAL_TEMPLATE for val in row]
 
-def make_move(state) -> Tuple[int, int]:
-    legal = state.legal_moves()
-    n = len(legal) if legal is not None else 0
-    if n >= 20:
-        max_depth = 3
-    elif n >= 10:
-        max_depth = 4
-    else:
-        max_depth = 5
+# soma de EVAL_TEMPLATE mantida incrementalmente pelo tabuleiro (do ponto de vista das pretas)
+MASK_ACCUMULATOR = SquareTable('mask', EVAL_TEMPLATE)
+
+
+# tempo de busca por jogada (s), com folga em relacao ao delay de 5s do servidor
+TIME_BUDGET = 4.5
+
+# algoritmo de busca: 'alphabeta' (minimax_move) ou 'pvs' (pvs_move, opcional; ver benchmarks/pvs.py)
+SEARCH_ALGORITHM = 'alphabeta'
+
+# meia-largura da janela de aspiracao do PVS em torno do valor da iteracao anterior (None desliga)
+ASPIRATION_WINDOW = None
+
+# numero de processos da busca paralela na raiz (0 desliga; None usa todos os nucleos).
+# A busca paralela usa minimax_move e ignora SEARCH_ALGORITHM.
+PARALLEL_WORKERS = 0
+
+# com ate' tantas casas vazias, a jogada vem do resolvedor exato de final de jogo (ver endgame.py),
+# que usa no maximo metade de TIME_BUDGET (0 desliga). Com 12 vazias, os finais de
+# benchmarks/endgame.py sao resolvidos em menos de 1s.
+ENDGAME_EMPTIES = 12
+
+# livro de aberturas gravado por opening_book.py a partir de partidas do server.py (None desliga).
+# So' e' lido na primeira jogada; se o arquivo nao existir, o agente busca normalmente.
+BOOK_FILE = os.path.join(os.path.dirname(__file__), 'opening_book.bin')
+_book = None
+
+# se True, continua buscando no tempo do adversario a posicao prevista (ver pondering.py)
+PONDER = False
+_ponderer = None
 
-    move = minimax_move(state, max_depth, evaluate_mask)
-    return move
+# se True, o tabuleiro da raiz mantem a soma de EVAL_TEMPLATE a cada jogada (MASK_ACCUMULATOR),
+# e evaluate_mask so' le o valor, sem percorrer as 64 casas
+INCREMENTAL_EVAL = True
+
+
+def _search():
+    """
+    Retorna a funcao de busca escolhida por SEARCH_ALGORITHM
+    """
+    if SEARCH_ALGORITHM == 'pvs':
+        return functools.partial(pvs_move, aspiration=ASPIRATION_WINDOW)
+    return minimax_move
+
+
+def _get_ponderer() -> Ponderer:
+    """
+    Retorna o Ponderer do agente, criando-o na primeira chamada
+    """
+    global _ponderer
+    if _ponderer is None:
+        _ponderer = Ponderer(evaluate_mask, TIME_BUDGET, search=_search(), prior=OTHELLO_PRIOR)
+    return _ponderer
+
+
+def _get_book() -> OpeningBook:
+    """
+    Retorna o livro de aberturas do agente, criando-o na primeira chamada
+    """
+    global _book
+    if _book is None:
+        _book = OpeningBook(BOOK_FILE)
+    return _book
+
+
+def observe_move(state, move, player):
+    """
+    Chamada pelo servidor apos cada jogada aceita; repassa a jogada ao pondering, se estiver ativo
+    """
+    if _ponderer is not None:
+        _ponderer.observe_move(state, move, player)
+
+
+def _deepening_move(state, time_budget: float) -> Tuple[int, int]:
+    """
+    Aprofundamento iterativo: busca o mais fundo possivel dentro de time_budget
+    """
+    return iterative_deepening_move(state, evaluate_mask, time_budget, search=_search(),
+                                    orderer=MoveOrderer(OTHELLO_PRIOR))
+
+
+def make_move(state) -> Tuple[int, int]:
+    if INCREMENTAL_EVAL and native_board(state) is not None:
+        state.board.add_accumulator(MASK_ACCUMULATOR)
+    if BOOK_FILE:
+        move = _get_book().choose(state)
+        if move is not None:
+            return move
+    if ENDGAME_EMPTIES and is_endgame(state, ENDGAME_EMPTIES):
+        # se o resolvedor nao terminar nem a busca WLD, o restante do tempo vai para a busca heuristica
+        return endgame_move(state, TIME_BUDGET, fallback=lambda time_left: _deepening_move(state, time_left))
+    if PARALLEL_WORKERS != 0:
+        return parallel_move(state, evaluate_mask, TIME_BUDGET, workers=PARALLEL_WORKERS)
+    if PONDER:
+        return _get_ponderer().make_move(state)
+    return _deepening_move(state, TIME_BUDGET)
 
 
 def evaluate_mask(state: GameState, player: str) -> float:
@@ -123,10 +220,25 @@ def evaluate_mask(state: GameState, player: str) -> float:
     except Exception:
         pass
 
-    grid = _extract_grid(state)
     p = player.upper()
     opp = "B" if p == "W" else "W"
 
+    # caminho rapido: Board do Othello, le as casas diretamente
+    board = native_board(state)
+    if board is not None:
+        if board.accumulators.get(MASK_ACCUMULATOR.name) is MASK_ACCUMULATOR and p in ("B", "W"):
+            value = board.accumulated[MASK_ACCUMULATOR.name]
+            return float(value if p == "B" else -value)
+        score = 0
+        for cell, val in zip(packed_cells(board), _FLAT_TEMPLATE):
+            if cell == p:
+                score += val
+            elif cell == opp:
+                score -= val
+        return float(score)
+
+    grid = _extract_grid(state)
+
     rows = min(len(grid), 8)
     cols = 8
     score_p = 0.0
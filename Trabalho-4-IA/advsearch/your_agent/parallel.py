@@ -0,0 +1,235 @@
+import atexit
+import multiprocessing
+import os
+import time
+from typing import Callable, Tuple
+
+from ..othello.board import Board
+from ..othello.gamestate import GameState
+from .minimax import minimax_move, SearchTimeout
+from .move_ordering import MoveOrderer, OTHELLO_PRIOR
+from .transposition import TranspositionTable, SharedTranspositionTable
+
+# Busca paralela na raiz: cada jogada da raiz e' buscada por um processo de um pool.
+# A primeira jogada (a melhor da iteracao anterior) e' buscada sozinha, para estabelecer
+# um alfa (young brothers wait); as demais sao distribuidas entre os processos, que
+# compartilham o melhor alfa encontrado ate' o momento.
+
+_pool = None            # pool de processos, criado uma unica vez por processo do agente
+_pool_workers = 0
+_pool_tt = None         # tabela compartilhada pelos processos do pool atual (ou None)
+_shared_alpha = None    # melhor valor da raiz ja' encontrado na busca atual (compartilhado)
+_search_id = None       # identifica a busca atual; mudar o valor cancela as tarefas que ainda nao comecaram
+
+
+def get_pool(workers: int = None, tt: SharedTranspositionTable = None):
+    """
+    Retorna o pool de processos, criando-o na primeira chamada.
+    O pool continua vivo entre as jogadas e e' encerrado quando o agente termina.
+    :param workers: numero de processos (padrao: os.cpu_count()). Se mudar, o pool e' recriado.
+    :param tt: tabela de transposicao compartilhada pelos processos. Se None, cada processo usa
+               a sua propria tabela. Se mudar, o pool e' recriado.
+    """
+    global _pool, _pool_workers, _pool_tt, _shared_alpha, _search_id
+    workers = workers or os.cpu_count() or 1
+    if _pool is not None and _pool_workers == workers and _pool_tt is tt:
+        return _pool
+    shutdown_pool()
+
+    # 'spawn' funciona em todas as plataformas e nao herda as threads do servidor
+    ctx = multiprocessing.get_context('spawn')
+    _shared_alpha = ctx.Value('d', float('-inf'))
+    _search_id = ctx.Value('l', 0)
+    _pool = ctx.Pool(workers, initializer=_init_worker, initargs=(_shared_alpha, _search_id, tt))
+    _pool_workers, _pool_tt = workers, tt
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Encerra o pool de processos, se existir
+    """
+    global _pool, _pool_workers, _pool_tt
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    _pool, _pool_workers, _pool_tt = None, 0, None
+
+
+atexit.register(shutdown_pool)
+
+
+# ----------------------- lado dos processos do pool -----------------------
+
+_worker = {}    # estado de cada processo do pool: alfa compartilhado, tabela e ordenacao da busca atual
+
+
+def _init_worker(shared_alpha, search_id, shared_tt):
+    _worker['alpha'] = shared_alpha
+    _worker['search_id'] = search_id
+    _worker['shared_tt'] = shared_tt
+    _worker['table_id'] = None
+
+
+def _search_root_move(board_str: str, player: str, move, depth: int, eval_func: Callable,
+                      wall_deadline: float, search_id: int, table_id) -> Tuple:
+    """
+    Busca uma jogada da raiz com a janela (alfa compartilhado, +inf).
+    Executada nos processos do pool.
+    :return: (jogada, valor, stats), com valor None se o prazo se esgotou ou a busca foi cancelada.
+             stats tem os nodos buscados e as consultas e acertos na tabela de transposicao.
+    """
+    stats = {'nodes': 0, 'tt_probes': 0, 'tt_hits': 0}
+    if _worker['search_id'].value != search_id:
+        return move, None, stats  # busca cancelada antes de comecar
+
+    if _worker['table_id'] != table_id:
+        # nova jogada do agente: tabela e ordenacao novas (mantidas entre as iteracoes)
+        _worker['table_id'] = table_id
+        shared_tt = _worker['shared_tt']
+        _worker['tt'] = shared_tt if shared_tt is not None else TranspositionTable()
+        _worker['orderer'] = MoveOrderer(OTHELLO_PRIOR)
+
+    # perf_counter nao e' comparavel entre processos, entao o prazo chega em time.time()
+    deadline = time.perf_counter() + (wall_deadline - time.time())
+    state = GameState(Board.from_string(board_str), player)
+    shared_alpha = _worker['alpha']
+    tt = _worker['tt']
+    probes, hits = tt.probes, tt.hits
+    value = None
+    try:
+        minimax_move(state, depth, eval_func, stats, tt=tt, orderer=_worker['orderer'],
+                     deadline=deadline, root_moves=[move], alpha=shared_alpha.value)
+        value = stats.pop('value')
+        with shared_alpha.get_lock():
+            if value > shared_alpha.value:
+                shared_alpha.value = value
+    except SearchTimeout:
+        pass
+    stats['tt_probes'], stats['tt_hits'] = tt.probes - probes, tt.hits - hits
+    return move, value, stats
+
+
+# ----------------------- lado do agente -----------------------
+
+def _timeout(wall_deadline: float):
+    # tempo de espera por um resultado: so' ate' o prazo; o que nao chegou ate' la' e' descartado
+    if wall_deadline == float('inf'):
+        return None
+    return max(0.0, wall_deadline - time.time())
+
+
+def _accumulate(totals: dict, stats: dict):
+    # soma os contadores de stats em totals
+    for name, value in stats.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+def parallel_search(state, depth: int, eval_func: Callable, wall_deadline: float,
+                    root_moves: list, workers: int = None, stats: dict = None, table_id=None,
+                    tt: SharedTranspositionTable = None, values: dict = None) -> Tuple:
+    """
+    Busca paralela na raiz com profundidade fixa.
+    :param state: estado a partir do qual buscar
+    :param depth: profundidade da busca
+    :param eval_func: funcao de avaliacao (deve ser uma funcao de modulo, para poder ser enviada aos processos)
+    :param wall_deadline: prazo em time.time()
+    :param root_moves: jogadas da raiz, em ordem de prioridade (a primeira e' buscada sozinha)
+    :param workers: numero de processos
+    :param stats: dict opcional; stats['nodes'] acumula os nodos buscados pelos processos, e
+                  stats['tt_probes'] e stats['tt_hits'] as consultas e acertos nas suas tabelas
+    :param table_id: identificador das tabelas de transposicao dos processos. Buscas com o mesmo
+                     table_id (ex.: as iteracoes de um aprofundamento iterativo) reaproveitam as tabelas.
+    :param tt: tabela compartilhada pelos processos (ver get_pool)
+    :param values: dict opcional; recebe o valor de cada jogada da raiz que terminou antes do prazo
+    :return: (melhor jogada, valor, completa) onde completa indica se todas as jogadas foram buscadas.
+             A melhor jogada e' None se nem a primeira jogada terminou antes do prazo.
+    """
+    global _search_id
+    pool = get_pool(workers, tt)
+    with _search_id.get_lock():
+        _search_id.value += 1
+        search_id = _search_id.value
+    _shared_alpha.value = float('-inf')
+
+    root_moves = list(root_moves)
+    board_str, player = str(state.board), state.player
+    table_id = search_id if table_id is None else table_id
+    args = lambda move: (board_str, player, move, depth, eval_func, wall_deadline, search_id, table_id)
+
+    totals = {}
+    best_move, best_value, complete = None, float('-inf'), True
+    try:
+        # young brothers wait: a primeira jogada estabelece o alfa das demais
+        first = pool.apply_async(_search_root_move, args(root_moves[0]))
+        move, value, result_stats = first.get(timeout=_timeout(wall_deadline))
+        _accumulate(totals, result_stats)
+        if value is None:
+            return None, None, False
+        best_move, best_value = move, value
+        if values is not None:
+            values[move] = value
+
+        pending = [pool.apply_async(_search_root_move, args(move)) for move in root_moves[1:]]
+        for result in pending:
+            move, value, result_stats = result.get(timeout=_timeout(wall_deadline))
+            _accumulate(totals, result_stats)
+            if value is None:
+                complete = False
+                continue
+            if values is not None:
+                values[move] = value
+            if value > best_value:
+                best_move, best_value = move, value
+    except multiprocessing.TimeoutError:
+        complete = False
+    finally:
+        # cancela as jogadas que ainda nao comecaram; as que estao em andamento param no prazo
+        with _search_id.get_lock():
+            _search_id.value += 1
+        if stats is not None:
+            _accumulate(stats, totals)
+    return best_move, best_value, complete
+
+
+def parallel_move(state, eval_func: Callable, time_budget: float, workers: int = None,
+                  max_depth: int = 64, stats: dict = None, tt: SharedTranspositionTable = None) -> Tuple[int, int]:
+    """
+    Aprofundamento iterativo com busca paralela na raiz.
+    A cada iteracao completa, as jogadas da raiz sao reordenadas pelos valores devolvidos
+    pelos processos (do maior para o menor; a melhor jogada sempre primeiro).
+    Se o prazo se esgota no meio de uma iteracao, vale a melhor jogada ja' terminada.
+    :param state: estado a partir do qual buscar (Othello)
+    :param eval_func: funcao de avaliacao (funcao de modulo)
+    :param time_budget: tempo maximo em segundos
+    :param workers: numero de processos (padrao: os.cpu_count())
+    :param max_depth: profundidade maxima
+    :param stats: dict opcional; recebe 'depth' (ultima profundidade completa), 'nodes',
+                  'tt_probes' e 'tt_hits'
+    :param tt: tabela compartilhada pelos processos (ver get_pool); e' esvaziada no inicio da busca
+    :return: (int, int) jogada (x, y), ou None se nao houver jogadas
+    """
+    wall_deadline = time.time() + time_budget
+    legal = state.legal_moves()
+    if not legal:
+        return None
+
+    if tt is not None:
+        tt.clear()
+    root_moves = MoveOrderer(OTHELLO_PRIOR).order(state, legal, 0)
+    best_move = root_moves[0]
+    for depth in range(1, min(max_depth, state.board.piece_count[Board.EMPTY]) + 1):
+        values = {}
+        move, value, complete = parallel_search(state, depth, eval_func, wall_deadline, root_moves,
+                                                workers, stats, table_id=wall_deadline, tt=tt, values=values)
+        if move is not None:
+            best_move = move  # se incompleta, a primeira jogada (a anterior) foi buscada, entao ainda vale
+        if not complete:
+            break
+        if stats is not None:
+            stats['depth'] = depth
+        # sort e' estavel: empates mantem a ordem anterior, e a melhor jogada vai para a frente
+        root_moves.sort(key=lambda root_move: values.get(root_move, float('-inf')), reverse=True)
+        root_moves.remove(move)
+        root_moves.insert(0, move)
+    return best_move
@@ -0,0 +1,229 @@
+import atexit
+import multiprocessing
+import threading
+import time
+from typing import Callable, Tuple
+
+from .deepening import iterative_deepening_move
+from .minimax import minimax_move
+from .move_ordering import MoveOrderer
+from .transposition import SharedTranspositionTable
+
+# Pondering: busca no tempo do adversario.
+# Depois de devolver a jogada, o agente preve a resposta do adversario (a jogada guardada na
+# tabela de transposicao para o estado apos a nossa jogada) e continua buscando o estado
+# resultante num processo em segundo plano. O processo e' criado uma vez e vive entre as jogadas
+# (como o pool de parallel.py): recebe cada posicao por uma fila e para quando o agente marca um
+# flag compartilhado, que a busca consulta junto com o prazo. A busca em segundo plano escreve
+# numa tabela de transposicao em memoria compartilhada. Se a previsao acertar, o proximo make_move
+# busca com essa tabela ja' preenchida e chega mais fundo no mesmo tempo; se errar, a tabela fica
+# como esta': as entradas da posicao prevista nao atrapalham (a palavra de verificacao e a politica
+# de substituicao da tabela cuidam delas), e as das nossas buscas anteriores continuam uteis.
+#
+# O servidor informa as jogadas aceitas chamando a funcao opcional observe_move(state, move, player)
+# do modulo do agente, o que permite descobrir um erro de previsao antes da nossa vez.
+
+
+class _StopDeadline(object):
+    """
+    Prazo da busca de pondering: vence no prazo normal ou assim que o agente marca stop.
+    As buscas comparam time.perf_counter() > deadline, o que chama __lt__.
+    """
+    __slots__ = ('limit', 'stop')
+
+    def __init__(self, limit: float, stop):
+        self.limit = limit
+        self.stop = stop
+
+    def __lt__(self, now: float) -> bool:
+        return self.stop.value != 0 or now > self.limit
+
+
+def _ponder_worker(tasks, stop, idle, eval_func: Callable, search: Callable, tt: SharedTranspositionTable,
+                   prior, max_time: float):
+    # processo de pondering: busca cada posicao recebida ate' o prazo ou ate' stop; None encerra
+    def stoppable(*args, deadline=None, **kwargs):
+        return search(*args, deadline=_StopDeadline(deadline, stop), **kwargs)
+
+    while True:
+        state = tasks.get()
+        if state is None:
+            return
+        try:
+            iterative_deepening_move(state, eval_func, max_time, search=stoppable, tt=tt,
+                                     orderer=MoveOrderer(prior))
+        finally:
+            idle.set()
+
+
+class Ponderer(object):
+    """
+    Escolhe jogadas com aprofundamento iterativo e, entre uma jogada e outra,
+    busca a posicao prevista no tempo do adversario.
+
+    A tabela de transposicao e' compartilhada entre make_move e o processo de pondering,
+    entao search deve ser uma funcao de modulo (ou functools.partial de uma), e o mesmo
+    vale para eval_func, para que possam ser enviadas ao processo.
+    """
+
+    def __init__(self, eval_func: Callable, time_budget: float, search: Callable = minimax_move,
+                 prior=None, max_ponder_time: float = 60, table_entries: int = 1 << 18):
+        """
+        :param eval_func: funcao de avaliacao eval_func(state, player)
+        :param time_budget: tempo maximo de cada make_move, em segundos
+        :param search: funcao de busca com a interface de minimax_move
+        :param prior: tabela de prioridade estatica do MoveOrderer
+        :param max_ponder_time: tempo maximo de pondering, caso o adversario demore a jogar
+        :param table_entries: tamanho da tabela de transposicao compartilhada
+        """
+        self.eval_func = eval_func
+        self.time_budget = time_budget
+        self.search = search
+        self.prior = prior
+        self.max_ponder_time = max_ponder_time
+        self.tt = SharedTranspositionTable(table_entries)
+        self.lock = threading.Lock()
+        self.process = None     # processo de pondering, criado no primeiro pondering
+        self.tasks = None       # fila de posicoes para o processo
+        self.stop = None        # flag compartilhado: 1 interrompe a busca em andamento
+        self.idle = None        # marcado pelo processo ao terminar cada busca
+        self.active = False     # se ha' um pondering em andamento
+        self.color = None       # cor do agente na busca em andamento
+        self.predicted = None   # (jogada prevista do adversario, estado previsto como (tabuleiro, jogador))
+        self.started = None     # instante em que o pondering comecou
+        self.stats = {}
+        self.reset_stats()
+        atexit.register(self.close)
+
+    def reset_stats(self):
+        """
+        Zera as estatisticas (usado ao final de cada partida)
+        """
+        self.stats = {'predictions': 0, 'hits': 0, 'misses': 0, 'ponder_time': 0.0, 'moves': 0}
+
+    def make_move(self, state) -> Tuple[int, int]:
+        """
+        Retorna a jogada para state, reaproveitando o pondering se a previsao acertou,
+        e inicia o pondering da proxima posicao prevista.
+        """
+        self._finish(state)
+        self.stats['moves'] += 1
+        move = iterative_deepening_move(state, self.eval_func, self.time_budget, search=self.search,
+                                        tt=self.tt, orderer=MoveOrderer(self.prior))
+        if move is not None:
+            self._start(state, move)
+        return move
+
+    def observe_move(self, state, move, player):
+        """
+        Recebe do servidor uma jogada aceita e o estado resultante. Se a jogada for do adversario
+        e diferente da prevista, o pondering e' interrompido imediatamente.
+        Ao final da partida, imprime as estatisticas de pondering e as zera.
+        """
+        with self.lock:
+            if self.active and player != self.color and move != self.predicted[0]:
+                self._stop(hit=False)
+        if state.is_terminal():
+            with self.lock:
+                self._stop(hit=False)
+            if self.stats['moves'] > 0:
+                print(self.report())
+            self.reset_stats()
+
+    def report(self) -> str:
+        """
+        Resumo das estatisticas de pondering da partida
+        """
+        s = self.stats
+        hit_rate = s['hits'] / s['predictions'] if s['predictions'] else 0.0
+        return (f'pondering: {s["hits"]}/{s["predictions"]} predictions hit ({hit_rate:.0%}), '
+                f'{s["ponder_time"]:.1f}s of extra search time in {s["moves"]} moves')
+
+    def close(self):
+        """
+        Encerra o pondering e o seu processo e libera a tabela compartilhada
+        """
+        with self.lock:
+            self._stop(hit=False)
+            self._shutdown_worker()
+        if self.tt is not None:
+            self.tt.close()
+            self.tt = None
+
+    def _start(self, state, move):
+        # preve a resposta do adversario e comeca a buscar a posicao resultante
+        after = state.next_state(move)
+        if after.is_terminal():
+            return
+        reply = None
+        if after.player != state.player:    # se o adversario passar, a posicao prevista e' a propria after
+            entry = self.tt.probe(after.zobrist_key())
+            if entry is None or entry[4] is None:
+                return
+            reply = entry[4]
+            after = after.next_state(reply)
+            if after.is_terminal():
+                return
+
+        with self.lock:
+            self._start_worker()
+            self.stop.value = 0
+            self.idle.clear()
+            self.tasks.put(after)
+            self.active = True
+            self.color = state.player
+            self.predicted = (reply, (str(after.board), after.player))
+            self.started = time.perf_counter()
+            self.stats['predictions'] += 1
+
+    def _finish(self, state):
+        # encerra o pondering no inicio de make_move, verificando se a previsao acertou
+        with self.lock:
+            if self.active:
+                self._stop(hit=(str(state.board), state.player) == self.predicted[1])
+
+    def _start_worker(self):
+        # cria o processo de pondering, se ainda nao existir (ou se tiver morrido)
+        if self.process is not None and self.process.is_alive():
+            return
+        self._shutdown_worker()
+        # 'spawn' funciona em todas as plataformas e nao herda as threads do servidor
+        ctx = multiprocessing.get_context('spawn')
+        self.tasks = ctx.SimpleQueue()
+        self.stop = ctx.RawValue('b', 0)
+        self.idle = ctx.Event()
+        self.process = ctx.Process(target=_ponder_worker, daemon=True,
+                                   args=(self.tasks, self.stop, self.idle, self.eval_func, self.search,
+                                         self.tt, self.prior, self.max_ponder_time))
+        self.process.start()
+
+    def _shutdown_worker(self):
+        # encerra o processo de pondering (ocioso, ver _stop)
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.tasks.put(None)
+            self.process.join(timeout=1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.process = self.tasks = self.stop = self.idle = None
+
+    def _stop(self, hit: bool):
+        # interrompe a busca de pondering e espera o processo ficar ocioso (nao escreve mais na tabela).
+        # A tabela nao e' esvaziada se a previsao errou: as entradas da nossa busca anterior continuam la'.
+        if not self.active:
+            return
+        self.stop.value = 1
+        if not self.idle.wait(timeout=1.0):
+            # o processo nao respondeu: e' encerrado e recriado no proximo pondering
+            # (uma entrada escrita pela metade e' descartada pela propria tabela)
+            self.process.terminate()
+            self.process.join()
+            self._shutdown_worker()
+        self.active = False
+        if hit:
+            self.stats['hits'] += 1
+            self.stats['ponder_time'] += min(time.perf_counter() - self.started, self.max_ponder_time)
+        else:
+            self.stats['misses'] += 1
@@ -0,0 +1,213 @@
+import math
+import time
+from typing import Callable, Tuple
+
+from .minimax import SearchTimeout, UNLIMITED_DEPTH
+from .transposition import TranspositionTable, EXACT, LOWER, UPPER, bound_flag
+
+
+def _opponent(player):
+    return 'B' if player == 'W' else 'W'
+
+
+def pvs_move(state, max_depth: int, eval_func: Callable, stats: dict = None,
+             inplace: bool = None, tt: TranspositionTable = None,
+             orderer=None, deadline: float = None, root_moves=None,
+             alpha: float = float("-inf"), aspiration: float = None) -> Tuple[int, int]:
+    """
+    Retorna a melhor jogada para o jogador de state usando Principal Variation Search
+    (negamax com janelas nulas): o primeiro filho de cada nodo e' buscado com a janela
+    (alfa, beta) completa e os demais com uma janela nula, que so' verifica se o filho
+    e' melhor que alfa. Apenas quando isso acontece (fail-high) o filho e' buscado de novo.
+    Funciona melhor com uma boa ordenacao das jogadas (orderer), pois espera que o
+    primeiro filho seja o melhor.
+
+    Tem a mesma interface de minimax_move, e pode substitui-la no aprofundamento iterativo.
+    Diferente de minimax_move, quem maximiza em cada nodo e' decidido pelo jogador
+    que move (node.player) e nao pela paridade da profundidade, entao as vezes em que
+    um jogador passa a vez sao tratadas corretamente.
+
+    :param state: estado a partir do qual buscar
+    :param max_depth: profundidade maxima (-1 para ilimitada)
+    :param eval_func: funcao de avaliacao eval_func(state, player)
+    :param stats: como em minimax_move; alem disso, stats['researches'] conta as buscas repetidas
+    :param inplace: como em minimax_move
+    :param tt: tabela de transposicao opcional. Os valores sao guardados do ponto de vista do
+               jogador que move em cada estado, entao nao compartilhe a mesma tabela com minimax_move.
+    :param orderer: como em minimax_move
+    :param deadline: como em minimax_move
+    :param root_moves: como em minimax_move
+    :param alpha: como em minimax_move
+    :param aspiration: meia-largura da janela de aspiracao. Se fornecida e a tabela tiver um valor
+                       para a raiz (ex.: da iteracao anterior do aprofundamento iterativo), a raiz e'
+                       buscada com a janela (valor - aspiration, valor + aspiration) e, se o resultado
+                       cair fora dela, novamente com a janela completa.
+    :return: (int, int) jogada (x, y)
+    """
+    root_player = state.player
+    nodes = [0]
+    tt_cutoffs = [0]
+    horizon = [0]
+    researches = [0]
+    if inplace is None:
+        inplace = hasattr(state, 'apply') and hasattr(state, 'undo')
+    if not hasattr(state, 'zobrist_key'):
+        tt = None
+    on_cutoff = getattr(orderer, 'cutoff', None)
+
+    def remaining_depth(depth):
+        return UNLIMITED_DEPTH if max_depth == -1 else max_depth - depth
+
+    def child_value(node, move, depth, alpha, beta):
+        # Valor do filho gerado por move, do ponto de vista de quem fez a jogada
+        mover = node.player
+        if inplace:
+            record = node.apply(move)
+            child = node
+        else:
+            child = node.next_state(move)
+        try:
+            # um estado terminal nao tem jogador; o seu ponto de vista e' o do adversario
+            perspective = child.player if child.player is not None else _opponent(mover)
+            if perspective == mover:  # o adversario passou a vez
+                return negamax(child, perspective, depth, alpha, beta)
+            return -negamax(child, perspective, depth, -beta, -alpha)
+        finally:
+            if inplace:
+                node.undo(record)
+
+    def null_window(alpha):
+        # menor janela acima de alpha: a busca so' informa se o valor e' <= alpha ou > alpha
+        return math.nextafter(alpha, math.inf)
+
+    def negamax(node, perspective, depth, alpha, beta):
+        if deadline is not None and time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        if tt is None:
+            return search(node, perspective, depth, alpha, beta, None)[0]
+
+        key = node.zobrist_key()
+        remaining = remaining_depth(depth)
+        entry = tt.probe(key)
+        hash_move = None
+        if entry is not None:
+            hash_move = entry[4]
+            if entry[1] >= remaining:
+                value, flag = entry[2], entry[3]
+                if flag == EXACT:
+                    tt_cutoffs[0] += 1
+                    return value
+                if flag == LOWER and value > alpha:
+                    alpha = value
+                elif flag == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    tt_cutoffs[0] += 1
+                    return value
+
+        value, best = search(node, perspective, depth, alpha, beta, hash_move)
+        tt.store(key, remaining, value, bound_flag(value, alpha, beta), best)
+        return value
+
+    # Negamax com janelas nulas, retorna (valor do ponto de vista de perspective, melhor jogada)
+    def search(node, perspective, depth, alpha, beta, hash_move):
+        nodes[0] += 1
+
+        terminal = node.is_terminal()
+        if terminal or (max_depth != -1 and depth == max_depth):
+            if not terminal:
+                horizon[0] += 1
+            value = eval_func(node, root_player)
+            return (value if perspective == root_player else -value), None
+
+        moves = node.legal_moves()
+
+        # Se não há jogadas, o jogador passa a vez
+        if not moves:
+            opponent = _opponent(node.player)
+            if inplace:
+                player = node.player
+                node.player = opponent
+                try:
+                    value = -negamax(node, opponent, depth + 1, -beta, -alpha)
+                finally:
+                    node.player = player
+                return value, None
+            passed = node.copy()
+            passed.player = opponent
+            return -negamax(passed, opponent, depth + 1, -beta, -alpha), None
+
+        if orderer is not None:
+            moves = orderer.order(node, moves, depth, hash_move)
+
+        best_value, best = float("-inf"), None
+        for move in moves:
+            if best is None:
+                value = child_value(node, move, depth + 1, alpha, beta)
+            else:
+                value = child_value(node, move, depth + 1, alpha, null_window(alpha))
+                if alpha < value < beta:
+                    researches[0] += 1
+                    value = child_value(node, move, depth + 1, alpha, beta)
+            if best is None or value > best_value:
+                best_value, best = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                if on_cutoff is not None:
+                    on_cutoff(node, move, depth, remaining_depth(depth))
+                break
+        return best_value, best
+
+    def search_root(moves, alpha, beta):
+        # Busca as jogadas da raiz na janela (alpha, beta), retorna (valor, melhor jogada)
+        best_value, best_move = float("-inf"), None
+        for move in moves:
+            try:
+                if best_move is None:
+                    value = child_value(state, move, 1, alpha, beta)
+                else:
+                    value = child_value(state, move, 1, alpha, null_window(alpha))
+                    if alpha < value < beta:
+                        researches[0] += 1
+                        value = child_value(state, move, 1, alpha, beta)
+            except SearchTimeout as timeout:
+                timeout.best_move = best_move
+                raise
+            if best_move is None or value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        return best_value, best_move
+
+    legal = state.legal_moves() if root_moves is None else root_moves
+    if not legal:
+        return None
+
+    root_entry = tt.probe(state.zobrist_key()) if tt is not None else None
+    if orderer is not None:
+        legal = orderer.order(state, legal, 0, root_entry[4] if root_entry is not None else None)
+
+    root_alpha, beta = alpha, float("inf")
+    if aspiration is not None and root_entry is not None:
+        window_alpha, window_beta = max(alpha, root_entry[2] - aspiration), root_entry[2] + aspiration
+        best_value, best_move = search_root(legal, window_alpha, window_beta)
+        if (best_value <= window_alpha and window_alpha > root_alpha) or best_value >= window_beta:
+            # o valor caiu fora da janela de aspiracao: busca de novo com a janela completa
+            researches[0] += 1
+            best_value, best_move = search_root(legal, root_alpha, beta)
+    else:
+        best_value, best_move = search_root(legal, root_alpha, beta)
+
+    if tt is not None and root_moves is None:
+        tt.store(state.zobrist_key(), remaining_depth(0), best_value, bound_flag(best_value, root_alpha, beta), best_move)
+
+    if stats is not None:
+        stats['nodes'] = stats.get('nodes', 0) + nodes[0]
+        stats['tt_cutoffs'] = stats.get('tt_cutoffs', 0) + tt_cutoffs[0]
+        stats['horizon'] = stats.get('horizon', 0) + horizon[0]
+        stats['researches'] = stats.get('researches', 0) + researches[0]
+        stats['value'] = best_value
+
+    return best_move
@@ -0,0 +1,232 @@
+import struct
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# Tipos de limite de um valor armazenado na tabela
+EXACT = 0   # valor exato (caiu dentro da janela alfa-beta)
+LOWER = 1   # limite inferior (houve corte beta: o valor real e' >= valor)
+UPPER = 2   # limite superior (nenhum filho passou de alfa: o valor real e' <= valor)
+
+
+class TranspositionTable(object):
+    """
+    Tabela de transposicao de tamanho fixo, indexada pelo hash zobrist do estado.
+
+    Cada posicao (bucket) tem dois slots:
+    - o slot 'por profundidade' so' e' substituido por entradas de profundidade maior ou igual;
+    - o slot 'sempre substitui' guarda a entrada mais recente que nao coube no primeiro.
+    Assim, a memoria usada e' limitada a 2 * num_buckets entradas, onde cada entrada
+    e' uma tupla (key, depth, value, flag, move).
+
+    Os valores sao guardados do ponto de vista do jogador raiz da busca, entao uma mesma
+    tabela so' deve ser reaproveitada entre buscas com o mesmo jogador raiz e a mesma
+    funcao de avaliacao.
+    """
+
+    def __init__(self, max_entries: int = 1 << 17):
+        """
+        :param max_entries: numero maximo de entradas (arredondado para baixo para uma potencia de 2, minimo 2)
+        """
+        num_buckets = 1
+        while num_buckets * 4 <= max_entries:
+            num_buckets *= 2
+        self.mask = num_buckets - 1
+        self.deep = [None] * num_buckets
+        self.recent = [None] * num_buckets
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Numero maximo de entradas que a tabela pode guardar
+        """
+        return 2 * len(self.deep)
+
+    def __len__(self) -> int:
+        return sum(1 for e in self.deep if e is not None) + sum(1 for e in self.recent if e is not None)
+
+    def clear(self):
+        """
+        Remove todas as entradas
+        """
+        self.deep = [None] * len(self.deep)
+        self.recent = [None] * len(self.recent)
+
+    def probe(self, key: int) -> Optional[Tuple]:
+        """
+        Retorna a entrada (key, depth, value, flag, move) do estado com o hash key, ou None
+        """
+        self.probes += 1
+        index = key & self.mask
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move=None):
+        """
+        Guarda o resultado da busca de um estado
+        :param key: hash zobrist do estado
+        :param depth: profundidade restante com que o estado foi buscado
+        :param value: valor encontrado
+        :param flag: EXACT, LOWER ou UPPER
+        :param move: melhor jogada encontrada (ou None)
+        """
+        index = key & self.mask
+        entry = (key, depth, value, flag, move)
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or depth >= deep[1]:
+            if deep is not None and deep[0] != key:
+                self.recent[index] = deep  # a entrada rasa ainda pode ser util
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+
+_DOUBLE = struct.Struct('<d')
+_BITS = struct.Struct('<Q')
+
+
+def _double_bits(value: float) -> int:
+    # representacao binaria (64 bits) de um float
+    return _BITS.unpack(_DOUBLE.pack(value))[0]
+
+
+class SharedTranspositionTable(object):
+    """
+    Tabela de transposicao num bloco de memoria compartilhada (multiprocessing.shared_memory),
+    com a mesma interface e a mesma politica de substituicao de TranspositionTable,
+    para que varios processos buscando a mesma arvore aproveitem o trabalho uns dos outros.
+
+    Cada entrada ocupa 24 bytes: (check, data, value), onde data empacota
+    profundidade, tipo de limite e jogada, e check = key ^ data ^ bits(value).
+    Nao ha' travas: dois processos podem escrever a mesma entrada ao mesmo tempo,
+    misturando os bytes das duas escritas (torn write). Nesse caso check nao confere
+    com a chave e a entrada e' tratada como ausente, entao uma escrita corrompida
+    so' custa um acerto perdido, nunca um valor errado.
+    Jogadas sao guardadas como (x, y) com 0 <= x, y < 256, e a profundidade como 0 <= depth < 65536.
+
+    O processo que cria a tabela e' o dono do bloco e deve chamar close() ao final.
+    A tabela pode ser enviada a outros processos (ex.: initargs de um Pool): o objeto
+    recebido se conecta ao mesmo bloco pelo nome.
+    """
+
+    _ENTRY = struct.Struct('<QQd')
+    _VALID = 1 << 63
+
+    def __init__(self, max_entries: int = 1 << 17, name: str = None):
+        """
+        :param max_entries: numero maximo de entradas (arredondado para baixo para uma potencia de 2, minimo 2)
+        :param name: nome de um bloco ja' existente ao qual se conectar (None cria um bloco novo)
+        """
+        num_buckets = 1
+        while num_buckets * 4 <= max_entries:
+            num_buckets *= 2
+        size = 2 * num_buckets * self._ENTRY.size
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.buf = self.shm.buf
+        self.mask = num_buckets - 1
+        self.probes = 0
+        self.hits = 0
+        if self.owner:
+            self.clear()
+
+    def __getstate__(self):
+        return {'name': self.shm.name, 'capacity': self.capacity}
+
+    def __setstate__(self, state):
+        self.__init__(state['capacity'], name=state['name'])
+
+    @property
+    def name(self) -> str:
+        """
+        Nome do bloco de memoria compartilhada
+        """
+        return self.shm.name
+
+    @property
+    def capacity(self) -> int:
+        """
+        Numero maximo de entradas que a tabela pode guardar
+        """
+        return 2 * (self.mask + 1)
+
+    def __len__(self) -> int:
+        return sum(1 for slot in range(self.capacity)
+                   if self._ENTRY.unpack_from(self.buf, slot * self._ENTRY.size)[1] & self._VALID)
+
+    def clear(self):
+        """
+        Remove todas as entradas (de todos os processos)
+        """
+        self.buf[:self.capacity * self._ENTRY.size] = bytes(self.capacity * self._ENTRY.size)
+
+    def close(self):
+        """
+        Desconecta este processo do bloco; se for o dono, tambem libera o bloco
+        """
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def _read(self, slot: int, key: int) -> Optional[Tuple]:
+        # le a entrada do slot; None se estiver vazia, for de outra chave ou estiver corrompida
+        check, data, value = self._ENTRY.unpack_from(self.buf, slot * self._ENTRY.size)
+        if not data & self._VALID or check ^ data ^ _double_bits(value) != key:
+            return None
+        move = (data >> 16) & 0xFFFF
+        return key, data & 0xFFFF, value, (data >> 32) & 0x3, (None if move == 0 else ((move - 1) >> 8, (move - 1) & 0xFF))
+
+    def _write(self, slot: int, key: int, depth: int, value: float, flag: int, move):
+        data = self._VALID | (flag << 32) | (0 if move is None else ((move[0] << 8 | move[1]) + 1) << 16) | depth
+        value_bits = _double_bits(value)
+        self._ENTRY.pack_into(self.buf, slot * self._ENTRY.size, key ^ data ^ value_bits, data, value)
+
+    def probe(self, key: int) -> Optional[Tuple]:
+        """
+        Retorna a entrada (key, depth, value, flag, move) do estado com o hash key, ou None
+        """
+        self.probes += 1
+        slot = 2 * (key & self.mask)
+        entry = self._read(slot, key)
+        if entry is None:
+            entry = self._read(slot + 1, key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def store(self, key: int, depth: int, value: float, flag: int, move=None):
+        """
+        Guarda o resultado da busca de um estado (mesmos parametros de TranspositionTable.store)
+        """
+        slot = 2 * (key & self.mask)
+        check, data, old_value = self._ENTRY.unpack_from(self.buf, slot * self._ENTRY.size)
+        if data & self._VALID:
+            deep_key = check ^ data ^ _double_bits(old_value)
+            if deep_key != key and depth < data & 0xFFFF:
+                self._write(slot + 1, key, depth, value, flag, move)
+                return
+            if deep_key != key:
+                # a entrada rasa ainda pode ser util
+                self.buf[(slot + 1) * self._ENTRY.size:(slot + 2) * self._ENTRY.size] = \
+                    self.buf[slot * self._ENTRY.size:(slot + 1) * self._ENTRY.size]
+        self._write(slot, key, depth, value, flag, move)
+
+
+def bound_flag(value: float, alpha: float, beta: float) -> int:
+    """
+    Retorna o tipo de limite de um valor obtido na busca com a janela (alpha, beta)
+    """
+    if value <= alpha:
+        return UPPER
+    if value >= beta:
+        return LOWER
+    return EXACT
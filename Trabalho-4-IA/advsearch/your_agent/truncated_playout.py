@@ -0,0 +1,103 @@
+import math
+import random
+from typing import Callable, List, Sequence, Tuple
+
+from .othello_minimax_custom import evaluate_custom
+from .othello_minimax_mask import evaluate_mask
+
+# Playouts truncados para o MCTS no Othello: em vez de jogar aleatoriamente ate' o fim, o
+# playout para depois de cutoff jogadas e a posicao alcancada e' avaliada por uma heuristica
+# (evaluate_mask ou evaluate_custom). O valor da heuristica vira uma probabilidade de vitoria
+# pela sigmoide 1 / (1 + exp(-valor / escala)); a escala de cada heuristica foi calibrada com
+# calibrate (ver benchmarks/truncated_playout.py), contra o resultado de playouts completos a
+# partir das mesmas posicoes, que e' o que o playout truncado substitui.
+
+# heuristicas disponiveis, pelo nome usado em mcts.ROLLOUT_EVAL
+EVALUATORS = {'mask': evaluate_mask, 'custom': evaluate_custom}
+
+# escala da sigmoide de cada heuristica (python -m benchmarks.truncated_playout --calibrate), com
+# cerca de 9600 posicoes e corte de 8 jogadas; variou pouco com cortes de 4 a 16 jogadas
+SIGMOID_SCALE = {'mask': 210.0, 'custom': 285.0}
+
+
+def win_probability(value: float, scale: float) -> float:
+    """
+    Probabilidade de vitoria correspondente ao valor da heuristica
+    """
+    exponent = -value / scale
+    if exponent > 500.0:  # evita overflow em exp
+        return 0.0
+    return 1.0 / (1.0 + math.exp(exponent))
+
+
+def playout(state, cutoff: int, evaluate: Callable, scale: float, rng=random) -> float:
+    """
+    Joga aleatoriamente a partir de state ate' cutoff jogadas (ou ate' o fim, se vier antes)
+    :return: pontos de state.player: resultado do jogo (vitoria 1, empate 1/2, derrota 0),
+             ou a probabilidade de vitoria pela heuristica se o jogo nao terminou
+    """
+    player = state.player
+    state = state.copy()
+    for _ in range(cutoff):
+        if state.is_terminal():
+            break
+        state.apply(rng.choice(tuple(state.legal_moves())))
+    if state.is_terminal():
+        winner = state.winner()
+        return 1.0 if winner == player else 0.5 if winner is None else 0.0
+    return win_probability(evaluate(state, player), scale)
+
+
+def samples(positions: Sequence, cutoff: int, evaluate: Callable, rng=random) -> List[Tuple[float, float]]:
+    """
+    Amostras para calibrate: de cada posicao, joga cutoff jogadas aleatorias, avalia a posicao
+    alcancada e continua aleatoriamente ate' o fim
+    :return: lista de (valor da heuristica, pontos no fim do jogo), do ponto de vista de quem movia
+             na posicao inicial; posicoes em que o jogo terminou antes do corte ficam de fora
+    """
+    result = []
+    for position in positions:
+        player = position.player
+        state = position.copy()
+        for _ in range(cutoff):
+            if state.is_terminal():
+                break
+            state.apply(rng.choice(tuple(state.legal_moves())))
+        if state.is_terminal():
+            continue
+        value = evaluate(state, player)
+        while not state.is_terminal():
+            state.apply(rng.choice(tuple(state.legal_moves())))
+        winner = state.winner()
+        result.append((value, 1.0 if winner == player else 0.5 if winner is None else 0.0))
+    return result
+
+
+def calibrate(data: Sequence[Tuple[float, float]], low: float = 0.1, high: float = 1000.0) -> float:
+    """
+    Escala da sigmoide que maximiza a verossimilhanca dos resultados (entropia cruzada minima),
+    por busca da secao aurea sobre o logaritmo da escala
+    :param data: pares (valor da heuristica, pontos no fim do jogo), como os de samples
+    """
+    def loss(log_scale):
+        scale = math.exp(log_scale)
+        total = 0.0
+        for value, outcome in data:
+            probability = min(max(win_probability(value, scale), 1e-9), 1.0 - 1e-9)
+            total -= outcome * math.log(probability) + (1.0 - outcome) * math.log(1.0 - probability)
+        return total
+
+    ratio = (math.sqrt(5) - 1) / 2
+    a, b = math.log(low), math.log(high)
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    loss_c, loss_d = loss(c), loss(d)
+    for _ in range(60):
+        if loss_c < loss_d:
+            b, d, loss_d = d, c, loss_c
+            c = b - ratio * (b - a)
+            loss_c = loss(c)
+        else:
+            a, c, loss_c = c, d, loss_d
+            d = a + ratio * (b - a)
+            loss_d = loss(d)
+    return math.exp((a + b) / 2)
@@ -0,0 +1,53 @@
+import random
+
+
+class ZobristTable(object):
+    """
+    Random keys for Zobrist hashing, shared by all game engines.
+    The hash of a position is the XOR of the keys of every (square, color) occupied
+    on the board. Since XOR is its own inverse, a board can update its hash
+    incrementally: placing, removing or flipping a disc is one or two XORs.
+    The side to move is hashed by XORing the key returned by side().
+    """
+
+    def __init__(self, num_squares: int, colors=('B', 'W'), seed: int = 20240229):
+        """
+        Generates the random keys. The seed is fixed, so that hashes are the
+        same across processes and runs (e.g. for opening books or shared tables)
+        :param num_squares: number of squares of the board
+        :param colors: colors of the pieces
+        :param seed: seed of the random generator
+        """
+        rng = random.Random(seed)
+        self.pieces = {color: [rng.getrandbits(64) for _ in range(num_squares)] for color in colors}
+        self.sides = {color: rng.getrandbits(64) for color in colors}
+
+    def piece(self, square: int, color: str) -> int:
+        """
+        Returns the key of a piece of the given color on the given square
+        :param square: square index
+        :param color:
+        :return: int
+        """
+        return self.pieces[color][square]
+
+    def side(self, color) -> int:
+        """
+        Returns the key of the side to move (0 if color is None, i.e. nobody moves)
+        :param color:
+        :return: int
+        """
+        return self.sides.get(color, 0)
+
+    def hash(self, cells) -> int:
+        """
+        Computes a hash from scratch
+        :param cells: iterable of (square, color) pairs; empty squares may be
+                      included with a color that is not in the table (they are ignored)
+        :return: int
+        """
+        key = 0
+        for square, color in cells:
+            if color in self.pieces:
+                key ^= self.pieces[color][square]
+        return key
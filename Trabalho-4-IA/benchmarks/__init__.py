@@ -0,0 +1,4 @@
+"""
+Benchmarks for the game engines and agents.
+Run them from the project root, e.g.: python -m benchmarks.bitboard
+"""
@@ -0,0 +1,65 @@
+"""
+Random Othello playouts per second: one game at a time (mcts._playout, on GameState)
+against advsearch.your_agent.batch_playout, which plays a batch of games in lockstep
+on bitboards packed into one integer, for several batch sizes.
+
+With --mcts, it also runs one MCTS search per batch size (mcts.PLAYOUT_BATCH) from the
+same position and reports playouts/s, iterations (tree nodes) and the chosen move.
+
+Usage: python -m benchmarks.batch_playout [-b BATCH [BATCH ...]] [-t SECONDS] [--mcts] [--plies PLIES]
+"""
+import argparse
+import random
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent import batch_playout, mcts
+
+
+def rate(play, seconds: float) -> float:
+    """
+    Calls play() (which returns the number of games played) for the given time; returns games per second
+    """
+    games, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        games += play()
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single vs batch random playouts of Othello.')
+    parser.add_argument('-b', '--batch', type=int, nargs='+', default=[1, 10, 100, 1000], help='batch sizes')
+    parser.add_argument('-t', '--time', type=float, default=2.0, help='seconds per measurement')
+    parser.add_argument('--plies', type=int, default=0, help='random plies played before the start position')
+    parser.add_argument('--mcts', action='store_true', help='also time an MCTS search per batch size')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    state = GameState(Board(), Board.BLACK)
+    for _ in range(args.plies):
+        state = state.next_state(rng.choice(sorted(state.legal_moves())))
+
+    def single():
+        mcts._playout(state, rng)
+        return 1
+
+    baseline = rate(single, args.time)
+    print(f'{args.plies} plies played, {state.board.num_pieces(Board.EMPTY)} empty squares')
+    print(f'{"single":>8} {baseline:10.0f} games/s')
+    for size in args.batch:
+        games = rate(lambda: len(batch_playout.playouts(state, size, rng)), args.time)
+        print(f'{size:8d} {games:10.0f} games/s {games / baseline:6.1f}x')
+
+    if args.mcts:
+        print(f'{"batch":>8} {"playouts/s":>10} {"nodes":>8} {"move":>7}')
+        for size in sorted({1, *args.batch}):
+            root = mcts.Node(state)
+            start = time.perf_counter()
+            playouts = mcts.search(root, args.time, rng=rng, batch=size)
+            seconds = time.perf_counter() - start
+            print(f'{size:8d} {playouts / seconds:10.0f} {root.size():8d} {str(mcts.best_move(root)):>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares the nodes per second of minimax_move with the default Board
+and with the BitBoard backend on the fixed position suite.
+Node counts may differ a bit between the backends, because their
+legal move sets are iterated in different orders (which changes pruning).
+
+Usage: python -m benchmarks.bitboard [-d DEPTH] [-e {count,mask,custom}]
+"""
+import argparse
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_count import evaluate_count
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+from advsearch.your_agent.othello_minimax_custom import evaluate_custom
+
+from benchmarks.positions import suite
+
+EVALUATIONS = {'count': evaluate_count, 'mask': evaluate_mask, 'custom': evaluate_custom}
+
+
+def run(board_class, depth: int, eval_func) -> tuple:
+    """
+    Searches every position of the suite and returns (nodes, seconds)
+    """
+    nodes, elapsed = 0, 0.0
+    for state in suite(board_class):
+        stats = {}
+        start = time.perf_counter()
+        minimax_move(state, depth, eval_func, stats)
+        elapsed += time.perf_counter() - start
+        nodes += stats['nodes']
+    return nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Board vs BitBoard nodes per second in minimax_move.')
+    parser.add_argument('-d', '--depth', type=int, default=3, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='count', help='evaluation function')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    for board_class in (Board, BitBoard):
+        nodes, elapsed = run(board_class, args.depth, eval_func)
+        print(f'{board_class.__name__:8s} nodes={nodes:8d} time={elapsed:7.2f}s nodes/s={nodes / elapsed:10.0f}')
+        if board_class is Board:
+            base_nps = nodes / elapsed
+    print(f'speedup: {nodes / elapsed / base_nps:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
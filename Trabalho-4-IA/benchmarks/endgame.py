@@ -0,0 +1,78 @@
+"""
+Solve times of the endgame solver (advsearch.your_agent.endgame) on a standard set
+of endgame positions: seeded random games stopped with 8, 10, 12, 14 and 16 empty squares.
+
+For each position the benchmark reports the win/loss/draw (WLD) search and the exact
+search separately (the exact search reuses the transposition table of the WLD search,
+as in solve_move), and checks the exact value against the recorded one.
+
+Usage: python -m benchmarks.endgame [-e MAX_EMPTIES] [-n PER_EMPTIES]
+"""
+import argparse
+import sys
+import time
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.your_agent.endgame import EndgameTable, solve_move
+
+from benchmarks.positions import random_position
+
+# empties -> perfect-play disc difference (for the player to move) of
+# random_position(60 - empties, seed) for seeds 0, 1, 2, ...
+ENDGAME_VALUES = {
+    8: [-40, -2, 14, 10],
+    10: [-8, -2, 18, 8],
+    12: [-8, -16, 48, 14],
+    14: [-6, 30, 44, 34],
+    16: [4, 28, 36, 38],
+}
+
+
+def endgame_suite(max_empties: int = 16, per_empties: int = 4) -> list:
+    """
+    Returns the endgame positions as a list of (empties, seed, state, value)
+    """
+    return [(empties, seed, random_position(60 - empties, seed, board_class=BitBoard), values[seed])
+            for empties, values in sorted(ENDGAME_VALUES.items()) if empties <= max_empties
+            for seed in range(min(per_empties, len(values)))]
+
+
+def solve(state) -> tuple:
+    """
+    Returns (WLD seconds, exact seconds, nodes, exact value) of solving state
+    """
+    table = EndgameTable()
+    wld_stats, start = {}, time.perf_counter()
+    solve_move(state, stats=wld_stats, exact=False, table=table)
+    wld_time = time.perf_counter() - start
+
+    stats, start = {}, time.perf_counter()
+    solve_move(state, stats=stats, table=table)
+    return wld_time, time.perf_counter() - start, wld_stats['nodes'] + stats['nodes'], stats['value']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve times of the endgame solver.')
+    parser.add_argument('-e', '--max-empties', type=int, default=14, help='largest number of empty squares')
+    parser.add_argument('-n', '--per-empties', type=int, default=4, help='positions per number of empty squares')
+    args = parser.parse_args()
+
+    print(f'{"empties":>7} {"seed":>4} {"value":>5} {"WLD s":>8} {"exact s":>8} {"total s":>8} {"nodes":>9} {"nodes/s":>8}')
+    ok = True
+    worst = {}
+    for empties, seed, state, expected in endgame_suite(args.max_empties, args.per_empties):
+        wld_time, exact_time, nodes, value = solve(state)
+        total = wld_time + exact_time
+        worst[empties] = max(worst.get(empties, 0.0), total)
+        check = '' if value == expected else f'  MISMATCH (expected {expected})'
+        ok = ok and not check
+        print(f'{empties:7d} {seed:4d} {value:5d} {wld_time:8.3f} {exact_time:8.3f} {total:8.3f} '
+              f'{nodes:9d} {nodes / max(total, 1e-9):8.0f}{check}')
+
+    print('worst total time by empties: ' + ', '.join(f'{e}: {t:.2f}s' for e, t in sorted(worst.items())))
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
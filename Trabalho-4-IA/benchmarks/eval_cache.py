@@ -0,0 +1,89 @@
+"""
+Measures the effect of the LRU evaluation cache (EvalCache) on iterative deepening
+searches, for each heuristic: time with and without the cache, cache hit rate and evictions.
+
+Two scenarios:
+- suite: each position of the fixed suite is searched with a new cache, shared only
+  by the iterations of that search;
+- game: the first plies of a self-play game are searched with one cache kept across
+  the moves, as an agent keeping the cache between make_move calls would.
+
+Usage: python -m benchmarks.eval_cache [-d DEPTH] [-s MAX_ENTRIES] [-p PLIES]
+"""
+import argparse
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.eval_cache import EvalCache
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+def search(state, eval_func, depth: int) -> tuple:
+    """
+    Returns (move, root value, seconds) of an iterative deepening search up to depth
+    """
+    stats, start = {}, time.perf_counter()
+    move = iterative_deepening_move(state, eval_func, float('inf'), max_depth=depth,
+                                    orderer=MoveOrderer(OTHELLO_PRIOR), stats=stats)
+    return move, stats['value'], time.perf_counter() - start
+
+
+def run_suite(eval_func, depth: int, size: int) -> tuple:
+    """
+    Returns (seconds, values) without cache, (seconds, values) with cache and the caches
+    """
+    results, caches = [], []
+    for use_cache in (False, True):
+        elapsed, values = 0.0, []
+        for state in suite():
+            cached = EvalCache(eval_func, size)
+            caches.append(cached)
+            _, value, seconds = search(state, cached if use_cache else eval_func, depth)
+            elapsed, values = elapsed + seconds, values + [value]
+        results.append((elapsed, values))
+    return results[0], results[1], caches[len(caches) // 2:]
+
+
+def run_game(eval_func, depth: int, size: int, plies: int) -> tuple:
+    """
+    Same as run_suite, on consecutive positions of a game with a single cache
+    """
+    cached = EvalCache(eval_func, size)
+    results = []
+    for use_cache in (False, True):
+        state, elapsed, values = GameState(Board(), 'B'), 0.0, []
+        for _ in range(plies):
+            if state.is_terminal():
+                break
+            move, value, seconds = search(state, cached if use_cache else eval_func, depth)
+            elapsed, values = elapsed + seconds, values + [value]
+            state = state.next_state(move)
+        results.append((elapsed, values))
+    return results[0], results[1], [cached]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search time with and without the evaluation cache.')
+    parser.add_argument('-d', '--depth', type=int, default=4, help='search depth')
+    parser.add_argument('-s', '--size', type=int, default=1 << 16, help='maximum number of cache entries')
+    parser.add_argument('-p', '--plies', type=int, default=20, help='plies of the game scenario')
+    args = parser.parse_args()
+
+    for name, eval_func in sorted(EVALUATIONS.items()):
+        for scenario, (plain, cached, caches) in (
+                ('suite', run_suite(eval_func, args.depth, args.size)),
+                ('game', run_game(eval_func, args.depth, args.size, args.plies))):
+            hits, misses = sum(c.hits for c in caches), sum(c.misses for c in caches)
+            evictions = sum(c.evictions for c in caches)
+            print(f'{name:6s} {scenario:5s} plain={plain[0]:6.2f}s cached={cached[0]:6.2f}s '
+                  f'({cached[0] / plain[0]:4.2f}) hit rate={hits / (hits + misses):6.1%} '
+                  f'evictions={evictions:7d} same values: {plain[1] == cached[1]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Measures the leaf evaluations per second of the three heuristics, through the
+native fast path (reading the Othello Board directly) and through the reflective
+grid extraction used for foreign state objects, on the fixed position suite.
+Both paths must return the same scores.
+
+Usage: python -m benchmarks.evaluation [-t SECONDS]
+"""
+import argparse
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+class ForeignState(object):
+    """
+    Wraps a GameState so that the heuristics can't recognize its board:
+    the board is only available through str(), as for an unknown state class.
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    @property
+    def player(self):
+        return self.state.player
+
+    @player.setter
+    def player(self, player):
+        self.state.player = player
+
+    def is_terminal(self):
+        return self.state.is_terminal()
+
+    def legal_moves(self):
+        return self.state.legal_moves()
+
+    def copy(self):
+        return ForeignState(self.state.copy())
+
+    def __str__(self):
+        return str(self.state.board)
+
+
+def evaluations_per_second(eval_func, states, seconds: float) -> float:
+    """
+    Evaluates every state for both players repeatedly for the given time
+    """
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for state in states:
+            eval_func(state, 'B')
+            eval_func(state, 'W')
+        count += 2 * len(states)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Leaf evaluations per second, native vs reflective.')
+    parser.add_argument('-t', '--time', type=float, default=1.0, help='seconds per measurement')
+    args = parser.parse_args()
+
+    for board_class in (Board, BitBoard):
+        states = suite(board_class)
+        foreign = [ForeignState(state) for state in states]
+        for name, eval_func in sorted(EVALUATIONS.items()):
+            same = all(eval_func(s, p) == eval_func(f, p) for s, f in zip(states, foreign) for p in 'BW')
+            reflective = evaluations_per_second(eval_func, foreign, args.time)
+            native = evaluations_per_second(eval_func, states, args.time)
+            print(f'{board_class.__name__:8s} {name:6s} reflective={reflective:9.0f}/s native={native:9.0f}/s '
+                  f'speedup={native / reflective:6.1f} same scores: {same}')
+
+
+if __name__ == '__main__':
+    main()
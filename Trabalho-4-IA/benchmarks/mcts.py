@@ -0,0 +1,47 @@
+"""
+Plays a self-play game with the MCTS agent (advsearch.your_agent.mcts) and reports,
+for each move, the playouts per second, the tree size at the end of the search and
+how many nodes were reused from the previous move.
+
+Both colors are played by the same agent module, so each move finds the new
+position among the children of the previous root and reuses its subtree (in a
+server match, the agent finds it among the grandchildren, after the opponent's move).
+
+Usage: python -m benchmarks.mcts [-g {othello,tttm}] [-t SECONDS] [-m MOVES]
+"""
+import argparse
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+from advsearch.your_agent import mcts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-move statistics of the MCTS agent in a self-play game.')
+    parser.add_argument('-g', '--game', choices=['othello', 'tttm'], default='othello', help='game')
+    parser.add_argument('-t', '--time', type=float, default=mcts.TIME_BUDGET, help='time budget per move (s)')
+    parser.add_argument('-m', '--moves', type=int, default=10, help='number of moves to play')
+    args = parser.parse_args()
+
+    mcts.TIME_BUDGET = args.time
+    if args.game == 'othello':
+        state = GameState(Board(), Board.BLACK)
+    else:
+        state = TTTMGameState(TTTMBoard(), 'B')
+
+    print(f'{"move":>4} {"player":>6} {"played":>7} {"playouts":>9} {"playouts/s":>10} {"tree":>8} {"reused":>8}')
+    for number in range(1, args.moves + 1):
+        if state.is_terminal():
+            break
+        player = state.player
+        move = mcts.make_move(state)
+        stats = mcts.last_stats
+        print(f'{number:4d} {player:>6} {str(move):>7} {stats["playouts"]:9d} {stats["playouts_per_second"]:10.0f} '
+              f'{stats["tree_size"]:8d} {stats["reused"]:8d}')
+        state = state.next_state(move)
+
+
+if __name__ == '__main__':
+    main()
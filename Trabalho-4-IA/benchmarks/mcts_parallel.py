@@ -0,0 +1,63 @@
+"""
+Win rate of the root-parallel MCTS (advsearch.your_agent.mcts_parallel) against the
+single-process MCTS at equal wall-clock time per move, as the number of worker
+processes grows. Each pairing plays Othello games alternating colors; a draw counts
+as half a win. The speedup can only show up with as many free cores as workers.
+
+Usage: python -m benchmarks.mcts_parallel [-w WORKERS [WORKERS ...]] [-n GAMES] [-t SECONDS]
+"""
+import argparse
+import os
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent import mcts, mcts_parallel
+
+
+def play(parallel_color: str, workers: int, time_budget: float) -> tuple:
+    """
+    Plays one game; returns (winner, parallel playouts, single playouts)
+    """
+    mcts.TIME_BUDGET = time_budget
+    mcts._root = None
+    state = GameState(Board(), Board.BLACK)
+    playouts = {True: 0, False: 0}
+    while not state.is_terminal():
+        parallel = state.player == parallel_color
+        mcts.PARALLEL_WORKERS = workers if parallel else 0
+        move = mcts.make_move(state)
+        playouts[parallel] += mcts.last_stats['playouts']
+        state = state.next_state(move)
+    return state.winner(), playouts[True], playouts[False]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Root-parallel MCTS vs single-process MCTS at equal time.')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4], help='worker counts')
+    parser.add_argument('-n', '--games', type=int, default=4, help='games per worker count')
+    parser.add_argument('-t', '--time', type=float, default=0.5, help='time budget per move (s)')
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} cores, {args.time}s per move')
+    try:
+        for workers in args.workers:
+            mcts_parallel.get_pool(workers)  # inicia os processos antes da primeira jogada
+            score, parallel_playouts, single_playouts = 0.0, 0, 0
+            start = time.perf_counter()
+            for game in range(args.games):
+                parallel_color = Board.BLACK if game % 2 == 0 else Board.WHITE
+                winner, parallel, single = play(parallel_color, workers, args.time)
+                score += 1.0 if winner == parallel_color else 0.5 if winner is None else 0.0
+                parallel_playouts += parallel
+                single_playouts += single
+            print(f'{workers:2d} workers: win rate {score / args.games:5.2f} ({score}/{args.games}), '
+                  f'playouts parallel/single {parallel_playouts / max(single_playouts, 1):5.2f}, '
+                  f'{time.perf_counter() - start:6.1f}s')
+    finally:
+        mcts.PARALLEL_WORKERS = 0
+        mcts_parallel.shutdown_pool()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Compares the two MCTS tree stores of advsearch.your_agent.mcts: objects (one Node
+holding its GameState per node) and columns (mcts_tree.ArrayTree, where positions
+are replayed from the root).
+
+For each game, both trees are grown with the same number of playouts from the
+initial position, then the script reports:
+- bytes per node (tracemalloc while growing the tree, playouts included but freed)
+  and playouts per second (growing the tree again without tracemalloc);
+- selection steps per second: descents from the root to a leaf, counted per edge.
+  The object tree only follows child links. The column tree is measured twice:
+  with the index walk alone, and with mcts_tree.descend, which also replays
+  the moves on a copy of the root state.
+
+Usage: python -m benchmarks.mcts_tree [-g {othello,tttm}] [-p PLAYOUTS] [-s SELECTIONS]
+"""
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+from advsearch.your_agent import mcts, mcts_tree
+
+
+def grow(build, playouts: int) -> tuple:
+    """
+    Returns (tree, bytes allocated and still held after build(playouts))
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = build(playouts)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return tree, held
+
+
+def object_selection(root, selections: int) -> float:
+    """
+    Returns the selection steps per second of the object tree
+    """
+    steps, start = 0, time.perf_counter()
+    for _ in range(selections):
+        node = root
+        while not node.untried and node.children:
+            node = mcts._select_child(node, mcts.EXPLORATION)
+            steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def index_selection(tree, selections: int) -> float:
+    """
+    Returns the selection steps per second of the column tree, walking indices only
+    """
+    visits, wins, flags = tree.visits, tree.wins, tree.flags
+    first_child, next_sibling = tree.first_child, tree.next_sibling
+    steps, start = 0, time.perf_counter()
+    for _ in range(selections):
+        node = 0
+        while flags[node] & mcts_tree.EXPANDED:
+            log_visits = math.log(visits[node])
+            best, best_value = mcts_tree.NO_NODE, -1.0
+            child = first_child[node]
+            while child != mcts_tree.NO_NODE:
+                if not visits[child]:
+                    best = child
+                    break
+                value = wins[child] / visits[child] + mcts.EXPLORATION * math.sqrt(log_visits / visits[child])
+                if value > best_value:
+                    best, best_value = child, value
+                child = next_sibling[child]
+            node = best
+            steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def replay_selection(tree, selections: int) -> float:
+    """
+    Returns the selection steps per second of mcts_tree.descend (indices and state replay);
+    descend may expand the leaf it reaches, as in the search
+    """
+    rng = random.Random(1)
+    steps, start = 0, time.perf_counter()
+    for _ in range(selections):
+        path, _, _ = mcts_tree.descend(tree, mcts.EXPLORATION, rng)
+        steps += len(path) - 1
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Object vs column MCTS tree: memory and selection speed.')
+    parser.add_argument('-g', '--game', choices=['othello', 'tttm'], default='tttm', help='game')
+    parser.add_argument('-p', '--playouts', type=int, default=20000, help='playouts used to grow each tree')
+    parser.add_argument('-s', '--selections', type=int, default=20000, help='descents timed')
+    args = parser.parse_args()
+
+    if args.game == 'othello':
+        state = GameState(Board(), Board.BLACK)
+    else:
+        state = TTTMGameState(TTTMBoard(), 'B')
+
+    def build_objects(playouts):
+        root = mcts.Node(state.copy())
+        mcts.search(root, float('inf'), rng=random.Random(0), max_playouts=playouts)
+        return root
+
+    def build_columns(playouts):
+        tree = mcts_tree.ArrayTree(state.copy())
+        mcts_tree.search(tree, float('inf'), rng=random.Random(0), max_playouts=playouts)
+        return tree
+
+    # once under tracemalloc for the memory, once without it for the speed
+    _, object_bytes = grow(build_objects, args.playouts)
+    _, column_bytes = grow(build_columns, args.playouts)
+    start = time.perf_counter()
+    root = build_objects(args.playouts)
+    object_time = time.perf_counter() - start
+    object_nodes = root.size()
+    start = time.perf_counter()
+    tree = build_columns(args.playouts)
+    column_time = time.perf_counter() - start
+
+    print(f'{args.game}, {args.playouts} playouts')
+    print(f'objects: {object_nodes:8d} nodes {object_bytes / object_nodes:8.0f} bytes/node '
+          f'{args.playouts / object_time:8.0f} playouts/s '
+          f'{object_selection(root, args.selections):10.0f} selection steps/s')
+    print(f'columns: {len(tree):8d} nodes {column_bytes / len(tree):8.0f} bytes/node '
+          f'({tree.nbytes() / len(tree):.0f} in the columns, with the unused chunk) '
+          f'{args.playouts / column_time:8.0f} playouts/s '
+          f'{index_selection(tree, args.selections):10.0f} selection steps/s (indices), '
+          f'{replay_selection(tree, args.selections):10.0f} (with replay)')
+
+
+if __name__ == '__main__':
+    main()
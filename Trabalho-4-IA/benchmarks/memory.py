@@ -0,0 +1,62 @@
+"""
+Measures the memory taken by each stored Othello position (GameState and its board),
+as in the node pool of a search tree: the positions of random games are generated
+with next_state and kept alive, and tracemalloc reports the bytes allocated per position.
+The positions are measured twice: as created by next_state (legal move caches filled
+by the player switch) and after dropping the caches.
+
+Usage: python -m benchmarks.memory [-n POSITIONS]
+"""
+import argparse
+import random
+import tracemalloc
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+
+
+def generate(count: int, board_class) -> list:
+    """
+    Returns 'count' positions from seeded random games (terminal positions excluded)
+    """
+    rng = random.Random(7)
+    positions, state = [], GameState(board_class(), Board.BLACK)
+    while len(positions) < count:
+        if state.is_terminal():
+            state = GameState(board_class(), Board.BLACK)
+        state = state.next_state(rng.choice(sorted(state.legal_moves())))
+        positions.append(state)
+    return positions
+
+
+def bytes_per_position(count: int, board_class, drop_caches: bool) -> float:
+    """
+    Returns the bytes allocated per position kept alive
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    positions = generate(count, board_class)
+    if drop_caches:
+        for state in positions:
+            state.board._legal_moves[Board.BLACK] = state.board._legal_moves[Board.WHITE] = None
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del positions
+    return allocated / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bytes per stored GameState.')
+    parser.add_argument('-n', '--positions', type=int, default=20000, help='number of positions')
+    args = parser.parse_args()
+
+    for board_class in (Board, BitBoard):
+        with_caches = bytes_per_position(args.positions, board_class, False)
+        without_caches = bytes_per_position(args.positions, board_class, True)
+        print(f'{board_class.__name__:8s} bytes/position: {with_caches:7.0f} with move caches, '
+              f'{without_caches:7.0f} without')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Reports the nodes expanded by a fixed-depth alpha-beta search with
+different move ordering heuristics on the fixed position suite, and checks
+that every configuration finds the same minimax value.
+
+Usage: python -m benchmarks.move_ordering [-d DEPTH] [-e {count,mask,custom}]
+"""
+import argparse
+
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.transposition import TranspositionTable
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+def fixed_depth(orderer_factory):
+    """
+    Returns a runner that searches each position at a fixed depth with a new orderer
+    """
+    def run(state, depth, eval_func, stats):
+        minimax_move(state, depth, eval_func, stats, orderer=orderer_factory())
+    return run
+
+
+def deepening(state, depth, eval_func, stats):
+    """
+    Iterative deepening up to depth, with transposition table (hash move first),
+    killers, history and static prior. Counts the nodes of all iterations.
+    """
+    iterative_deepening_move(state, eval_func, float('inf'), max_depth=depth, stats=stats,
+                             tt=TranspositionTable(), orderer=MoveOrderer(OTHELLO_PRIOR))
+
+
+CONFIGS = [
+    ('no ordering', fixed_depth(lambda: None)),
+    ('static prior', fixed_depth(lambda: MoveOrderer(OTHELLO_PRIOR, use_killers=False, use_history=False))),
+    ('killers+history', fixed_depth(lambda: MoveOrderer(None))),
+    ('prior+killers+history', fixed_depth(lambda: MoveOrderer(OTHELLO_PRIOR))),
+    ('iterative deepening (all)', deepening),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Node counts of alpha-beta with and without move ordering.')
+    parser.add_argument('-d', '--depth', type=int, default=4, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='mask', help='evaluation function')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    positions = suite()
+    reference = None
+    for name, run in CONFIGS:
+        nodes, values = 0, []
+        for state in positions:
+            stats = {}
+            run(state, args.depth, eval_func, stats)
+            nodes += stats['nodes']
+            values.append(stats['value'])
+        if reference is None:
+            reference = (nodes, values)
+        print(f'{name:26s} nodes={nodes:8d} ({nodes / reference[0]:5.2f}) same values: {values == reference[1]}')
+
+
+if __name__ == '__main__':
+    main()
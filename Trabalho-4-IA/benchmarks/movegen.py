@@ -0,0 +1,118 @@
+"""
+Compares the time per node of minimax_move with the combined legal move generation
+of Board (both colors in one pass, filling both caches) and with the previous
+per-color generation, in which has_legal_move rescanned the board without using
+the cache and legal_moves generated each color separately.
+Both must return the same moves. Node counts may differ a bit, because the same
+move set built in a different order is iterated in a different order (which changes pruning).
+
+Usage: python -m benchmarks.movegen [-d DEPTH] [-e {count,mask,custom}]
+"""
+import argparse
+import time
+
+from advsearch.othello.board import Board, CODES, EMPTY_CODE
+from advsearch.your_agent.minimax import minimax_move
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+class SeparateBoard(Board):
+    """
+    Board with the per-color legal move generation used before the combined pass
+    """
+    __slots__ = ()
+
+    def copy(self) -> 'SeparateBoard':
+        b = Board.copy(self)
+        b.__class__ = SeparateBoard
+        return b
+
+    def legal_moves(self, color: str) -> set:
+        if self._legal_moves[color] is None:
+            self._legal_moves[color] = set()
+            if self.piece_count[color] > self.piece_count[self.EMPTY]:
+                self.find_legal_moves_dense(color)
+            else:
+                self.find_legal_moves_sparse(color)
+        return self._legal_moves[color]
+
+    def find_legal_moves_dense(self, color):
+        """
+        Finds the legal moves for a given color in a dense board.
+        A dense board has less empty tiles than pieces of the given color.
+        :param color:
+        """
+        # test if every empty tile on the board is a legal move
+        tiles = [(i >> 3, i & 7) for i, cell in enumerate(self.cells) if cell == EMPTY_CODE]
+
+        for x, y in tiles:
+            # performs the 'inline' any:
+            for direc in self.DIRECTIONS:
+                if self.find_bracket((x, y), color, direc):
+                    # flips x,y because of the way tiles are stored and the x,y coords in real world
+                    self._legal_moves[color].add((y,x))
+                    break
+
+    def find_legal_moves_sparse(self, color):
+        """
+        Finds the legal moves for a given color in a sparse board.
+        A sparse board has more empty tiles than pieces of the given color
+        :param color:
+        :return:
+        """
+        # test if every tile of the given color starts a run that ends in a legal move
+        tiles = [(i >> 3, i & 7) for i, cell in enumerate(self.cells) if cell == CODES[color]]
+
+        for y, x in tiles:
+            for direc in self.DIRECTIONS:
+                move_yx = self.find_where_to_play_from_owned((y, x), color, direc)
+                if move_yx:
+                    # flips x,y because of matrix indexing vs board coords
+                    m_y, m_x = move_yx
+                    self._legal_moves[color].add((m_x, m_y))
+
+    def has_legal_move(self, color):
+        grid = self.tiles
+        tiles = [(x, y) for x in range(8) for y in range(8) if grid[x][y] == self.EMPTY]
+        for x, y in tiles:
+            hasbracket = lambda direction: self.find_bracket((x, y), color, direction)
+            if grid[x][y] == self.EMPTY and any(map(hasbracket, self.DIRECTIONS)):
+                return True
+        return False
+
+
+def run(board_class, depth: int, eval_func, inplace: bool) -> tuple:
+    """
+    Searches every position of the suite and returns (moves, nodes, seconds)
+    """
+    moves, nodes, elapsed = [], 0, 0.0
+    for state in suite():
+        state.board.__class__ = board_class
+        stats = {}
+        start = time.perf_counter()
+        moves.append(minimax_move(state, depth, eval_func, stats, inplace=inplace))
+        elapsed += time.perf_counter() - start
+        nodes += stats['nodes']
+    return moves, nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time per node of minimax_move with combined and per-color move generation.')
+    parser.add_argument('-d', '--depth', type=int, default=3, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='count', help='evaluation function')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    for inplace in (False, True):
+        mode = 'apply/undo' if inplace else 'next_state'
+        base_moves, base_nodes, base_time = run(SeparateBoard, args.depth, eval_func, inplace)
+        moves, nodes, elapsed = run(Board, args.depth, eval_func, inplace)
+        print(f'{mode:10s} per-color: {base_time / base_nodes * 1e6:6.1f}us/node  '
+              f'combined: {elapsed / nodes * 1e6:6.1f}us/node  speedup: {base_time / elapsed:.2f}x  '
+              f'nodes={base_nodes}/{nodes} same moves: {moves == base_moves}')
+
+
+if __name__ == '__main__':
+    main()
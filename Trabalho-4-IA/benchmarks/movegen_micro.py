@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of the Board primitives on random mid-game positions:
+legal move generation (legal_moves of both colors on a board with an empty cache)
+and move execution (process_move on a copy, for every legal move).
+
+Usage: python -m benchmarks.movegen_micro [-n POSITIONS] [-t SECONDS]
+"""
+import argparse
+import time
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.board import Board
+
+from benchmarks.positions import random_position
+
+
+def positions(count: int, board_class=Board) -> list:
+    """
+    Returns the boards of 'count' random positions between plies 16 and 40
+    """
+    states = [random_position(16 + i % 25, 1000 + i, board_class) for i in range(count)]
+    return [state.board for state in states if not state.is_terminal()]
+
+
+def legal_moves_per_second(boards: list, seconds: float) -> float:
+    """
+    Generates the legal moves of both colors of every board, from an empty cache
+    """
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for board in boards:
+            board._legal_moves[Board.BLACK] = board._legal_moves[Board.WHITE] = None
+            board.legal_moves(Board.BLACK)
+            board.legal_moves(Board.WHITE)
+        count += len(boards)
+    return count / (time.perf_counter() - start)
+
+
+def process_move_per_second(boards: list, seconds: float) -> float:
+    """
+    Executes every legal move of both colors on copies of the boards.
+    The copies are made outside the timed section.
+    """
+    jobs = [(board, move, color) for board in boards
+            for color in (Board.BLACK, Board.WHITE) for move in sorted(board.legal_moves(color))]
+    count, elapsed = 0, 0.0
+    while elapsed < seconds:
+        copies = [(board.copy(), move, color) for board, move, color in jobs]
+        start = time.perf_counter()
+        for copy, move, color in copies:
+            copy.process_move(move, color)
+        elapsed += time.perf_counter() - start
+        count += len(copies)
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of legal_moves and process_move.')
+    parser.add_argument('-n', '--positions', type=int, default=200, help='number of random positions')
+    parser.add_argument('-t', '--time', type=float, default=2.0, help='seconds per measurement')
+    args = parser.parse_args()
+
+    for board_class in (Board, BitBoard):
+        boards = positions(args.positions, board_class)
+        print(f'{board_class.__name__:8s} legal_moves (both colors): {legal_moves_per_second(boards, args.time):9.0f}/s  '
+              f'process_move: {process_move_per_second(boards, args.time):9.0f}/s')
+
+
+if __name__ == '__main__':
+    main()
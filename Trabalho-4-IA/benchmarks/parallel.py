@@ -0,0 +1,56 @@
+"""
+Measures the speedup of the root-parallel search (parallel_move) over the serial
+alpha-beta search, for increasing numbers of worker processes, on the fixed position suite.
+Both searches use iterative deepening up to the same depth and the same move ordering.
+
+The speedup is bounded by the number of cores of the machine (os.cpu_count()).
+
+Usage: python -m benchmarks.parallel [-d DEPTH] [-e {count,mask,custom}] [-w WORKERS ...]
+"""
+import argparse
+import os
+import time
+
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.parallel import parallel_move, get_pool, shutdown_pool
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serial vs root-parallel search on the position suite.')
+    parser.add_argument('-d', '--depth', type=int, default=5, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='mask', help='evaluation function')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='worker counts to test')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    positions = suite()
+    print(f'cores: {os.cpu_count()}')
+
+    nodes, start = 0, time.perf_counter()
+    for state in positions:
+        stats = {}
+        iterative_deepening_move(state, eval_func, float('inf'), max_depth=args.depth, search=minimax_move,
+                                 orderer=MoveOrderer(OTHELLO_PRIOR), stats=stats)
+        nodes += stats['nodes']
+    serial = time.perf_counter() - start
+    print(f'{"serial":10s} nodes={nodes:8d} time={serial:6.2f}s')
+
+    for workers in args.workers:
+        get_pool(workers)  # start the processes outside the measurement
+        nodes, start = 0, time.perf_counter()
+        for state in positions:
+            stats = {}
+            parallel_move(state, eval_func, float('inf'), workers=workers, max_depth=args.depth, stats=stats)
+            nodes += stats['nodes']
+        elapsed = time.perf_counter() - start
+        print(f'{workers:2d} workers nodes={nodes:8d} time={elapsed:6.2f}s speedup={serial / elapsed:5.2f}')
+    shutdown_pool()
+
+
+if __name__ == '__main__':
+    main()
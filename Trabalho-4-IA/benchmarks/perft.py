@@ -0,0 +1,162 @@
+"""
+Perft: counts the positions reached after exactly N moves, to check the move
+generators of Othello (advsearch.othello) and Tic-Tac-Toe Misere (advsearch.tttm)
+and to measure their speed.
+
+The counts follow the rules of GameState.next_state: in Othello a player without
+moves passes implicitly (next_state gives the turn back to the other player, so a
+pass is not a move); terminal positions before depth N are not counted, nor expanded.
+Othello positions are searched with apply/undo when the state supports it.
+
+The counts from the initial positions are checked against the published values, and
+the counts from the stored positions against values recorded from this implementation
+(agreeing between Board and BitBoard).
+
+Usage: python -m benchmarks.perft [-g {othello,tttm}] [-d DEPTH] [-b {board,bitboard}]
+                                  [--divide] [--stored]
+"""
+import argparse
+import sys
+import time
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+
+from benchmarks.positions import random_position
+
+# leaf counts from the initial position, by depth (index 0 is depth 1)
+OTHELLO_REFERENCE = [4, 12, 56, 244, 1396, 8200, 55092, 390216]
+TTTM_REFERENCE = [9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872]
+
+# stored Othello positions: (plies, seed) of benchmarks.positions.random_position and the counts
+OTHELLO_STORED = [
+    ((20, 4), [9, 113, 1048, 13016]),
+    ((30, 11), [11, 158, 1572, 21000]),
+    ((44, 23), [10, 75, 687, 4634]),
+    ((52, 31), [6, 22, 88, 295]),
+]
+
+# stored Tic-Tac-Toe Misere positions: (board, player to move) and the counts
+TTTM_STORED = [
+    (('B..\n.W.\n...', 'B'), [7, 42, 210, 760, 1944]),
+    (('BW.\n.B.\nW..', 'B'), [5, 16, 48, 60, 52]),
+]
+
+
+def perft(state, depth: int) -> int:
+    """
+    Returns the number of positions reached from state after exactly 'depth' moves
+    :param state: GameState of either game
+    :param depth: number of moves
+    :return: int
+    """
+    if depth == 0:
+        return 1
+    if state.is_terminal():
+        return 0
+    moves = state.legal_moves()
+    if depth == 1:
+        return len(moves)  # bulk counting: every move reaches a position
+    nodes = 0
+    if hasattr(state, 'apply'):
+        for move in moves:
+            record = state.apply(move)
+            nodes += perft(state, depth - 1)
+            state.undo(record)
+    else:
+        for move in moves:
+            nodes += perft(state.next_state(move), depth - 1)
+    return nodes
+
+
+def divide(state, depth: int) -> dict:
+    """
+    Returns the perft count below each root move (move -> count), for depth >= 1
+    """
+    return {move: perft(state.next_state(move), depth - 1) for move in sorted(state.legal_moves())}
+
+
+def othello_initial(board_class=Board) -> GameState:
+    """
+    Returns the initial Othello position, with black to move
+    """
+    return GameState(board_class(), Board.BLACK)
+
+
+def tttm_initial() -> TTTMGameState:
+    """
+    Returns the initial Tic-Tac-Toe Misere position, with black to move
+    """
+    return TTTMGameState(TTTMBoard(), 'B')
+
+
+def stored_positions(game: str, board_class=Board) -> list:
+    """
+    Returns the stored positions of a game as a list of (name, state, counts)
+    """
+    if game == 'othello':
+        return [(f'random_position{key}', random_position(*key, board_class=board_class), counts)
+                for key, counts in OTHELLO_STORED]
+    return [(repr(board), TTTMGameState(TTTMBoard.from_string(board), player), counts)
+            for (board, player), counts in TTTM_STORED]
+
+
+def run(name: str, state, depth: int, reference: list) -> bool:
+    """
+    Runs perft from 1 to depth, printing counts, speed and the check against the
+    reference counts (depths beyond the reference are not checked).
+    Returns whether all checked counts match.
+    """
+    print(name)
+    ok = True
+    for d in range(1, depth + 1):
+        start = time.perf_counter()
+        nodes = perft(state, d)
+        elapsed = time.perf_counter() - start
+        if d <= len(reference):
+            match = nodes == reference[d - 1]
+            ok = ok and match
+            check = 'ok' if match else f'MISMATCH (expected {reference[d - 1]})'
+        else:
+            check = 'unchecked'
+        print(f'  depth {d:2d}: {nodes:10d} nodes {elapsed:8.3f}s {nodes / max(elapsed, 1e-9):10.0f} nodes/s  {check}')
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perft of the Othello and Tic-Tac-Toe Misere move generators.')
+    parser.add_argument('-g', '--game', choices=['othello', 'tttm'], default='othello', help='game')
+    parser.add_argument('-d', '--depth', type=int, default=None,
+                        help='maximum depth (default: 6 for othello, 9 for tttm); stored positions stop at their recorded counts')
+    parser.add_argument('-b', '--board', choices=['board', 'bitboard'], default='board', help='othello backend')
+    parser.add_argument('--divide', action='store_true', help='print the count below each root move at the given depth')
+    parser.add_argument('--stored', action='store_true', help='also run the stored positions')
+    args = parser.parse_args()
+
+    board_class = BitBoard if args.board == 'bitboard' else Board
+    if args.game == 'othello':
+        initial, reference, default_depth = othello_initial(board_class), OTHELLO_REFERENCE, 6
+    else:
+        initial, reference, default_depth = tttm_initial(), TTTM_REFERENCE, 9
+    depth = args.depth if args.depth is not None else default_depth
+
+    if args.divide:
+        counts = divide(initial, depth)
+        for move, count in counts.items():
+            print(f'{move}: {count}')
+        print(f'total: {sum(counts.values())}')
+        return
+
+    ok = run(f'{args.game} initial position', initial, depth, reference)
+    if args.stored:
+        for name, state, counts in stored_positions(args.game, board_class):
+            ok = run(name, state, min(depth, len(counts)), counts) and ok
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
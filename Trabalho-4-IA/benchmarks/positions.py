@@ -0,0 +1,41 @@
+"""
+Fixed suite of Othello positions shared by the benchmarks.
+The positions are obtained by playing seeded random games from the
+initial board, so they are the same on every run and every machine.
+"""
+import random
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+
+
+def random_position(plies: int, seed: int, board_class=Board) -> GameState:
+    """
+    Plays 'plies' random moves from the initial position.
+    Moves are drawn from the sorted list of legal moves, so the result
+    only depends on the seed.
+    :param plies: number of moves to play
+    :param seed: random seed
+    :param board_class: Board or another backend with the same interface
+    :return: GameState (may be terminal if the game ended earlier)
+    """
+    rng = random.Random(seed)
+    state = GameState(board_class(), Board.BLACK)
+    for _ in range(plies):
+        if state.is_terminal():
+            break
+        state = state.next_state(rng.choice(sorted(state.legal_moves())))
+    return state
+
+
+# (plies, seed) of the positions in the suite: openings, middle games and early endgames
+SUITE = [(8, 1), (12, 2), (16, 3), (20, 4), (24, 5), (28, 6), (32, 7), (36, 8)]
+
+
+def suite(board_class=Board) -> list:
+    """
+    Returns the list of GameStates of the fixed position suite
+    :param board_class: Board or another backend with the same interface
+    :return: list of GameState
+    """
+    return [random_position(plies, seed, board_class) for plies, seed in SUITE]
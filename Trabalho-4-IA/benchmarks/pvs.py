@@ -0,0 +1,54 @@
+"""
+Compares plain alpha-beta (minimax_move) with Principal Variation Search
+(pvs_move), with and without aspiration windows, on the fixed position suite.
+All searches use iterative deepening up to the same depth, the same move
+ordering and a transposition table; the script checks that they find the same values.
+
+Usage: python -m benchmarks.pvs [-d DEPTH] [-e {count,mask,custom}] [-a ASPIRATION]
+"""
+import argparse
+import functools
+import time
+
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.pvs import pvs_move
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Alpha-beta vs PVS on the position suite.')
+    parser.add_argument('-d', '--depth', type=int, default=5, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='mask', help='evaluation function')
+    parser.add_argument('-a', '--aspiration', type=float, default=20, help='half-width of the aspiration window')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    searches = [
+        ('alphabeta', minimax_move),
+        ('pvs', pvs_move),
+        ('pvs+aspiration', functools.partial(pvs_move, aspiration=args.aspiration)),
+    ]
+    positions = suite()
+    reference = None
+    for name, search in searches:
+        nodes, values, elapsed = 0, [], 0.0
+        for state in positions:
+            stats = {}
+            start = time.perf_counter()
+            iterative_deepening_move(state, eval_func, float('inf'), max_depth=args.depth, search=search,
+                                     orderer=MoveOrderer(OTHELLO_PRIOR), stats=stats)
+            elapsed += time.perf_counter() - start
+            nodes += stats['nodes']
+            values.append(stats['value'])
+        if reference is None:
+            reference = (nodes, elapsed, values)
+        print(f'{name:15s} nodes={nodes:8d} ({nodes / reference[0]:5.2f}) '
+              f'time={elapsed:6.2f}s ({elapsed / reference[1]:5.2f}) same values: {values == reference[2]}')
+
+
+if __name__ == '__main__':
+    main()
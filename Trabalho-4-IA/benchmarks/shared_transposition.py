@@ -0,0 +1,68 @@
+"""
+Compares the root-parallel search (parallel_move) with one private transposition
+table per worker process and with a single table in shared memory, for increasing
+numbers of workers, on the fixed position suite. Reports the table hit rate, the
+nodes expanded and the nodes per second, plus the single-process shared table.
+
+Usage: python -m benchmarks.shared_transposition [-d DEPTH] [-e {count,mask,custom}] [-w WORKERS ...] [-s MAX_ENTRIES]
+"""
+import argparse
+import os
+import time
+
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.parallel import parallel_move, get_pool, shutdown_pool
+from advsearch.your_agent.transposition import TranspositionTable, SharedTranspositionTable
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite
+
+
+def report(name, nodes, probes, hits, elapsed):
+    print(f'{name:20s} nodes={nodes:8d} hit rate={hits / max(probes, 1):6.1%} '
+          f'time={elapsed:6.2f}s nodes/s={nodes / elapsed:8.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Private vs shared-memory transposition tables.')
+    parser.add_argument('-d', '--depth', type=int, default=5, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='mask', help='evaluation function')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4], help='worker counts to test')
+    parser.add_argument('-s', '--size', type=int, default=1 << 17, help='maximum number of table entries')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    positions = suite()
+    print(f'cores: {os.cpu_count()}')
+
+    # single process: the shared table must behave like the private one
+    for name, make_table in (('serial private', TranspositionTable), ('serial shared', SharedTranspositionTable)):
+        nodes, probes, hits, elapsed = 0, 0, 0, 0.0
+        for state in positions:
+            tt, stats = make_table(args.size), {}
+            start = time.perf_counter()
+            for depth in range(1, args.depth + 1):
+                minimax_move(state, depth, eval_func, stats, tt=tt, orderer=MoveOrderer(OTHELLO_PRIOR))
+            elapsed += time.perf_counter() - start
+            nodes, probes, hits = nodes + stats['nodes'], probes + tt.probes, hits + tt.hits
+            if isinstance(tt, SharedTranspositionTable):
+                tt.close()
+        report(name, nodes, probes, hits, elapsed)
+
+    shared = SharedTranspositionTable(args.size)
+    for workers in args.workers:
+        for name, tt in (('private', None), ('shared', shared)):
+            get_pool(workers, tt)  # start the processes outside the measurement
+            stats, start = {}, time.perf_counter()
+            for state in positions:
+                parallel_move(state, eval_func, float('inf'), workers=workers, max_depth=args.depth,
+                              stats=stats, tt=tt)
+            elapsed = time.perf_counter() - start
+            report(f'{workers} workers {name}', stats['nodes'], stats['tt_probes'], stats['tt_hits'], elapsed)
+    shutdown_pool()
+    shared.close()
+
+
+if __name__ == '__main__':
+    main()
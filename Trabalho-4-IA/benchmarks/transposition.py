@@ -0,0 +1,47 @@
+"""
+Reports the nodes expanded by minimax_move with and without a
+transposition table on the fixed position suite.
+
+Usage: python -m benchmarks.transposition [-d DEPTH] [-e {count,mask,custom}] [-s MAX_ENTRIES]
+"""
+import argparse
+import time
+
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.transposition import TranspositionTable
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.positions import suite, SUITE
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Node counts of minimax_move with and without transposition table.')
+    parser.add_argument('-d', '--depth', type=int, default=4, help='search depth')
+    parser.add_argument('-e', '--eval', choices=sorted(EVALUATIONS), default='mask', help='evaluation function')
+    parser.add_argument('-s', '--size', type=int, default=1 << 17, help='maximum number of table entries')
+    args = parser.parse_args()
+
+    eval_func = EVALUATIONS[args.eval]
+    totals = [0, 0, 0.0, 0.0]
+    print(f'{"position":>10s} {"nodes":>9s} {"nodes+tt":>9s} {"ratio":>6s} same move')
+    for (plies, seed), state in zip(SUITE, suite()):
+        plain, cached = {}, {}
+        start = time.perf_counter()
+        move = minimax_move(state, args.depth, eval_func, plain)
+        middle = time.perf_counter()
+        tt_move = minimax_move(state, args.depth, eval_func, cached, tt=TranspositionTable(args.size))
+        end = time.perf_counter()
+
+        totals[0] += plain['nodes']
+        totals[1] += cached['nodes']
+        totals[2] += middle - start
+        totals[3] += end - middle
+        print(f'{plies:4d}/{seed:<5d} {plain["nodes"]:9d} {cached["nodes"]:9d} '
+              f'{cached["nodes"] / plain["nodes"]:6.2f} {move == tt_move and plain["value"] == cached["value"]}')
+
+    print(f'{"total":>10s} {totals[0]:9d} {totals[1]:9d} {totals[1] / totals[0]:6.2f}')
+    print(f'time: {totals[2]:.2f}s without table, {totals[3]:.2f}s with table')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Playing strength per CPU-second of MCTS with truncated playouts
+(advsearch.your_agent.truncated_playout) against MCTS with full-length random playouts.
+
+For each cutoff, both sides get the same search time per move (single process, so
+wall-clock time is CPU time) and play Othello games alternating colors; a draw counts
+as half a win. The script reports the win rate of the truncated side, the playouts per
+second of each side and the CPU seconds each side used.
+
+With --calibrate, it instead fits the sigmoid scale of each heuristic
+(truncated_playout.calibrate) on random positions and prints it, for SIGMOID_SCALE.
+
+Usage: python -m benchmarks.truncated_playout [-c CUTOFF [CUTOFF ...]] [-e {mask,custom}] [-n GAMES] [-t SECONDS]
+       python -m benchmarks.truncated_playout --calibrate [-c CUTOFF [CUTOFF ...]] [-p POSITIONS]
+"""
+import argparse
+import random
+import time
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent import mcts, truncated_playout
+from benchmarks.positions import random_position
+
+
+def play(truncated_color: str, cutoff: int, evaluation: str, time_budget: float) -> tuple:
+    """
+    Plays one game; returns (winner, {truncated?: playouts}, {truncated?: CPU seconds})
+    """
+    mcts.TIME_BUDGET = time_budget
+    mcts.ROLLOUT_EVAL = evaluation
+    roots = {True: None, False: None}  # each side keeps its own tree between its moves
+    playouts, seconds = {True: 0, False: 0}, {True: 0.0, False: 0.0}
+    state = GameState(Board(), Board.BLACK)
+    while not state.is_terminal():
+        truncated = state.player == truncated_color
+        mcts.ROLLOUT_CUTOFF = cutoff if truncated else None
+        mcts._root = roots[truncated]
+        start = time.process_time()
+        move = mcts.make_move(state)
+        seconds[truncated] += time.process_time() - start
+        roots[truncated] = mcts._root
+        playouts[truncated] += mcts.last_stats['playouts']
+        state = state.next_state(move)
+    return state.winner(), playouts, seconds
+
+
+def calibrate(cutoffs: list, count: int):
+    """
+    Prints the fitted sigmoid scale of each heuristic for each cutoff
+    """
+    rng = random.Random(0)
+    positions = [random_position(rng.randrange(4, 50), seed) for seed in range(count)]
+    positions = [position for position in positions if not position.is_terminal()]
+    for name, evaluate in truncated_playout.EVALUATORS.items():
+        for cutoff in cutoffs:
+            data = truncated_playout.samples(positions, cutoff, evaluate, rng)
+            print(f'{name:>6} cutoff {cutoff:3d}: scale {truncated_playout.calibrate(data):7.1f} '
+                  f'({len(data)} samples, current {truncated_playout.SIGMOID_SCALE[name]})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MCTS with truncated vs full-length playouts at equal CPU time.')
+    parser.add_argument('-c', '--cutoff', type=int, nargs='+', default=[4, 8, 16], help='playout cutoffs (plies)')
+    parser.add_argument('-e', '--evaluation', choices=sorted(truncated_playout.EVALUATORS), default='mask',
+                        help='heuristic used at the cutoff')
+    parser.add_argument('-n', '--games', type=int, default=4, help='games per cutoff')
+    parser.add_argument('-t', '--time', type=float, default=0.5, help='time budget per move (s)')
+    parser.add_argument('--calibrate', action='store_true', help='fit the sigmoid scales instead')
+    parser.add_argument('-p', '--positions', type=int, default=2000, help='positions used by --calibrate')
+    args = parser.parse_args()
+
+    if args.calibrate:
+        calibrate(args.cutoff, args.positions)
+        return
+
+    print(f'{args.evaluation} evaluation, {args.time}s per move')
+    try:
+        for cutoff in args.cutoff:
+            score = 0.0
+            playouts, seconds = {True: 0, False: 0}, {True: 0.0, False: 0.0}
+            for game in range(args.games):
+                truncated_color = Board.BLACK if game % 2 == 0 else Board.WHITE
+                winner, game_playouts, game_seconds = play(truncated_color, cutoff, args.evaluation, args.time)
+                score += 1.0 if winner == truncated_color else 0.5 if winner is None else 0.0
+                for side in (True, False):
+                    playouts[side] += game_playouts[side]
+                    seconds[side] += game_seconds[side]
+            print(f'cutoff {cutoff:3d}: win rate {score / args.games:5.2f} ({score}/{args.games}), '
+                  f'playouts/s truncated {playouts[True] / seconds[True]:6.0f} full {playouts[False] / seconds[False]:6.0f}, '
+                  f'CPU s truncated {seconds[True]:6.1f} full {seconds[False]:6.1f}')
+    finally:
+        mcts.ROLLOUT_CUTOFF, mcts._root = None, None
+
+
+if __name__ == '__main__':
+    main()
@@ -60,6 +60,7 @@ class Server(object):
         self.player_colors = ['B', 'W']
         self.color_names = ['black', 'white']
         self.state = GameState(Board(), 'B')
+        self.state.board.track_flipped()  # to highlight the flipped pieces of each move
         self.last_player = None
 
         self.history = []  # a list of performed moves (tuple: ((x,y), color)
@@ -181,6 +182,7 @@ class Server(object):
             
                 self.last_player = current_player           # records the player that just moved
                 self.state = self.state.next_state(move)  
+                self.notify_move(move, current_player)     # tells the agents about the accepted move
 
             else:
                 print(f'Player {current_player} move {move}_ILLEGAL!')
@@ -196,6 +198,26 @@ class Server(object):
             ))
 
 
+    def notify_move(self, move, player):
+        """
+        Calls the optional observe_move(state, move, player) function of each agent module
+        after a move is accepted, with a copy of the resulting state. Agents can use it to
+        follow the game outside make_move (e.g. to check a prediction of the opponent's move).
+        observe_move must return quickly; its errors are reported and ignored.
+        :param move: accepted move (x, y)
+        :param player: color of the player that made the move
+        :return:
+        """
+        modules = {id(module): module for module in self.player_modules.values()}  # each module once
+        for module in modules.values():
+            observe = getattr(module, 'observe_move', None)
+            if observe is None:
+                continue
+            try:
+                observe(self.state.copy(), move, player)
+            except Exception as e:
+                print(f'observe_move of {module.__name__} failed: {e!r}')
+
     def write_output(self):
         """
         Writes a xml file with detailed match data
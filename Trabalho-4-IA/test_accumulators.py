@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from advsearch.othello.accumulators import SquareTable, Frontier, disc_difference, corner_ownership
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask, EVAL_TEMPLATE, MASK_ACCUMULATOR
+
+from benchmarks.positions import suite
+
+ACCUMULATORS = [SquareTable('mask', EVAL_TEMPLATE), disc_difference(), corner_ownership(), Frontier()]
+
+
+class TestAccumulators(unittest.TestCase):
+    """
+    Os valores incrementais devem ser sempre iguais aos calculados do zero
+    """
+
+    def assertConsistent(self, board):
+        for accumulator in ACCUMULATORS:
+            self.assertEqual(board.accumulated[accumulator.name], accumulator.compute(board.copy()), accumulator.name)
+
+    def check_random_games(self, board_class, seed):
+        rng = random.Random(seed)
+        for _ in range(4):
+            state = GameState(board_class(), 'B')
+            for accumulator in ACCUMULATORS:
+                state.board.add_accumulator(accumulator)
+            while not state.is_terminal():
+                before = dict(state.board.accumulated)
+                moves = sorted(state.legal_moves())
+                for move in rng.sample(moves, min(3, len(moves))):
+                    # apply/undo
+                    record = state.apply(move)
+                    self.assertConsistent(state.board)
+                    state.undo(record)
+                    self.assertEqual(state.board.accumulated, before)
+                    # process_move (via next_state, que copia o tabuleiro)
+                    child = state.next_state(move)
+                    self.assertConsistent(child.board)
+                    self.assertEqual(state.board.accumulated, before)
+                    # flip_tiles: so' vira as pecas, sem colocar o disco (uma direcao por vez)
+                    board = state.board.copy()
+                    for direction in rng.sample(Board.DIRECTIONS, len(Board.DIRECTIONS)):
+                        board.flip_tiles((move[1], move[0]), state.player, direction)
+                        self.assertConsistent(board)
+                state = state.next_state(rng.choice(moves))
+
+    def test_board(self):
+        self.check_random_games(Board, 11)
+
+    def test_bitboard(self):
+        self.check_random_games(BitBoard, 12)
+
+    def test_from_string_and_copy(self):
+        board = BitBoard.from_string(str(suite()[5].board))
+        board.add_accumulator(Frontier())
+        self.assertEqual(board.copy().accumulated, board.accumulated)
+        self.assertEqual(Board.from_string(str(board)).accumulated, {})  # nada registrado
+
+    def test_incremental_evaluate_mask(self):
+        """
+        A busca com a soma incremental deve dar os mesmos valores que a soma completa
+        """
+        for board_class in (Board, BitBoard):
+            for state in suite(board_class)[:4]:
+                full, incremental = {}, {}
+                minimax_move(state, 3, evaluate_mask, full)
+                state.board.add_accumulator(MASK_ACCUMULATOR)
+                minimax_move(state, 3, evaluate_mask, incremental)
+                self.assertEqual(incremental['value'], full['value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from advsearch.othello.bitboard import flips_mask, moves_mask, squares
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent import batch_playout, mcts
+from advsearch.your_agent.endgame import bitboards
+
+from benchmarks.positions import random_position
+
+
+class TestBatchPlayout(unittest.TestCase):
+    """
+    Os playouts em lote devem gerar as mesmas jogadas e viradas que bitboard.py, partida a partida
+    """
+
+    def setUp(self):
+        self.positions = [bitboards(random_position(plies, seed)) for plies in (0, 10, 25, 40, 55)
+                          for seed in range(8)]
+        self.count = len(self.positions)
+        self.own = batch_playout.pack([own for own, _ in self.positions])
+        self.opp = batch_playout.pack([opp for _, opp in self.positions])
+        self.inner = batch_playout._replicate(0x7E7E7E7E7E7E7E7E, self.count)
+
+    def test_moves_match_bitboard(self):
+        full = batch_playout._replicate(batch_playout.FULL, self.count)
+        legal = batch_playout.unpack(batch_playout.moves(self.own, self.opp, self.inner, full), self.count)
+        self.assertEqual(legal, [moves_mask(own, opp) for own, opp in self.positions])
+
+    def test_flips_match_bitboard(self):
+        rng = random.Random(5)
+        placed = []
+        for own, opp in self.positions:
+            legal = list(squares(moves_mask(own, opp)))
+            placed.append(1 << rng.choice(legal) if legal else 0)  # sem jogada: a partida passa
+        flipped = batch_playout.flips(self.own, self.opp, batch_playout.pack(placed), self.inner)
+        expected = [flips_mask(own, opp, square.bit_length() - 1) if square else 0
+                    for (own, opp), square in zip(self.positions, placed)]
+        self.assertEqual(batch_playout.unpack(flipped, self.count), expected)
+
+    def test_simulate(self):
+        # posicoes terminais: o resultado e' a diferenca de discos, do ponto de vista de quem move
+        full_black = (1 << 64) - 1
+        self.assertEqual(batch_playout.simulate([(full_black, 0), (0, 0b111), (0b11, 0b11 << 32)]), [64, -3, 0])
+
+        # um lote misturando partidas que terminam em rodadas diferentes
+        differences = batch_playout.simulate(self.positions, random.Random(1))
+        self.assertEqual(len(differences), self.count)
+        for (own, opp), difference in zip(self.positions, differences):
+            self.assertLessEqual(abs(difference), 64)
+            if not moves_mask(own, opp) and not moves_mask(opp, own):
+                self.assertEqual(difference, bin(own).count('1') - bin(opp).count('1'))
+
+    def test_mcts_backend(self):
+        state = GameState(Board(), Board.BLACK)
+        root = mcts.Node(state)
+        playouts = mcts.search(root, float('inf'), rng=random.Random(2), max_playouts=200, batch=20)
+        self.assertEqual(playouts, 200)
+        self.assertEqual(root.visits, 200)
+        self.assertEqual(root.visits, sum(child.visits for child in root.children))
+        self.assertIn(mcts.best_move(root), state.legal_moves())
+
+
+if __name__ == '__main__':
+    unittest.main()
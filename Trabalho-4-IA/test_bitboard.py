@@ -0,0 +1,156 @@
+import contextlib
+import io
+import random
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.gamestate import GameState
+
+
+class TestBitBoard(unittest.TestCase):
+    """
+    Verifica se o BitBoard se comporta exatamente como o Board
+    ao longo de partidas aleatorias
+    """
+
+    def test_initial_board(self):
+        self.assertEqual(str(BitBoard()), str(Board()))
+        self.assertEqual(BitBoard().piece_count, Board().piece_count)
+
+    def test_from_string(self):
+        board_str = ('BBBBBBB.\n'
+                     'BBWWWWBB\n'
+                     'BWBWWBBB\n'
+                     'BWWWBBBB\n'
+                     'BWBBBBBB\n'
+                     'BWBWBBBB\n'
+                     'BBWWBBBB\n'
+                     'BBBWBBBB\n')
+        board = BitBoard.from_string(board_str)
+        self.assertEqual(str(board), board_str)
+        self.assertEqual(board.num_pieces('B'), 47)
+        self.assertEqual(board.num_pieces('W'), 16)
+        self.assertEqual(board.legal_moves('W'), Board.from_string(board_str).legal_moves('W'))
+
+    def test_random_games(self):
+        rng = random.Random(42)
+        for _ in range(30):
+            state = GameState(Board(), 'B')
+            bit_state = GameState(BitBoard(), 'B')
+            while not state.is_terminal():
+                self.assertFalse(bit_state.is_terminal())
+                self.assertEqual(bit_state.player, state.player)
+                self.assertEqual(bit_state.legal_moves(), state.legal_moves())
+                for color in ('B', 'W'):
+                    self.assertEqual(bit_state.board.legal_moves(color), state.board.legal_moves(color))
+
+                move = rng.choice(sorted(state.legal_moves()))
+                state = state.next_state(move)
+                bit_state = bit_state.next_state(move)
+                # next_state generates the moves of both colors in one pass and caches them
+                self.assertNotIn(None, state.board._legal_moves.values())
+
+                self.assertEqual(str(bit_state.board), str(state.board))
+                self.assertEqual(bit_state.board.piece_count, state.board.piece_count)
+            self.assertTrue(bit_state.is_terminal())
+            self.assertEqual(bit_state.winner(), state.winner())
+
+    def test_public_methods(self):
+        # todos os metodos publicos do Board, chamados nos dois tabuleiros (o BitBoard nao tem cells)
+        tested = {'from_string', 'compute_zobrist', 'tiles', 'piece_count', 'flipped', 'track_flipped',
+                  'tracks_flipped', 'add_accumulator', 'is_within_bounds', 'is_legal', 'is_terminal_state',
+                  'num_pieces', 'winner', 'find_bracket', 'find_where_to_play_from_owned', 'copy',
+                  'process_move', 'apply', 'undo', 'flip_tiles', 'legal_moves', 'find_legal_moves_both',
+                  'has_legal_move', 'opponent', 'print_board', 'decorated_str'}
+        public = {name for name in dir(Board) if not name.startswith('_')
+                  and (callable(getattr(Board, name)) or isinstance(getattr(Board, name), property))}
+        self.assertEqual(public, tested)
+
+        from advsearch.othello.accumulators import disc_difference
+        rng = random.Random(7)
+        state = GameState(Board(), 'B')
+        while not state.is_terminal():
+            board, bit = Board.from_string(str(state.board)), BitBoard.from_string(str(state.board))
+            self.assertEqual(str(bit), str(board))
+            self.assertEqual(bit.zobrist, board.zobrist)
+            self.assertEqual(bit.compute_zobrist(), board.compute_zobrist())
+            self.assertEqual(bit.tiles, board.tiles)
+            self.assertEqual(bit.piece_count, board.piece_count)
+            self.assertEqual(bit.is_terminal_state(), board.is_terminal_state())
+            self.assertEqual(bit.winner(), board.winner())
+            self.assertEqual(bit.decorated_str(), board.decorated_str())
+            self.assertEqual(bit.decorated_str(colors=False), board.decorated_str(colors=False))
+            printed = []
+            for printer in (bit, board):
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    printer.print_board()
+                printed.append(output.getvalue())
+            self.assertEqual(printed[0], printed[1])
+            self.assertEqual(bit.tracks_flipped, board.tracks_flipped)
+            self.assertEqual(bit.flipped, board.flipped)
+            self.assertEqual(str(bit.copy()), str(board.copy()))
+            bit.add_accumulator(disc_difference())
+            board.add_accumulator(disc_difference())
+            self.assertEqual(bit.accumulated, board.accumulated)
+
+            for color in (Board.BLACK, Board.WHITE):
+                self.assertEqual(bit.opponent(color), board.opponent(color))
+                self.assertEqual(bit.num_pieces(color), board.num_pieces(color))
+                self.assertEqual(bit.legal_moves(color), board.legal_moves(color))
+                self.assertEqual(bit.has_legal_move(color), board.has_legal_move(color))
+                for y in range(8):
+                    for x in range(8):
+                        self.assertEqual(bit.is_within_bounds((x, y)), board.is_within_bounds((x, y)))
+                        self.assertEqual(bit.is_legal((x, y), color), board.is_legal((x, y), color))
+                        for direction in Board.DIRECTIONS:
+                            self.assertEqual(bit.find_bracket((y, x), color, direction),
+                                             board.find_bracket((y, x), color, direction))
+                            self.assertEqual(bit.find_where_to_play_from_owned((y, x), color, direction),
+                                             board.find_where_to_play_from_owned((y, x), color, direction))
+            self.assertEqual(bit.num_pieces(Board.EMPTY), board.num_pieces(Board.EMPTY))
+
+            bit._legal_moves = {Board.BLACK: None, Board.WHITE: None}
+            board._legal_moves = {Board.BLACK: None, Board.WHITE: None}
+            bit.find_legal_moves_both()
+            board.find_legal_moves_both()
+            self.assertEqual(bit._legal_moves, board._legal_moves)
+
+            move = rng.choice(sorted(state.legal_moves()))
+            bit_copy, board_copy = bit.copy(), board.copy()
+            bit_copy.track_flipped()
+            board_copy.track_flipped()
+            for direction in Board.DIRECTIONS:
+                bit_copy.flip_tiles((move[1], move[0]), state.player, direction)
+                board_copy.flip_tiles((move[1], move[0]), state.player, direction)
+            self.assertEqual(str(bit_copy), str(board_copy))
+            self.assertEqual(bit_copy.zobrist, board_copy.zobrist)
+            self.assertEqual(bit_copy.flipped, board_copy.flipped)
+
+            bit_record, board_record = bit.apply(move, state.player), board.apply(move, state.player)
+            self.assertEqual(str(bit), str(board))
+            bit.undo(bit_record)
+            board.undo(board_record)
+            self.assertEqual(str(bit), str(board))
+
+            bit.track_flipped()
+            board.track_flipped()
+            self.assertEqual(bit.process_move(move, state.player), board.process_move(move, state.player))
+            self.assertEqual(str(bit), str(board))
+            self.assertEqual(bit.flipped, board.flipped)  # as casas viradas e as que fecharam cada sequencia
+            self.assertEqual(bit.accumulated, board.accumulated)
+            state = state.next_state(move)
+
+    def test_illegal_moves(self):
+        for board_class in (Board, BitBoard):
+            board = board_class()
+            self.assertFalse(board.process_move((0, 0), 'B'))   # does not flip anything
+            self.assertFalse(board.process_move((3, 3), 'B'))   # occupied
+            self.assertFalse(board.process_move((8, 3), 'B'))   # out of bounds
+            self.assertFalse(board.process_move((-1, 3), 'B'))  # out of bounds
+            self.assertIsNone(board.apply((5, 5), 'B'))          # does not flip anything
+            self.assertEqual(str(board), str(Board()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.gamestate import GameState
+
+
+class TestCompactBoard(unittest.TestCase):
+    """
+    Representacao compacta do Board: __slots__, casas num bytearray
+    e registro das pecas viradas apenas quando pedido
+    """
+
+    def test_no_instance_dict(self):
+        for board_class in (Board, BitBoard):
+            state = GameState(board_class(), 'B').next_state((3, 2))
+            self.assertFalse(hasattr(state, '__dict__'))
+            self.assertFalse(hasattr(state.board, '__dict__'))
+
+    def test_cells(self):
+        board = Board()
+        self.assertEqual(len(board.cells), 64)
+        self.assertEqual(board.cells.decode(), str(board).replace('\n', ''))
+        self.assertEqual(board.piece_count, {'B': 2, 'W': 2, '.': 60})
+
+        tiles = board.tiles
+        tiles[0][0] = 'B'   # a matriz e' construida sob demanda: altera-la nao altera o tabuleiro
+        self.assertEqual(board.tiles[0][0], '.')
+
+    def test_flipped_only_when_tracked(self):
+        for board_class in (Board, BitBoard):
+            state = GameState(board_class(), 'B')
+            self.assertEqual(state.next_state((3, 2)).board.flipped, set())
+
+            state.board.track_flipped()
+            after = state.next_state((3, 2))
+            self.assertTrue(after.board.tracks_flipped)
+            self.assertIn((3, 3), after.board.flipped)           # (y, x) da peca virada
+            self.assertFalse(after.copy().board.tracks_flipped)  # copias (ex.: para os agentes) nao registram
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import time
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.minimax import minimax_move, SearchTimeout
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+import advsearch.your_agent.tttm_minimax as tttm_agent
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+
+from benchmarks.positions import suite
+
+
+class TestIterativeDeepening(unittest.TestCase):
+
+    def test_respects_budget(self):
+        state = suite()[3]
+        board_str = str(state.board)
+        stats = {}
+        start = time.perf_counter()
+        move = iterative_deepening_move(state, evaluate_mask, 0.5, stats=stats)
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertIn(move, state.legal_moves())
+        self.assertGreaterEqual(stats['depth'], 1)
+        self.assertEqual(str(state.board), board_str)   # a busca interrompida restaura o estado
+
+    def test_timeout_restores_state(self):
+        state = suite()[4]
+        board_str, player = str(state.board), state.player
+        with self.assertRaises(SearchTimeout):
+            minimax_move(state, 8, evaluate_mask, deadline=time.perf_counter() + 0.05)
+        self.assertEqual((str(state.board), state.player), (board_str, player))
+
+    def test_same_value_as_fixed_depth(self):
+        state = suite()[2]
+        fixed, deepening = {}, {}
+        minimax_move(state, 3, evaluate_mask, fixed)
+        iterative_deepening_move(state, evaluate_mask, 60, max_depth=3, stats=deepening)
+        self.assertEqual(deepening['depth'], 3)
+        self.assertEqual(deepening['value'], fixed['value'])
+
+    def test_stops_when_solved(self):
+        state = TTTMGameState(TTTMBoard(), 'B')
+        stats = {}
+        self.assertEqual(iterative_deepening_move(state, tttm_agent.utility, 60, stats=stats), (1, 1))
+        self.assertEqual(stats['depth'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import time
+import unittest
+
+from advsearch.othello.bitboard import BitBoard, moves_mask
+from advsearch.othello.board import Board
+from advsearch.your_agent import othello_minimax_mask
+from advsearch.your_agent.endgame import _moves, bitboards, solve_move, endgame_move, is_endgame, EndgameTable
+from advsearch.your_agent.minimax import SearchTimeout
+
+from benchmarks.endgame import endgame_suite
+from benchmarks.positions import random_position
+
+
+def brute_force(state, player: str) -> int:
+    """
+    Diferenca final de discos de player com jogo perfeito (minimax sem podas)
+    """
+    if state.is_terminal():
+        return state.board.num_pieces(player) - state.board.num_pieces(Board.opponent(player))
+    values = [brute_force(state.next_state(move), player) for move in state.legal_moves()]
+    return max(values) if state.player == player else min(values)
+
+
+class TestEndgame(unittest.TestCase):
+    """
+    O resolvedor de final de jogo deve encontrar o valor exato e uma jogada que o atinge
+    """
+
+    def test_moves_match_bitboard(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            own = rng.getrandbits(64) & rng.getrandbits(64)
+            opp = rng.getrandbits(64) & ~own
+            self.assertEqual(_moves(own, opp), moves_mask(own, opp))
+
+    def test_bitboards(self):
+        for plies, seed in ((20, 1), (45, 2)):
+            board_state = random_position(plies, seed, board_class=Board)
+            bit_state = random_position(plies, seed, board_class=BitBoard)
+            self.assertEqual(bitboards(board_state), bitboards(bit_state))
+
+    def test_matches_brute_force(self):
+        for plies in (53, 54, 55):
+            for seed in range(3):
+                for board_class in (Board, BitBoard):
+                    state = random_position(plies, seed, board_class=board_class)
+                    if state.is_terminal():
+                        continue
+                    stats = {}
+                    move = solve_move(state, stats=stats)
+                    expected = brute_force(state, state.player)
+                    self.assertEqual(stats['value'], expected, (plies, seed))
+                    self.assertEqual(stats['wld'], (expected > 0) - (expected < 0))
+                    self.assertEqual(brute_force(state.next_state(move), state.player), expected, (plies, seed))
+
+    def test_suite_values(self):
+        table = EndgameTable(max_entries=64)  # esvaziada varias vezes durante a busca
+        for empties, seed, state, value in endgame_suite(max_empties=10, per_empties=2):
+            stats = {}
+            solve_move(state, stats=stats, table=table)
+            self.assertEqual(stats['value'], value, (empties, seed))
+            table.clear()
+
+    def test_timeout(self):
+        _, _, state, _ = endgame_suite(max_empties=14)[-1]
+        with self.assertRaises(SearchTimeout):
+            solve_move(state, deadline=time.perf_counter())
+        fallback_time = []
+        move = endgame_move(state, 0.0, fallback=lambda time_left: fallback_time.append(time_left) or (0, 0))
+        self.assertEqual(move, (0, 0))
+        self.assertEqual(len(fallback_time), 1)
+
+    def test_agent_switches_to_solver(self):
+        state = random_position(60 - othello_minimax_mask.ENDGAME_EMPTIES, 1)
+        self.assertTrue(is_endgame(state, othello_minimax_mask.ENDGAME_EMPTIES))
+        self.assertFalse(is_endgame(random_position(20, 1), othello_minimax_mask.ENDGAME_EMPTIES))
+        self.assertEqual(othello_minimax_mask.make_move(state), solve_move(state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.eval_cache import EvalCache
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_custom import evaluate_custom
+
+from benchmarks.positions import suite
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def test_same_search_results(self):
+        """
+        A busca com o cache deve dar a mesma jogada e o mesmo valor que sem ele
+        """
+        for state in suite()[:4]:
+            plain, cached_stats = {}, {}
+            cached = EvalCache(evaluate_custom)
+            move = minimax_move(state, 3, evaluate_custom, stats=plain)
+            self.assertEqual(minimax_move(state, 3, cached, stats=cached_stats), move)
+            self.assertEqual(cached_stats['value'], plain['value'])
+
+    def test_hits_and_lru_eviction(self):
+        calls = []
+
+        def eval_func(state, player):
+            calls.append((str(state.board), player))
+            return len(calls)
+
+        cache = EvalCache(eval_func, max_entries=2)
+        a = GameState(Board(), 'B')
+        b = a.next_state((3, 2))
+        c = a.next_state((2, 3))
+
+        self.assertEqual(cache(a, 'B'), 1)
+        self.assertEqual(cache(a, 'B'), 1)      # acerto
+        self.assertEqual(cache(a, 'W'), 2)      # o jogador faz parte da chave
+        self.assertEqual(cache(a, 'B'), 1)      # (a, 'B') passa a ser a mais recente
+        self.assertEqual(cache(b, 'B'), 3)      # descarta (a, 'W'), a menos recente
+        self.assertEqual(cache(a, 'B'), 1)
+        self.assertEqual(cache(a, 'W'), 4)      # foi descartada: avaliada de novo
+        self.assertEqual(cache(c, 'B'), 5)
+
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (3, 5, 3))
+        self.assertEqual(len(cache), 2)
+        self.assertAlmostEqual(cache.hit_rate, 3 / 8)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_state_without_key(self):
+        """
+        Estados sem zobrist_key sao avaliados sem passar pelo cache
+        """
+        cache = EvalCache(lambda state, player: 7.0)
+        self.assertEqual(cache(object(), 'B'), 7.0)
+        self.assertEqual(cache(object(), 'B'), 7.0)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 0))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            EvalCache(evaluate_custom, max_entries=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
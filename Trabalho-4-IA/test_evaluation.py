@@ -0,0 +1,81 @@
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.your_agent.evaluation import native_board, packed_cells, compile_evaluator, square_table, \
+    MATERIAL, MOBILITY, SQUARES
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask, EVAL_TEMPLATE
+
+from benchmarks.bitboard import EVALUATIONS
+from benchmarks.evaluation import ForeignState
+from benchmarks.positions import random_position
+
+
+class TestNativeEvaluation(unittest.TestCase):
+
+    def test_native_board(self):
+        state = random_position(10, 1)
+        self.assertIs(native_board(state), state.board)
+        self.assertIs(native_board(state.board), state.board)
+        self.assertIsNone(native_board(ForeignState(state)))
+
+    def test_packed_cells(self):
+        for board_class in (Board, BitBoard):
+            state = random_position(20, 2, board_class)
+            self.assertEqual(packed_cells(state.board), str(state.board).replace('\n', ''))
+
+    def test_same_scores_as_reflective(self):
+        """
+        O caminho rapido deve dar exatamente os mesmos valores que a extracao por reflexao
+        """
+        for board_class in (Board, BitBoard):
+            for plies in range(0, 60, 4):
+                state = random_position(plies, plies, board_class)
+                for name, eval_func in EVALUATIONS.items():
+                    for player in 'BW':
+                        with self.subTest(board=board_class.__name__, plies=plies, eval=name, player=player):
+                            self.assertEqual(eval_func(state, player), eval_func(ForeignState(state), player))
+
+
+
+class TestCompiledEvaluator(unittest.TestCase):
+
+    def test_single_square_table_is_mask(self):
+        mask = compile_evaluator([('positional', SQUARES, EVAL_TEMPLATE)], [(None, {'positional': 1})])
+        for board_class in (Board, BitBoard):
+            for plies in range(0, 60, 7):
+                state = random_position(plies, plies + 1, board_class)
+                for player in 'BW':
+                    self.assertEqual(mask(state.board, state.player, player), evaluate_mask(state, player))
+
+    def test_packed_square_terms(self):
+        """
+        Varios termos SQUARES, inclusive negativos, sao separados corretamente do inteiro empacotado
+        """
+        corners = [(0, 0), (7, 0), (0, 7), (7, 7)]
+        features = [('a', SQUARES, square_table(corners, -7)), ('b', SQUARES, EVAL_TEMPLATE),
+                    ('c', SQUARES, square_table([(0, 0)], 1))]
+        for name, table in (('a', features[0][2]), ('b', EVAL_TEMPLATE), ('c', features[2][2])):
+            weights = {'a': 0, 'b': 0, 'c': 0}
+            weights[name] = 1
+            single = compile_evaluator([(name, SQUARES, table)], [(None, {name: 1})])
+            combined = compile_evaluator(features, [(None, weights)])
+            state = random_position(58, 3)
+            for player in 'BW':
+                self.assertEqual(combined(state.board, state.player, player), single(state.board, state.player, player))
+
+    def test_phases(self):
+        evaluate = compile_evaluator([('piece', MATERIAL, None), ('mobility', MOBILITY, None)],
+                                     [(4, {'piece': 1, 'mobility': 0}), (None, {'piece': 0, 'mobility': 1})])
+        initial = random_position(0, 0)
+        self.assertEqual(evaluate(initial.board, 'B', 'B'), 0.0)    # 4 discos: so' material, empatado
+        later = random_position(1, 0)
+        self.assertEqual(evaluate(later.board, None, 'W'), -100.0)  # 5 discos: so' mobilidade, sem jogador da vez
+
+    def test_unknown_feature(self):
+        with self.assertRaises(ValueError):
+            compile_evaluator([('x', 'parity', None)], [(None, {'x': 1})])
+
+
+if __name__ == '__main__':
+    unittest.main()
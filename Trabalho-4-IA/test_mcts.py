@@ -3,6 +3,10 @@ from collections import OrderedDict, defaultdict
 from typing import Tuple, Union
 
 import advsearch.your_agent.mcts as mcts  # mude your_agent pelo nome do seu modulo
+from advsearch.othello.board import Board as OthelloBoard
+from advsearch.othello.gamestate import GameState as OthelloState
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMState
 
 
 # jogo muito simples. o estado inicial tem 3 sucessores, 
@@ -43,6 +47,125 @@ class TestMCTSVerySimpleGame(unittest.TestCase):
         self.assertEqual(self.move,(0, 1))
 
 
+class TestMCTSGames(unittest.TestCase):
+    """
+    O MCTS deve jogar Othello e Tic-Tac-Toe Misere dentro do tempo e reaproveitar a arvore
+    """
+
+    def setUp(self):
+        self.budget = mcts.TIME_BUDGET
+        mcts.TIME_BUDGET = 0.3
+
+    def tearDown(self):
+        mcts.TIME_BUDGET = self.budget
+
+    def test_legal_moves_within_budget(self):
+        for state in (OthelloState(OthelloBoard(), 'B'), TTTMState(TTTMBoard(), 'B')):
+            move = mcts.make_move(state)
+            self.assertTrue(state.is_legal_move(move), state.game_name)
+            self.assertLess(mcts.last_stats['seconds'], mcts.TIME_BUDGET + 0.2)
+            self.assertGreater(mcts.last_stats['playouts'], 0)
+            self.assertGreater(mcts.last_stats['tree_size'], 1)
+
+    def test_tree_reuse(self):
+        storage = mcts.TREE_STORAGE
+        try:
+            for mcts.TREE_STORAGE in ('objects', 'array'):
+                state = TTTMState(TTTMBoard(), 'B')
+                state = state.next_state(mcts.make_move(state))
+                state = state.next_state(sorted(state.legal_moves())[0])  # resposta do adversario
+                mcts.make_move(state)
+                self.assertGreater(mcts.last_stats['reused'], 0, mcts.TREE_STORAGE)
+        finally:
+            mcts.TREE_STORAGE = storage
+        self.assertIsNone(mcts._root.parent)
+        self.assertEqual(str(mcts._array_tree.root_state.board), str(state.board))
+
+    def test_array_tree(self):
+        from advsearch.your_agent import mcts_tree
+        state = TTTMState(TTTMBoard.from_string('BBW\nWW.\nB.B'), 'W')
+        tree = mcts_tree.ArrayTree(state, chunk=4)  # as colunas crescem varias vezes
+        mcts_tree.search(tree, 5.0)
+        self.assertTrue(tree.flags[0] & mcts_tree.EXHAUSTED)  # a arvore contem o jogo inteiro
+        self.assertEqual(mcts_tree.best_move(tree), (1, 2))
+        self.assertEqual(tree.visits[0], sum(tree.visits[child] for child in tree.children(0)))
+
+        child = next(tree.children(0))
+        subtree = tree.subtree(child)
+        self.assertEqual(subtree.visits[0], tree.visits[child])
+        self.assertEqual(str(subtree.root_state.board), str(tree.state_at(child).board))
+        self.assertEqual(len(subtree), 1 + sum(1 for _ in tree.children(child)) +
+                         sum(1 for c in tree.children(child) for _ in tree.children(c)))
+
+    def test_winning_move_tttm(self):
+        # misere: quem completa uma linha perde; W perde jogando em (2, 1) e empata em (1, 2)
+        state = TTTMState(TTTMBoard.from_string('BBW\nWW.\nB.B'), 'W')
+        self.assertEqual(mcts.make_move(state), (1, 2))
+
+    def test_winning_move_othello_endgame(self):
+        # B vence jogando em (2, 0) e perde em (0, 0); varias folhas sao estados terminais (sem jogador da vez)
+        import random
+        from advsearch.your_agent import mcts_tree
+        board = OthelloBoard.from_string('.B.WBBBB\nWWWWBBBB\nWWWBBBBB\nWWWBWWB.\n'
+                                         'WWBBWBB.\nWWWBWBBB\nWWWBBWWB\nWBBBWWWW')
+        state = OthelloState(board, 'B')
+        for seed in range(3):
+            root = mcts.Node(state)
+            mcts.search(root, 5.0, rng=random.Random(seed), max_playouts=3000)
+            self.assertEqual(mcts.best_move(root), (2, 0), 'objects')
+            tree = mcts_tree.ArrayTree(state.copy())
+            mcts_tree.search(tree, 5.0, rng=random.Random(seed), max_playouts=3000)
+            self.assertEqual(mcts_tree.best_move(tree), (2, 0), 'array')
+
+    def test_root_parallel(self):
+        import time
+        from advsearch.your_agent import mcts_parallel
+        self.addCleanup(mcts_parallel.shutdown_pool)
+        mcts_parallel.get_pool(2)  # inicia os processos fora do tempo medido
+
+        state = TTTMState(TTTMBoard.from_string('BBW\nWW.\nB.B'), 'W')
+        stats = {}
+        start = time.perf_counter()
+        self.assertEqual(mcts_parallel.parallel_mcts_move(state, 0.3, workers=2, stats=stats), (1, 2))
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.05)  # a espera pelos resultados esta' no orcamento
+        self.assertEqual(stats['workers'], 2)  # cada tarefa respondeu uma vez
+        self.assertIn(stats['processes'], (1, 2))
+
+        workers = mcts.PARALLEL_WORKERS
+        try:
+            mcts.PARALLEL_WORKERS = 2
+            state = OthelloState(OthelloBoard(), 'B')
+            move = mcts.make_move(state)
+        finally:
+            mcts.PARALLEL_WORKERS = workers
+        self.assertTrue(state.is_legal_move(move))
+        self.assertLess(mcts.last_stats['seconds'], mcts.TIME_BUDGET + 0.05)
+        self.assertGreater(mcts.last_stats['playouts'], 0)
+
+    def test_root_parallel_tasks(self):
+        # um mesmo processo pode receber as duas tarefas de uma busca: cada uma usa a sua arvore
+        import time
+        from advsearch.your_agent import mcts_parallel
+        self.addCleanup(mcts_parallel._trees.clear)
+        self.addCleanup(setattr, mcts, '_root', None)
+        state = TTTMState(TTTMBoard(), 'B')
+        deadline = time.time() + 0.2  # a segunda tarefa comeca depois do prazo
+        results = [mcts_parallel._grow_tree(state, deadline, task_id, task_id) for task_id in (0, 1)]
+        self.assertEqual([result[0] for result in results], [0, 1])
+        roots = {task_id: mcts_parallel._trees[task_id][1] for task_id in (0, 1)}
+        self.assertIsNot(roots[0], roots[1])
+        self.assertEqual(results[0][4], roots[0].size())
+        self.assertLess(results[1][4], results[0][4])
+
+        # jogada seguinte: a tarefa 0 reaproveita a sua arvore, a 1 nao pega a da 0
+        child = max(roots[0].children, key=lambda node: node.visits)
+        grandchild = child.children[0]
+        deadline = time.time() + 0.05
+        mcts_parallel._grow_tree(grandchild.state, deadline, 0, 0)
+        self.assertIs(mcts_parallel._trees[0][1], grandchild)
+        mcts_parallel._grow_tree(grandchild.state, deadline, 1, 1)
+        self.assertIsNot(mcts_parallel._trees[1][1], grandchild)
+        self.assertEqual(sorted(mcts_parallel._trees), [0, 1])
 
 # *********************************************
 # Voce nao precisa se preocupar com o codigo daqui pra baixo
@@ -0,0 +1,45 @@
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+
+from benchmarks.positions import suite
+
+
+class TestMoveOrderer(unittest.TestCase):
+
+    def test_order(self):
+        state = GameState(Board(), 'B')
+        moves = [(2, 3), (0, 0), (1, 1), (7, 7), (4, 5)]
+        orderer = MoveOrderer(OTHELLO_PRIOR)
+
+        # sem historico: prioridade estatica (cantos primeiro, casas X por ultimo)
+        self.assertEqual(orderer.order(state, moves, 0)[:2], [(0, 0), (7, 7)])
+        self.assertEqual(orderer.order(state, moves, 0)[-1], (1, 1))
+
+        # hash move, depois killers
+        orderer.cutoff(state, (4, 5), 2, 3)
+        ordered = orderer.order(state, moves, 2, hash_move=(1, 1))
+        self.assertEqual(ordered[:3], [(1, 1), (4, 5), (0, 0)])
+
+        # o historico vale para o mesmo jogador em qualquer profundidade
+        self.assertEqual(orderer.history['B'][(4, 5)], 9)
+        self.assertNotIn('W', orderer.history)
+
+    def test_same_values(self):
+        """
+        A ordenacao nao muda o valor da busca e, no conjunto de posicoes, expande menos nodos
+        """
+        plain, ordered = {}, {}
+        for state in suite()[:5]:
+            minimax_move(state, 3, evaluate_mask, plain)
+            minimax_move(state, 3, evaluate_mask, ordered, orderer=MoveOrderer(OTHELLO_PRIOR))
+            self.assertEqual(ordered['value'], plain['value'])
+        self.assertLess(ordered['nodes'], plain['nodes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import random
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.endgame import bitboards
+from advsearch.your_agent.opening_book import (BookBuilder, OpeningBook, canonical, replay, read_history,
+                                               read_results, SQUARE_MAPS, RECORD, MAGIC)
+
+
+def random_game(seed: int) -> list:
+    """
+    Partida aleatoria completa como lista de ((x, y), cor)
+    """
+    rng = random.Random(seed)
+    state = GameState(Board(), Board.BLACK)
+    moves = []
+    while not state.is_terminal():
+        move = rng.choice(sorted(state.legal_moves()))
+        moves.append((move, state.player))
+        state = state.next_state(move)
+    return moves
+
+
+def transformed_game(moves: list, symmetry: int) -> list:
+    """
+    A mesma partida com as jogadas transformadas por uma simetria que preserva a posicao inicial
+    """
+    table = SQUARE_MAPS[symmetry]
+    return [((table[y * 8 + x] & 7, table[y * 8 + x] >> 3), color) for (x, y), color in moves]
+
+
+def write_history(path: str, moves: list):
+    with open(path, 'w') as history:
+        for (x, y), color in moves:
+            history.write('%d,%d,%s\n' % (x, y, color))
+
+
+def write_results(path: str, moves: list, winner):
+    # mesmo formato de Server.write_output
+    root = ET.Element('othello-match')
+    for color in ('B', 'W'):
+        player = ET.SubElement(root, 'player')
+        player.set('color', color)
+        player.set('result', 'draw' if winner is None else 'win' if winner == color else 'loss')
+    moves_elem = ET.SubElement(root, 'moves')
+    for coords, color in moves:
+        move = ET.SubElement(moves_elem, 'move')
+        move.set('coord', '%d,%d' % coords)
+        move.set('color', color)
+    ET.ElementTree(root).write(path)
+
+
+class TestOpeningBook(unittest.TestCase):
+    """
+    O livro deve agregar posicoes simetricas e responder com jogadas legais
+    """
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.dir.name, name)
+
+    def test_canonical_symmetries(self):
+        state = GameState(Board(), Board.BLACK)
+        for move in random_game(5)[:12]:
+            state = state.next_state(move[0])
+        own, opp = bitboards(state)
+        expected = canonical(own, opp)[:2]
+        for table in SQUARE_MAPS:
+            moved = [sum(1 << table[sq] for sq in range(64) if bits >> sq & 1) for bits in (own, opp)]
+            self.assertEqual(canonical(*moved)[:2], expected)
+
+    def test_read_files(self):
+        moves = random_game(1)
+        write_history(self.path('history.txt'), moves + [((-1, -1), 'B')])  # tentativa ilegal no fim
+        write_results(self.path('results.xml'), moves, 'W')
+        self.assertEqual(read_history(self.path('history.txt'))[:-1], moves)
+        self.assertEqual(read_results(self.path('results.xml')), (moves, 'W'))
+        played, final = replay(read_history(self.path('history.txt')))
+        self.assertEqual(len(played), len(moves))
+        self.assertTrue(final.is_terminal())
+
+    def test_symmetric_games_aggregate(self):
+        moves = random_game(2)
+        builder = BookBuilder(max_plies=10)
+        for symmetry in (0, 2, 6, 7):  # a posicao inicial e' invariante a essas simetrias
+            write_results(self.path(f'{symmetry}.xml'), transformed_game(moves, symmetry), 'B')
+            self.assertTrue(builder.add_file(self.path(f'{symmetry}.xml')))
+        self.assertEqual(len(builder.stats), 10)
+        self.assertTrue(all(sum(entry) == 4 for entry in builder.stats.values()))
+
+    def test_lookup(self):
+        builder = BookBuilder(max_plies=8)
+        games = [random_game(seed) for seed in range(20)]
+        for seed, moves in enumerate(games):
+            name = self.path(f'history{seed}.txt')
+            write_history(name, moves)
+            builder.add_file(name)
+        builder.write(self.path('book.bin'))
+        with open(self.path('book.bin'), 'rb') as book:
+            self.assertEqual(len(book.read()), len(MAGIC) + RECORD.size * len(builder.stats))
+
+        book = OpeningBook(self.path('book.bin'), min_games=1)
+        self.assertIsNone(book._keys)  # leitura preguicosa
+        self.assertEqual(len(book), len(builder.stats))
+
+        initial = GameState(Board(), Board.BLACK)
+        self.assertEqual(sum(sum(stats) for _, *stats in book.moves(initial)), 20)
+        for moves in games[:5]:
+            state = initial
+            for move, _ in moves[:8]:
+                self.assertTrue(book.moves(state))
+                for board_class in (Board, BitBoard):
+                    same = GameState(board_class.from_string(str(state.board)), state.player)
+                    for book_move, *_ in book.moves(same):
+                        self.assertTrue(same.is_legal_move(book_move))
+                    self.assertTrue(same.is_legal_move(book.choose(same)))
+                state = state.next_state(move)
+
+    def test_missing_book(self):
+        book = OpeningBook(self.path('missing.bin'))
+        self.assertEqual(len(book), 0)
+        self.assertIsNone(book.choose(GameState(Board(), Board.BLACK)))
+
+
+if __name__ == '__main__':
+    unittest.main()
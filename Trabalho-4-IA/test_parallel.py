@@ -0,0 +1,63 @@
+import time
+import unittest
+
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+from advsearch.your_agent.parallel import parallel_move, parallel_search, shutdown_pool
+from advsearch.your_agent.transposition import SharedTranspositionTable
+
+from benchmarks.positions import suite
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def test_same_value_as_serial(self):
+        for state in suite()[:4]:
+            serial = {}
+            minimax_move(state, 3, evaluate_mask, serial)
+            move, value, complete = parallel_search(state, 3, evaluate_mask, float('inf'),
+                                                    state.legal_moves(), workers=2)
+            self.assertTrue(complete)
+            self.assertEqual(value, serial['value'])
+            self.assertIn(move, state.legal_moves())
+
+    def test_root_values(self):
+        # valores de todas as jogadas da raiz, para a reordenacao entre iteracoes
+        state = suite()[2]
+        values = {}
+        move, value, complete = parallel_search(state, 2, evaluate_mask, float('inf'),
+                                                state.legal_moves(), workers=2, values=values)
+        self.assertTrue(complete)
+        self.assertEqual(set(values), set(state.legal_moves()))
+        self.assertEqual(values[move], value)
+        self.assertEqual(max(values.values()), value)
+
+    def test_shared_table(self):
+        tt = SharedTranspositionTable()
+        self.addCleanup(tt.close)
+        for state in suite()[1:3]:
+            parallel = {}
+            parallel_move(state, evaluate_mask, float('inf'), workers=2, max_depth=3, stats=parallel, tt=tt)
+            self.assertEqual(parallel['depth'], 3)
+            self.assertGreater(parallel['tt_hits'], 0)
+            self.assertGreater(len(tt), 0)  # as entradas dos processos aparecem na tabela do agente
+
+    def test_respects_budget(self):
+        state = suite()[5]
+        board_str = str(state.board)
+        parallel_search(state, 1, evaluate_mask, float('inf'), state.legal_moves(), workers=2)  # inicia o pool
+        stats = {}
+        start = time.perf_counter()
+        move = parallel_move(state, evaluate_mask, 0.5, workers=2, stats=stats)
+        self.assertLess(time.perf_counter() - start, 0.8)  # espera so' ate' o prazo
+        self.assertIn(move, state.legal_moves())
+        self.assertGreaterEqual(stats['depth'], 1)
+        self.assertEqual(str(state.board), board_str)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.board import Board
+
+from benchmarks.perft import (perft, divide, othello_initial, tttm_initial, stored_positions,
+                              OTHELLO_REFERENCE, TTTM_REFERENCE)
+
+
+class TestPerft(unittest.TestCase):
+    """
+    Os geradores de jogadas devem produzir as contagens de referencia
+    """
+
+    def test_othello_initial(self):
+        for board_class in (Board, BitBoard):
+            state = othello_initial(board_class)
+            for depth in range(1, 6):
+                self.assertEqual(perft(state, depth), OTHELLO_REFERENCE[depth - 1], (board_class.__name__, depth))
+            self.assertEqual(str(state.board), str(Board()))  # apply/undo restaurou o estado
+
+    def test_tttm_initial(self):
+        for depth in range(1, 7):
+            self.assertEqual(perft(tttm_initial(), depth), TTTM_REFERENCE[depth - 1], depth)
+
+    def test_stored_positions(self):
+        for game, board_class in (('othello', Board), ('othello', BitBoard), ('tttm', Board)):
+            for name, state, counts in stored_positions(game, board_class):  # board_class: so' no othello
+                for depth in range(1, min(len(counts), 3) + 1):
+                    self.assertEqual(perft(state, depth), counts[depth - 1], (name, depth))
+
+    def test_divide(self):
+        counts = divide(othello_initial(), 4)
+        self.assertEqual(len(counts), 4)
+        self.assertEqual(sum(counts.values()), OTHELLO_REFERENCE[3])
+        self.assertEqual(sum(divide(tttm_initial(), 3).values()), TTTM_REFERENCE[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import time
+import unittest
+
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+from advsearch.your_agent.move_ordering import OTHELLO_PRIOR
+from advsearch.your_agent.pondering import Ponderer
+
+from benchmarks.positions import suite
+
+
+class TestPondering(unittest.TestCase):
+
+    def setUp(self):
+        self.ponderer = Ponderer(evaluate_mask, 0.3, prior=OTHELLO_PRIOR, table_entries=1 << 14)
+        self.addCleanup(self.ponderer.close)
+
+    def play(self, state, move):
+        state = state.next_state(move)
+        self.ponderer.observe_move(state.copy(), move, 'B' if state.player == 'W' else 'W')
+        return state
+
+    def test_hit(self):
+        state = suite()[2]
+        state = self.play(state, self.ponderer.make_move(state))
+        reply, (board, player) = self.ponderer.predicted
+        state = self.play(state, reply)
+        self.assertEqual((str(state.board), state.player), (board, player))
+
+        time.sleep(1)  # tempo do adversario
+        root = self.ponderer.tt.probe(state.zobrist_key())
+        self.assertIsNotNone(root)  # o pondering ja' completou alguma iteracao da posicao prevista
+        move = self.ponderer.make_move(state)
+        self.assertIn(move, state.legal_moves())
+        self.assertEqual(self.ponderer.stats['hits'], 1)
+        self.assertGreater(self.ponderer.stats['ponder_time'], 0.5)
+
+    def test_miss(self):
+        root = suite()[2]
+        state = self.play(root, self.ponderer.make_move(root))
+        reply = self.ponderer.predicted[0]
+        other = next(move for move in state.legal_moves() if move != reply)
+        state = self.play(state, other)
+        self.assertFalse(self.ponderer.active)  # observe_move interrompe o pondering
+        self.assertTrue(self.ponderer.idle.is_set())
+        # a tabela nao e' esvaziada: a entrada da nossa busca anterior continua la'
+        self.assertIsNotNone(self.ponderer.tt.probe(root.zobrist_key()))
+        self.assertIn(self.ponderer.make_move(state), state.legal_moves())
+        self.assertEqual((self.ponderer.stats['hits'], self.ponderer.stats['misses']), (0, 1))
+
+    def test_worker_reused(self):
+        # o mesmo processo pondera todas as jogadas
+        state = suite()[2]
+        state = self.play(state, self.ponderer.make_move(state))
+        process = self.ponderer.process
+        self.assertTrue(process.is_alive())
+        state = self.play(state, self.ponderer.predicted[0])
+        start = time.perf_counter()
+        state = self.play(state, self.ponderer.make_move(state))
+        self.assertLess(time.perf_counter() - start, 0.3 + 0.2)  # parar o pondering e' rapido
+        self.assertIs(self.ponderer.process, process)
+        self.assertTrue(self.ponderer.active)
+        self.assertEqual(self.ponderer.stats['predictions'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from collections import defaultdict
+
+import test_pruning
+from advsearch.your_agent.deepening import iterative_deepening_move
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.move_ordering import MoveOrderer, OTHELLO_PRIOR
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+from advsearch.your_agent.pvs import pvs_move
+from advsearch.your_agent.transposition import TranspositionTable
+import advsearch.your_agent.tttm_minimax as tttm_agent
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+
+from benchmarks.positions import suite
+
+
+class TestPVS(unittest.TestCase):
+
+    def test_abstract_tree(self):
+        """
+        Na arvore abstrata de test_pruning, PVS deve retornar a mesma jogada que minimax_move
+        """
+        test_pruning.calls = defaultdict(int)
+        state = test_pruning.GameState(test_pruning.Board(), 'B')
+        expected = minimax_move(state, -1, test_pruning.utility)
+        stats = {}
+        self.assertEqual(pvs_move(state, -1, test_pruning.utility, stats), expected)
+        self.assertEqual(stats['value'], 3)
+
+    def test_same_values_as_minimax(self):
+        for state in suite()[:5]:
+            plain, pvs = {}, {}
+            minimax_move(state, 3, evaluate_mask, plain)
+            pvs_move(state, 3, evaluate_mask, pvs, orderer=MoveOrderer(OTHELLO_PRIOR))
+            self.assertEqual(pvs['value'], plain['value'])
+
+    def test_aspiration_with_deepening(self):
+        search = lambda *args, **kwargs: pvs_move(*args, aspiration=10, **kwargs)
+        for state in suite()[2:4]:
+            plain, pvs = {}, {}
+            minimax_move(state, 4, evaluate_mask, plain)
+            iterative_deepening_move(state, evaluate_mask, 60, max_depth=4, search=search, stats=pvs,
+                                     orderer=MoveOrderer(OTHELLO_PRIOR))
+            self.assertEqual(pvs['value'], plain['value'])
+
+    def test_tttm(self):
+        state = TTTMGameState(TTTMBoard(), 'B')
+        self.assertEqual(pvs_move(state, -1, tttm_agent.utility, tt=TranspositionTable()), (1, 1))
+
+    def test_agent_selection(self):
+        # PVS e' opcional: os agentes usam alfa-beta, a menos que SEARCH_ALGORITHM diga o contrario
+        from advsearch.your_agent import othello_minimax_custom, othello_minimax_mask
+        for agent in (othello_minimax_mask, othello_minimax_custom):
+            self.assertEqual(agent.SEARCH_ALGORITHM, 'alphabeta')
+            self.assertIs(agent._search(), minimax_move)
+            algorithm = agent.SEARCH_ALGORITHM
+            try:
+                agent.SEARCH_ALGORITHM = 'pvs'
+                self.assertIs(agent._search().func, pvs_move)
+            finally:
+                agent.SEARCH_ALGORITHM = algorithm
+
+
+if __name__ == '__main__':
+    unittest.main()
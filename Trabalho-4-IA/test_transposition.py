@@ -0,0 +1,114 @@
+import pickle
+import unittest
+
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+from advsearch.your_agent.transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER
+import advsearch.your_agent.tttm_minimax as tttm_agent
+
+from benchmarks.positions import suite
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_and_probe(self):
+        tt = TranspositionTable(16)
+        self.assertEqual(tt.capacity, 16)
+        tt.store(5, 3, 1.5, EXACT, (2, 3))
+        self.assertEqual(tt.probe(5), (5, 3, 1.5, EXACT, (2, 3)))
+        self.assertIsNone(tt.probe(6))
+
+    def test_replacement_policy(self):
+        tt = TranspositionTable(2)  # um unico bucket: todas as chaves colidem
+        tt.store(1, 5, 10, EXACT)
+        tt.store(2, 1, 20, LOWER)   # mais rasa: vai para o slot 'sempre substitui'
+        self.assertIsNotNone(tt.probe(1))
+        self.assertIsNotNone(tt.probe(2))
+        tt.store(3, 2, 30, EXACT)   # substitui a entrada rasa mais antiga
+        self.assertIsNotNone(tt.probe(1))
+        self.assertIsNone(tt.probe(2))
+        tt.store(4, 6, 40, EXACT)   # mais profunda: toma o slot por profundidade
+        self.assertEqual(tt.probe(4)[1], 6)
+        self.assertIsNotNone(tt.probe(1))
+        self.assertEqual(len(tt), 2)
+
+    def test_minimax_same_result(self):
+        """
+        Com a tabela, a busca deve retornar a mesma jogada e o mesmo valor, expandindo menos nodos
+        """
+        for state in suite()[:5]:
+            plain, cached = {}, {}
+            move = minimax_move(state, 3, evaluate_mask, plain)
+            self.assertEqual(minimax_move(state, 3, evaluate_mask, cached, tt=TranspositionTable()), move)
+            self.assertEqual(cached['value'], plain['value'])
+            self.assertLessEqual(cached['nodes'], plain['nodes'])
+
+    def test_tttm_unlimited_depth(self):
+        state = TTTMGameState(TTTMBoard(), 'B')
+        stats = {}
+        self.assertEqual(minimax_move(state, -1, tttm_agent.utility, stats, tt=TranspositionTable()), (1, 1))
+        self.assertGreater(stats['tt_cutoffs'], 0)
+
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tt = SharedTranspositionTable(16)
+        self.addCleanup(self.tt.close)
+
+    def test_store_and_probe(self):
+        self.assertEqual(self.tt.capacity, 16)
+        self.tt.store(5, 3, 1.5, EXACT, (2, 3))
+        self.tt.store(7, 1000, float('-inf'), UPPER)
+        self.assertEqual(self.tt.probe(5), (5, 3, 1.5, EXACT, (2, 3)))
+        self.assertEqual(self.tt.probe(7), (7, 1000, float('-inf'), UPPER, None))
+        self.assertIsNone(self.tt.probe(6))
+        self.assertEqual(len(self.tt), 2)
+        self.tt.clear()
+        self.assertIsNone(self.tt.probe(5))
+
+    def test_replacement_policy(self):
+        tt = SharedTranspositionTable(2)  # um unico bucket, como em TestTranspositionTable
+        self.addCleanup(tt.close)
+        tt.store(1, 5, 10, EXACT)
+        tt.store(2, 1, 20, LOWER)
+        tt.store(3, 2, 30, EXACT)
+        self.assertIsNotNone(tt.probe(1))
+        self.assertIsNone(tt.probe(2))
+        tt.store(4, 6, 40, EXACT)
+        self.assertEqual(tt.probe(4)[1], 6)
+        self.assertIsNotNone(tt.probe(1))
+
+    def test_torn_write_is_a_miss(self):
+        """
+        Uma entrada com bytes misturados (escrita concorrente) nao deve ser retornada
+        """
+        self.tt.store(5, 3, 1.5, EXACT, (2, 3))
+        slot = 2 * (5 & self.tt.mask)
+        self.tt.buf[slot * 24 + 16] ^= 0xFF  # corrompe o valor
+        self.assertIsNone(self.tt.probe(5))
+
+    def test_attach_from_pickle(self):
+        self.tt.store(9, 2, -4.0, LOWER, (0, 7))
+        other = pickle.loads(pickle.dumps(self.tt))
+        try:
+            self.assertEqual(other.probe(9), (9, 2, -4.0, LOWER, (0, 7)))
+            other.store(11, 1, 3.0, EXACT)
+            self.assertEqual(self.tt.probe(11)[2], 3.0)
+        finally:
+            other.close()
+
+    def test_minimax_same_result(self):
+        for state in suite()[:3]:
+            private, shared = {}, {}
+            move = minimax_move(state, 3, evaluate_mask, private, tt=TranspositionTable())
+            self.tt.clear()
+            self.assertEqual(minimax_move(state, 3, evaluate_mask, shared, tt=self.tt), move)
+            self.assertEqual(shared['value'], private['value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
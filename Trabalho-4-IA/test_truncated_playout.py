@@ -0,0 +1,59 @@
+import math
+import random
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent import mcts, truncated_playout
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+
+from benchmarks.positions import random_position
+
+
+class TestTruncatedPlayout(unittest.TestCase):
+    """
+    Os playouts truncados devem devolver probabilidades de vitoria coerentes e servir ao MCTS
+    """
+
+    def test_win_probability(self):
+        self.assertEqual(truncated_playout.win_probability(0.0, 50.0), 0.5)
+        self.assertAlmostEqual(truncated_playout.win_probability(30.0, 50.0)
+                               + truncated_playout.win_probability(-30.0, 50.0), 1.0)
+        self.assertEqual(truncated_playout.win_probability(-1e6, 1.0), 0.0)  # sem overflow
+
+    def test_playout(self):
+        state = random_position(20, 4)
+        board = str(state.board)
+        score = truncated_playout.playout(state, 6, evaluate_mask, 200.0, random.Random(1))
+        self.assertTrue(0.0 <= score <= 1.0)
+        self.assertEqual(str(state.board), board)  # o estado original nao muda
+
+        # corte zero: so' a heuristica da propria posicao
+        self.assertEqual(truncated_playout.playout(state, 0, evaluate_mask, 200.0),
+                         truncated_playout.win_probability(evaluate_mask(state, state.player), 200.0))
+
+        # o jogo termina antes do corte: vale o resultado
+        terminal = GameState(Board.from_string('BBBBBBBB\n' * 8), Board.WHITE)
+        self.assertEqual(truncated_playout.playout(terminal, 10, evaluate_mask, 200.0), 0.0)
+
+    def test_calibrate(self):
+        # resultados sorteados com a propria sigmoide: a escala deve ser reencontrada
+        rng = random.Random(2)
+        data = []
+        for _ in range(4000):
+            value = rng.uniform(-300.0, 300.0)
+            data.append((value, 1.0 if rng.random() < 1.0 / (1.0 + math.exp(-value / 80.0)) else 0.0))
+        self.assertAlmostEqual(truncated_playout.calibrate(data), 80.0, delta=10.0)
+
+    def test_mcts_cutoff(self):
+        state = GameState(Board(), Board.BLACK)
+        root = mcts.Node(state)
+        playouts = mcts.search(root, float('inf'), rng=random.Random(3), max_playouts=300, cutoff=4,
+                               evaluation='custom')
+        self.assertEqual(playouts, 300)
+        self.assertTrue(0.0 < sum(child.wins for child in root.children) < 300.0)
+        self.assertIn(mcts.best_move(root), state.legal_moves())
+
+
+if __name__ == '__main__':
+    unittest.main()
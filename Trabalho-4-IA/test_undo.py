@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.gamestate import GameState
+from advsearch.your_agent.minimax import minimax_move
+from advsearch.your_agent.othello_minimax_mask import evaluate_mask
+
+from benchmarks.positions import suite
+
+
+class TestApplyUndo(unittest.TestCase):
+    """
+    Verifica se apply/undo produzem os mesmos estados que next_state
+    e se undo restaura a posicao exatamente
+    """
+
+    def check_apply_undo(self, board_class):
+        rng = random.Random(7)
+        for _ in range(5):
+            state = GameState(board_class(), 'B')
+            while not state.is_terminal():
+                before = (str(state.board), dict(state.board.piece_count), state.player)
+                for move in sorted(state.legal_moves()):
+                    expected = state.next_state(move)
+                    record = state.apply(move)
+                    self.assertEqual(str(state.board), str(expected.board))
+                    self.assertEqual(state.board.piece_count, expected.board.piece_count)
+                    self.assertEqual(state.player, expected.player)
+                    state.undo(record)
+                    self.assertEqual((str(state.board), state.board.piece_count, state.player), before)
+                state.apply(rng.choice(sorted(state.legal_moves())))
+
+    def test_board(self):
+        self.check_apply_undo(Board)
+
+    def test_bitboard(self):
+        self.check_apply_undo(BitBoard)
+
+    def test_illegal_move(self):
+        state = GameState(Board(), 'B')
+        with self.assertRaises(ValueError):
+            state.apply((0, 0))
+        self.assertEqual(str(state.board), str(Board()))
+
+    def test_minimax_same_moves(self):
+        """
+        A busca com apply/undo deve retornar as mesmas jogadas que a busca com copias
+        """
+        for state in suite():
+            board_str = str(state.board)
+            expected = minimax_move(state, 3, evaluate_mask, inplace=False)
+            self.assertEqual(minimax_move(state, 3, evaluate_mask, inplace=True), expected)
+            self.assertEqual(str(state.board), board_str)
+
+
+if __name__ == '__main__':
+    unittest.main()
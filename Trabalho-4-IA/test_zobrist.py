@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from advsearch.othello.board import Board
+from advsearch.othello.bitboard import BitBoard
+from advsearch.othello.gamestate import GameState
+from advsearch.tttm.board import Board as TTTMBoard
+from advsearch.tttm.gamestate import GameState as TTTMGameState
+
+
+class TestZobrist(unittest.TestCase):
+    """
+    Verifica se o hash incremental e' igual ao hash calculado do zero
+    e se sobrevive a copy() e from_string()
+    """
+
+    def check_othello(self, board_class):
+        rng = random.Random(3)
+        for _ in range(10):
+            state = GameState(board_class(), 'B')
+            self.assertEqual(state.board.zobrist, state.board.compute_zobrist())
+            while not state.is_terminal():
+                move = rng.choice(sorted(state.legal_moves()))
+                key = state.zobrist_key()
+                record = state.apply(move)
+                state.undo(record)
+                self.assertEqual(state.zobrist_key(), key)
+
+                state = state.next_state(move)
+                board = state.board
+                self.assertEqual(board.zobrist, board.compute_zobrist())
+                self.assertEqual(board.copy().zobrist, board.zobrist)
+                self.assertEqual(board_class.from_string(str(board)).zobrist, board.zobrist)
+
+    def test_othello_board(self):
+        self.check_othello(Board)
+
+    def test_othello_bitboard(self):
+        self.check_othello(BitBoard)
+        self.assertEqual(BitBoard().zobrist, Board().zobrist)
+
+    def test_othello_process_move(self):
+        board = Board()
+        board.process_move((2, 3), 'B')
+        self.assertEqual(board.zobrist, board.compute_zobrist())
+
+    def test_side_to_move(self):
+        self.assertNotEqual(GameState(Board(), 'B').zobrist_key(), GameState(Board(), 'W').zobrist_key())
+
+    def test_tttm(self):
+        state = TTTMGameState(TTTMBoard(), 'B')
+        self.assertEqual(state.board.zobrist, 0)
+        for move in [(1, 1), (0, 0), (2, 0), (0, 2), (0, 1)]:
+            state = state.next_state(move)
+            board = state.board
+            self.assertEqual(board.zobrist, board.compute_zobrist())
+            self.assertEqual(board.copy().zobrist, board.zobrist)
+            self.assertEqual(TTTMBoard.from_string('\n'.join(''.join(row) for row in board.board)).zobrist,
+                             board.zobrist)
+
+
+if __name__ == '__main__':
+    unittest.main()